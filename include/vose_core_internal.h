@@ -23,9 +23,10 @@ struct AnalysisCache {
     std::vector<double> f0;
     std::vector<double> time;
     int                 length    = 0;
-    std::vector<double> flat_spec;
-    std::vector<double> flat_ap;
+    std::vector<float>  flat_spec;
+    std::vector<float>  flat_ap;
     int                 spec_bins = 0;
+    double              base_f0   = 220.0;
 };
 
 enum class NoteState : uint8_t { INVALID, NO_VOICE, RENDERABLE };
@@ -196,7 +196,10 @@ class VoSeEngine:
                     return note_obj.get(key, default)
                 return getattr(note_obj, key, default)
 
-            hz_segments = []
+            # ノートごとの (周波数, フレーム数) だけを集め、最後に np.repeat で一括展開する
+            # （ノートごとの np.full + np.concatenate による二重確保・二重コピーを避ける）
+            seg_hz = []
+            seg_frames = []
             for note in notes:
                 # [堅牢化] スレッド競合やエディタの非同期更新により、配列内に None や不正オブジェクトが混入するのをガード
                 if note is None:
@@ -226,12 +229,13 @@ class VoSeEngine:
 
                 # フレーム数の算出
                 frame_count = max(1, int(round(duration / frame_sec)))
-                hz_segments.append(np.full(frame_count, hz, dtype=np.float32))
+                seg_hz.append(hz)
+                seg_frames.append(frame_count)
 
-            if not hz_segments:
+            if not seg_hz:
                 return np.zeros(1, dtype=np.float32)
 
-            f0_curve = np.concatenate(hz_segments)
+            f0_curve = np.repeat(np.asarray(seg_hz, dtype=np.float32), seg_frames)
 
             # ノート境界を滑らかに補間（簡易ポルタメント）
             smooth_window = max(1, int(round(0.03 / frame_sec)))  # 約30ms
@@ -18,24 +18,11 @@ try:
 except Exception:
     chardet = None
 
-# ==========================================================================
-# 1. C言語互換構造体（パラメーターを1つも漏らさずC++へ）
-# ==========================================================================
-class CNoteEvent(ctypes.Structure):
-    _fields_ = [
-        ("wav_path", ctypes.c_char_p),
-        ("pitch_curve", ctypes.POINTER(ctypes.c_double)),
-        ("pitch_length", ctypes.c_int),
-        ("gender_curve", ctypes.POINTER(ctypes.c_double)),
-        ("tension_curve", ctypes.POINTER(ctypes.c_double)),
-        ("breath_curve", ctypes.POINTER(ctypes.c_double)),
-        ("vibrato_depth_curve", ctypes.POINTER(ctypes.c_double)),
-        ("vibrato_rate_curve", ctypes.POINTER(ctypes.c_double)),
-        ("vibrato_curve_length", ctypes.c_int),
-    ]
+# C言語互換構造体は modules.ffi に一本化（重複定義による ABI のずれを防ぐ）
+from modules.ffi import CNoteEvent, fill_note_curves
 
 # ==========================================================================
-# 2. メインエンジンクラス（削りなし・全機能統合版）
+# 1. メインエンジンクラス（削りなし・全機能統合版）
 # ==========================================================================
 class VO_SE_Engine:
     def __init__(self, voice_lib_dir="voices"):
@@ -113,12 +100,14 @@ class VO_SE_Engine:
             if os.path.exists(path):
                 try:
                     lib = ctypes.CDLL(os.path.abspath(path))
+                    # シグネチャはロード時に一度だけ設定する（呼び出しごとの再設定はしない）
                     lib.execute_render.argtypes = [
                         ctypes.POINTER(CNoteEvent), 
                         ctypes.c_int, 
                         ctypes.c_char_p,
                         ctypes.c_int,
                     ]
+                    lib.execute_render.restype = None
                     print(f"○ Engine Core Connected: {path}")
                     return lib
                 except Exception as e:
@@ -161,43 +150,49 @@ class VO_SE_Engine:
 
         note_count = len(notes)
         c_notes_array = (CNoteEvent * note_count)()
-        self._temp_refs = []
+        res = 128
+        # 全ノートのカーブを1本の連続バッファにまとめ、ポインタは最後に一括で書き込む
+        # 並び: pitch, gender, tension, breath, vibrato_depth, vibrato_rate
+        curves = np.zeros((note_count, 6, res), dtype=np.float64)
+        self._temp_refs = [curves]
+
+        # 同じ歌詞のノートは同じ音源を共有するため、パス解決と encode は歌詞ごとに1回だけ行う
+        # （WORLD 解析自体も C++ 側で音源単位にキャッシュされる）
+        encoded_paths = {}
+        default_path = next(iter(self.oto_map.values()), "")
 
         for i, note in enumerate(notes):
-            wav_path = self.oto_map.get(note.lyrics) or self.oto_map.get(note.phonemes)
-            if not wav_path:
-                wav_path = list(self.oto_map.values())[0] if self.oto_map else ""
-
-            res = 128
-            p_curve = self._get_sampled_curve(parameters["Pitch"], note, res, is_pitch=True).astype(np.float64)
-            g_curve = self._get_sampled_curve(parameters["Gender"], note, res).astype(np.float64)
-            t_curve = self._get_sampled_curve(parameters["Tension"], note, res).astype(np.float64)
-            b_curve = self._get_sampled_curve(parameters["Breath"], note, res).astype(np.float64)
-            vibrato_depth_curve = np.zeros(res, dtype=np.float64)
-            vibrato_rate_curve = np.zeros(res, dtype=np.float64)
-
-            self._temp_refs.extend([p_curve, g_curve, t_curve, b_curve, vibrato_depth_curve, vibrato_rate_curve])
-
-            c_notes_array[i].wav_path = wav_path.encode('utf-8')
-            c_notes_array[i].pitch_curve = p_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].gender_curve = g_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].tension_curve = t_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].breath_curve = b_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].vibrato_depth_curve = vibrato_depth_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].vibrato_rate_curve = vibrato_rate_curve.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
-            c_notes_array[i].pitch_length = res
-            c_notes_array[i].vibrato_curve_length = res
+            wav_bytes = encoded_paths.get(note.lyrics)
+            if wav_bytes is None:
+                wav_path = self.oto_map.get(note.lyrics) or self.oto_map.get(note.phonemes) or default_path
+                wav_bytes = wav_path.encode('utf-8')
+                if note.lyrics in self.oto_map:
+                    encoded_paths[note.lyrics] = wav_bytes
+
+            c_notes_array[i].wav_path = wav_bytes
+            curves[i, 0] = self._get_sampled_curve(parameters["Pitch"], note, res, is_pitch=True, apply_ai=False)
+            curves[i, 1] = self._get_sampled_curve(parameters["Gender"], note, res)
+            curves[i, 2] = self._get_sampled_curve(parameters["Tension"], note, res)
+            curves[i, 3] = self._get_sampled_curve(parameters["Breath"], note, res)
+            # vibrato_depth / vibrato_rate は 0 のまま
+
+        # AI ピッチはノートごとではなく全ノート分を1回のバッチ推論で焼き込む
+        if self.aural_ai is not None and parameters["Pitch"] and note_count:
+            baked = self.aural_ai.get_baked_pitch_batch([id(n) for n in notes], list(curves[:, 0]))
+            for i, pitch in enumerate(baked):
+                curves[i, 0] = pitch
+
+        fill_note_curves(c_notes_array, curves)
 
         try:
             self.lib.execute_render(c_notes_array, note_count, os.path.abspath(file_path).encode('utf-8'), 0)
         finally:
             self._temp_refs = []
 
-    def _get_sampled_curve(self, events, note, res, is_pitch=False):
-        curve = np.zeros(res, dtype=np.float32)
+    def _get_sampled_curve(self, events, note, res, is_pitch=False, apply_ai=True):
         default_val = 60.0 if is_pitch else 0.5
         if not events:
-            return curve + default_val
+            return np.full(res, default_val, dtype=np.float32)
 
         times = np.linspace(note.start_time, note.start_time + note.duration, res)
         event_times = [p.time for p in events]
@@ -206,9 +201,12 @@ class VO_SE_Engine:
         curve = np.interp(times, event_times, event_values).astype(np.float32)
         
         if is_pitch:
-            curve += float(note.note_number)
-            curve = 440.0 * (2.0 ** ((curve - 69.0) / 12.0))
-            if self.aural_ai is not None:
+            # MIDIノート番号 → Hz を一時配列を作らずに in-place で変換
+            curve += float(note.note_number) - 69.0
+            curve /= 12.0
+            np.exp2(curve, out=curve)
+            curve *= 440.0
+            if apply_ai and self.aural_ai is not None:
                 note_id = id(note)
                 curve = self.aural_ai.get_baked_pitch(note_id, curve)
             
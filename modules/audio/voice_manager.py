@@ -2,7 +2,6 @@
 
 import os
 import platform
-import glob
 import sys
 import logging
 
@@ -14,9 +13,6 @@ def get_resource_path(relative_path: str) -> str:
     PyInstallerの _MEIPASS 属性へのアクセスを getattr で安全に行い、
     Actions の reportAttributeAccessIssue を完全に回避します。
     """
-    import sys
-    import os
-
     # 1. getattr を使用して sys._MEIPASS を安全に取得
     # 第2引数に os.path.abspath(".") を指定することで、通常実行時もカバーします
     base_path: str = str(getattr(sys, '_MEIPASS', os.path.abspath(".")))
@@ -27,6 +23,44 @@ def get_resource_path(relative_path: str) -> str:
     # 3. 代表の設計通り、パスを正規化して返却
     return os.path.normpath(full_path)
 
+
+# oto.ini の数値フィールド（エイリアスに続く順）
+OTO_FIELD_KEYS = ("left_blank", "fixed_range", "right_blank", "pre_utterance", "overlap")
+
+
+def _find_oto_ini(root: str) -> list:
+    """
+    root 以下の oto.ini を os.scandir で探索する。
+    音源フォルダは入れ子にならないため、oto.ini を見つけたディレクトリより下は降りない。
+    glob の '**' と同様、隠しフォルダ（'.' 始まり）は対象外。
+    """
+    found = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        subdirs = []
+        has_oto = False
+        with it:
+            for entry in it:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.name == "oto.ini" and entry.is_file():
+                        found.append(entry.path)
+                        has_oto = True
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+        if not has_oto:
+            # 名前順に処理されるよう逆順で積む
+            stack.extend(sorted(subdirs, reverse=True))
+    return found
+
 class VoiceManager:
     def __init__(self):
         self.system = platform.system()
@@ -67,8 +101,8 @@ class VoiceManager:
             if not os.path.exists(path):
                 continue
             
-            # 再帰的に oto.ini を検索
-            for ini_path in glob.glob(os.path.join(path, "**/oto.ini"), recursive=True):
+            # 再帰的に oto.ini を検索（音源フォルダ内のサブフォルダは走査しない）
+            for ini_path in _find_oto_ini(path):
                 v_dir = os.path.dirname(ini_path)
                 # キャラ名はフォルダ名、または character.txt があればそこから取得する拡張性
                 v_name = os.path.basename(v_dir)
@@ -99,28 +133,26 @@ class VoiceManager:
             return config
 
         try:
-            # UTAU音源は伝統的に Shift-JIS (cp932)
-            with open(ini_path, 'r', encoding='cp932', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or '=' not in line:
-                        continue
-                    
-                    # フォーマット: ファイル名.wav=エイリアス,左ブランク,固定範囲,右ブランク,先行発声,オーバーラップ
-                    fname, params = line.split('=', 1)
-                    p = params.split(',')
-                    
-                    alias = p[0] if p[0] else fname.replace(".wav", "")
-                    
-                    # 単位はミリ秒(ms)としてパース（エンジン側で秒に変換することを想定）
-                    config[alias] = {
-                        "filename": fname,
-                        "left_blank": float(p[1]) if len(p) > 1 and p[1] else 0.0,
-                        "fixed_range": float(p[2]) if len(p) > 2 and p[2] else 0.0,
-                        "right_blank": float(p[3]) if len(p) > 3 and p[3] else 0.0,
-                        "pre_utterance": float(p[4]) if len(p) > 4 and p[4] else 0.0,
-                        "overlap": float(p[5]) if len(p) > 5 and p[5] else 0.0
-                    }
+            # UTAU音源は伝統的に Shift-JIS (cp932)。一括で読み込んでからデコードする
+            with open(ini_path, 'rb') as f:
+                data = f.read().decode('cp932', errors='ignore')
+
+            n_fields = len(OTO_FIELD_KEYS)
+            for line in data.splitlines():
+                # フォーマット: ファイル名.wav=エイリアス,左ブランク,固定範囲,右ブランク,先行発声,オーバーラップ
+                fname, sep, params = line.strip().partition('=')
+                if not sep:
+                    continue
+                p = params.split(',')
+
+                alias = p[0] if p[0] else fname.replace(".wav", "")
+
+                # 単位はミリ秒(ms)としてパース（エンジン側で秒に変換することを想定）
+                values = [float(v) if v else 0.0 for v in p[1:n_fields + 1]]
+                values.extend([0.0] * (n_fields - len(values)))
+                entry = {"filename": fname}
+                entry.update(zip(OTO_FIELD_KEYS, values))
+                config[alias] = entry
         except Exception as e:
             logging.error(f"oto.ini の解析中にエラー: {e}")
             
@@ -1,36 +1,234 @@
 import os
+from collections import OrderedDict
+
+import numpy as np
 # PyQt6 から PySide6 に変更
-from PySide6.QtCore import QUrl, Signal, QObject
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QTimer, QUrl, Signal
+from PySide6.QtMultimedia import (QAudio, QAudioFormat, QAudioOutput, QAudioSink, QMediaDevices,
+                                  QMediaPlayer)
+
+try:
+    import soundfile as sf
+except Exception:
+    sf = None
+
+
+def _int16_format(sample_rate, channels):
+    fmt = QAudioFormat()
+    fmt.setSampleRate(sample_rate)
+    fmt.setChannelCount(channels)
+    fmt.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+    return fmt
+
+
+def convert_pcm(pcm, src_rate, dst_rate, dst_channels):
+    """
+    int16 PCM を出力デバイスが受け付けるレート・チャンネル数に合わせる（プレビュー用の線形補間）。
+    モノラルは1次元、多チャンネルは (フレーム, ch) で受け取り、同じ形で返す。
+    """
+    data = pcm.astype(np.float64).reshape(len(pcm), -1)
+    if data.shape[1] != dst_channels:
+        # チャンネル数が違うときはいったんモノラルにまとめてから複製する
+        data = np.repeat(data.mean(axis=1, keepdims=True), dst_channels, axis=1)
+    if src_rate != dst_rate and len(data) > 1:
+        dst_len = max(1, int(round(len(data) * dst_rate / src_rate)))
+        src_t = np.arange(len(data), dtype=np.float64)
+        dst_t = np.linspace(0.0, len(data) - 1, dst_len)
+        data = np.stack([np.interp(dst_t, src_t, data[:, c]) for c in range(dst_channels)], axis=1)
+    out = np.clip(np.rint(data), -32768, 32767).astype(np.int16)
+    return out[:, 0] if dst_channels == 1 else out
+
 
 class AudioPlayer(QObject):
     # PySide6 では pyqtSignal ではなく Signal を使います
-    position_changed = Signal(int) 
-    
+    position_changed = Signal(int)
+
+    # デコード済みPCMを保持するプレビューファイル数の上限
+    PCM_CACHE_SIZE = 32
+    # QUrl キャッシュの上限
+    URL_CACHE_SIZE = 128
+
     def __init__(self, volume=0.8):
         super().__init__()
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        
-        self.player.setAudioOutput(self.audio_output)
-        self.audio_output.setVolume(volume) # configからの音量を適用
-        
-        # 位置変更の通知設定
-        self.player.positionChanged.connect(self.position_changed.emit)
+        self.volume = volume
+
+        # プレビューは QAudioSink に PCM を直接流す（ファイル再オープンやメディアパイプラインの
+        # 再構築をしないため、連続したノート試聴でも鳴り始めが速い）
+        self.sink = None
+        self._sink_format = None   # シンクを作ったときの入力 (レート, ch)
+        self._sink_target = None   # シンクが実際に開いている (レート, ch)
+        # PCM を流す QBuffer は1つだけを使い回し、停止時に中身を手放す
+        self._buffer = QBuffer(self)
+        self._pcm_cache = OrderedDict()
+
+        # 再生位置は processedUSecs を定期的にサンプリングして通知する
+        self._position_timer = QTimer(self)
+        self._position_timer.setInterval(30)
+        self._position_timer.timeout.connect(self._emit_position)
+
+        # soundfile が無い環境や、デバイスが扱えない形式では QMediaPlayer で再生する（必要になってから作る）
+        # その経路ではパスごとの QUrl を LRU で使い回す
+        self.player = None
+        self.audio_output = None
+        self._url_cache = OrderedDict()
 
     def play_file(self, file_path):
         """指定したWavファイルを再生"""
-        if os.path.exists(file_path):
+        if sf is None:
+            self._play_with_media_player(file_path)
+            return
+
+        if not os.path.exists(file_path):
+            return
+        entry = self._load_pcm(file_path)
+        if entry is None or not self.play_pcm(*entry):
+            # デコードできない・出力デバイスが PCM の形式を受け付けない場合は QMediaPlayer に任せる
+            self._play_with_media_player(file_path)
+
+    def _ensure_media_player(self):
+        if self.player is None:
+            self.player = QMediaPlayer(self)
+            self.audio_output = QAudioOutput(self)
+            self.player.setAudioOutput(self.audio_output)
+            self.audio_output.setVolume(self.volume) # configからの音量を適用
+            # 位置変更の通知設定
+            self.player.positionChanged.connect(self.position_changed.emit)
+
+    def _play_with_media_player(self, file_path):
+        # プレビュー用ファイルは再生の合間に削除・再生成されることがあるので、存在確認は毎回行う
+        if not os.path.exists(file_path):
+            return
+        url = self._url_cache.get(file_path)
+        if url is None:
             # 絶対パスを確実に渡す
-            self.player.setSource(QUrl.fromLocalFile(os.path.abspath(file_path)))
-            self.player.play()
+            url = QUrl.fromLocalFile(os.path.abspath(file_path))
+            self._url_cache[file_path] = url
+            if len(self._url_cache) > self.URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+        else:
+            self._url_cache.move_to_end(file_path)
+        self._ensure_media_player()
+        self.player.setSource(url)
+        self.player.play()
+
+    def play_pcm(self, pcm, sample_rate=44100):
+        """
+        int16 の PCM（モノラルは1次元、多チャンネルは (フレーム, ch)）をそのまま再生する。
+        出力デバイスが使えず再生できなかった場合は False を返す。
+        """
+        pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+        if not self._ensure_sink(sample_rate, channels):
+            return False
+        target = self._sink_target
+        if target != (sample_rate, channels):
+            pcm = convert_pcm(pcm, sample_rate, *target)
+        self._play_bytes(QByteArray(pcm.tobytes()))
+        return True
+
+    def _load_pcm(self, file_path):
+        """デコード済み PCM を LRU で保持し、同じファイルの再試聴ではデコードを省く"""
+        key = (file_path, os.path.getmtime(file_path))
+        entry = self._pcm_cache.get(key)
+        if entry is not None:
+            self._pcm_cache.move_to_end(key)
+            return entry
+
+        try:
+            data, sample_rate = sf.read(file_path, dtype='int16', always_2d=True)
+        except Exception as e:
+            print(f"AudioPlayer: failed to decode {file_path}: {e}")
+            return None
+
+        pcm = data[:, 0] if data.shape[1] == 1 else data
+        entry = (np.ascontiguousarray(pcm), sample_rate)
+        self._pcm_cache[key] = entry
+        while len(self._pcm_cache) > self.PCM_CACHE_SIZE:
+            self._pcm_cache.popitem(last=False)
+        return entry
+
+    def _ensure_sink(self, sample_rate, channels):
+        """
+        (レート, ch) に合うシンクを用意する。同じ形式が続く限りシンクは作り直さない（デバイスを開いたまま使い回す）。
+        デバイスがその形式を受け付けなければ、デバイスの推奨レート・チャンネル数で開く。
+        """
+        fmt_key = (sample_rate, channels)
+        if self.sink is not None and self._sink_format == fmt_key:
+            return True
+
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull():
+            return False
+        fmt = _int16_format(sample_rate, channels)
+        if not device.isFormatSupported(fmt):
+            preferred = device.preferredFormat()
+            fmt = _int16_format(preferred.sampleRate(), preferred.channelCount())
+            if not device.isFormatSupported(fmt):
+                return False
+
+        self._release_sink()
+        self.sink = QAudioSink(device, fmt, self)
+        self.sink.setVolume(self.volume)
+        self.sink.stateChanged.connect(self._on_sink_state_changed)
+        self._sink_format = fmt_key
+        self._sink_target = (fmt.sampleRate(), fmt.channelCount())
+        return True
+
+    def _release_sink(self):
+        """形式が変わって不要になったシンクを止めて破棄する"""
+        if self.sink is None:
+            return
+        self.sink.stateChanged.disconnect(self._on_sink_state_changed)
+        self.sink.stop()
+        self.sink.deleteLater()
+        self.sink = None
+        self._sink_format = None
+        self._sink_target = None
+
+    def _play_bytes(self, data):
+        self.stop()
+        self._buffer.setData(data)
+        self._buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        self.sink.start(self._buffer)
+        self._position_timer.start()
+
+    def _release_buffer(self):
+        """鳴らし終えた PCM のコピーを手放す（キャッシュ側の ndarray は残る）"""
+        if self._buffer.isOpen():
+            self._buffer.close()
+        self._buffer.setData(QByteArray())
+
+    def _emit_position(self):
+        if self.sink is not None:
+            self.position_changed.emit(int(self.sink.processedUSecs() // 1000))
+
+    def _on_sink_state_changed(self, state):
+        if state in (QAudio.State.IdleState, QAudio.State.StoppedState):
+            self._position_timer.stop()
+        if state == QAudio.State.IdleState and self.sink is not None:
+            # QBuffer を最後まで読み終えた。シンクを止めて PCM のコピーを手放す
+            self.sink.stop()
+            self._release_buffer()
 
     def set_volume(self, value):
         """0.0 ～ 1.0 の範囲で音量を設定"""
-        self.audio_output.setVolume(value)
+        self.volume = value
+        if self.audio_output is not None:
+            self.audio_output.setVolume(value)
+        if self.sink is not None:
+            self.sink.setVolume(value)
 
     def stop(self):
-        self.player.stop()
+        if self.player is not None:
+            self.player.stop()
+        if self.sink is not None:
+            self.sink.stop()
+        self._release_buffer()
+        self._position_timer.stop()
 
     def pause(self):
-        self.player.pause()
+        if self.player is not None:
+            self.player.pause()
+        if self.sink is not None:
+            self.sink.suspend()
+            self._position_timer.stop()
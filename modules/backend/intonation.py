@@ -3,7 +3,51 @@
 import subprocess
 import os
 import sys
-import re
+import tempfile
+import threading
+
+import numpy as np
+
+def _scan_trace_labels(trace_data):
+    """
+    トレースから音素ラベル行（"開始-終了 ラベル ..."）を抽出し、
+    (開始tick配列, 終了tick配列, ラベルのリスト) を返す。
+    行は短く形式も単純なため、正規表現エンジンを使わず split / find だけで切り出す
+    （tick は 100ns 単位なので長い曲では int32 に収まらず、int64 で返す）。
+    """
+    starts, ends, labels = [], [], []
+    for line in trace_data.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 2 or not parts[0][:1].isdecimal():
+            continue
+        tick_range = parts[0]
+        dash = tick_range.find('-')
+        if dash < 0:
+            continue
+        start, end = tick_range[:dash], tick_range[dash + 1:]
+        if not (start.isdecimal() and end.isdecimal()):
+            continue
+        starts.append(int(start))
+        ends.append(int(end))
+        labels.append(parts[1])
+
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64), labels
+
+
+# モーラの終わりになる音素（母音・無声化母音・撥音・促音）と、ノートにしない無音
+_MORA_END_PHONEMES = frozenset(("a", "i", "u", "e", "o", "A", "I", "U", "E", "O", "N", "cl"))
+_SILENCE_PHONEMES = frozenset(("pau", "sil"))
+# トレースの時刻は 100ns 単位
+_TICKS_PER_SECOND = 10_000_000
+
+
+def _label_phoneme(label):
+    """フルコンテキストラベル（例: "xx^sil-k+o=..."）から現在の音素（- と + の間）を取り出す"""
+    dash = label.find('-')
+    plus = label.find('+', dash + 1)
+    if dash < 0 or plus < 0:
+        return label
+    return label[dash + 1:plus]
 
 class IntonationAnalyzer:
     def __init__(self):
@@ -17,36 +61,50 @@ class IntonationAnalyzer:
         self.exe = os.path.join(self.root, "bin", "open_jtalk", "open_jtalk.exe")
         self.dic = os.path.join(self.root, "bin", "open_jtalk", "dic")
 
+        # Windowsでのパスの空白対策として絶対パス化（呼び出しごとに解決しない）
+        self._abs_exe = os.path.abspath(self.exe)
+        self._abs_dic = os.path.abspath(self.dic)
+        # traceの出力先はインスタンスごとに1つだけ確保して使い回す
+        self._trace_path = os.path.join(tempfile.gettempdir(), f"vose_trace_{os.getpid()}_{id(self)}.txt")
+        self._lock = threading.Lock()
+
+        # GUI スレッドから呼ばれてもコンソールが一瞬表示されないようにする（Windows のみ）
+        self._creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        self._startupinfo = None
+        startupinfo_cls = getattr(subprocess, "STARTUPINFO", None)
+        if startupinfo_cls is not None:
+            self._startupinfo = startupinfo_cls()
+            self._startupinfo.dwFlags |= getattr(subprocess, "STARTF_USESHOWWINDOW", 0)
+            self._startupinfo.wShowWindow = getattr(subprocess, "SW_HIDE", 0)
+
     def analyze(self, text):
         """テキストを解析してアクセント句情報(traceデータ)を返す"""
-        temp_input = "temp_in.txt"
-        temp_trace = "temp_trace.txt"
-        
-        # Windowsでのパスの空白対策として絶対パス化
-        abs_exe = os.path.abspath(self.exe)
-        abs_dic = os.path.abspath(self.dic)
-        
-        try:
-            with open(temp_input, "w", encoding="utf-8") as f:
-                f.write(text)
-                
-            # Open JTalk実行 (-ot で解析ログを出力)
-            cmd = [abs_exe, "-x", abs_dic, "-ot", temp_trace, "-ow", "NUL", temp_input]
-            
-            # shell=Trueは環境によって必要。subprocess.runで静かに実行
-            subprocess.run(cmd, check=True, shell=True, capture_output=True)
-            
-            if os.path.exists(temp_trace):
-                with open(temp_trace, "r", encoding="utf-8") as f:
-                    return f.read()
-            return ""
-        except Exception as e:
-            print(f"Intonation Analysis Error: {e}")
-            return ""
-        finally:
-            for t in [temp_input, temp_trace]:
-                if os.path.exists(t): 
-                    os.remove(t)
+        # Open JTalk は入力を EOF まで読んでから処理するため常駐プロセスでの逐次処理はできない。
+        # 代わりに入力は stdin パイプで渡し（入力用一時ファイルなし）、shell を介さず直接起動する。
+        cmd = [self._abs_exe, "-x", self._abs_dic, "-ot", self._trace_path, "-ow", os.devnull]
+
+        with self._lock:
+            try:
+                subprocess.run(
+                    cmd,
+                    input=text.encode("utf-8"),
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    shell=False,
+                    creationflags=self._creationflags,
+                    startupinfo=self._startupinfo,
+                )
+                if os.path.exists(self._trace_path):
+                    with open(self._trace_path, "r", encoding="utf-8") as f:
+                        return f.read()
+                return ""
+            except Exception as e:
+                print(f"Intonation Analysis Error: {e}")
+                return ""
+            finally:
+                if os.path.exists(self._trace_path):
+                    os.remove(self._trace_path)
 
     def parse_trace_to_notes(self, trace_data):
         """
@@ -59,18 +117,31 @@ class IntonationAnalyzer:
 
         # [粗い解析] トレースデータ内の「Label indicating state transitions」セクションを探す
         # フォーマット例: 0-10000 xx^xx-pau+sh@xx...
-        pattern = re.compile(r'(\d+)-(\d+)\s+([^\s]+)')
-        lines = trace_data.split('\n')
-        
-       # current_time_ms = 0
-        
-        for line in lines:
-            line = line.strip()
-            # 音素ラベル行を特定 (例: 50000-150000 a^b-k+i@...)
-            match = pattern.match(line)
-            if match:
-                # 使わない変数の代入を消し、labelを正しく扱う(未使用)
-                _start_tick = int(match.group(1))
-                _end_tick = int(match.group(2))
-                _label_text = match.group(3) if (match.lastindex or 0) >= 3 else ""
-                # ここで label_text を使った処理を書くか、なければ pass
+        start_ticks, end_ticks, labels = _scan_trace_labels(trace_data)
+        if not labels:
+            return notes
+        start_sec = start_ticks / _TICKS_PER_SECOND
+        end_sec = end_ticks / _TICKS_PER_SECOND
+
+        # 子音は続く母音とまとめて1モーラ = 1ノートにする（開始は子音の頭から）
+        mora = ""
+        mora_start = None
+        for i, label in enumerate(labels):
+            phoneme = _label_phoneme(label)
+            if phoneme in _SILENCE_PHONEMES:
+                mora, mora_start = "", None
+                continue
+            if mora_start is None:
+                mora_start = i
+            mora += phoneme
+            if phoneme in _MORA_END_PHONEMES:
+                start = float(start_sec[mora_start])
+                notes.append({
+                    "lyric": mora.lower(),
+                    "start": start,
+                    "duration": float(end_sec[i]) - start,
+                    "pitch": 60,
+                })
+                mora, mora_start = "", None
+
+        return notes
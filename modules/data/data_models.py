@@ -4,16 +4,20 @@ from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Optional, Any, Union
 import json
 
-@dataclass
+@dataclass(slots=True)
 class PitchEvent:
-    """ピッチベンド（オートメーション）の1点を示すデータ構造"""
+    """
+    ピッチベンド（オートメーション）の1点を示すデータ構造。
+    パラメータ曲線は数千点になるため __slots__ でインスタンスの __dict__ を持たせない。
+    """
     time: float   # 秒単位
     # [解決] Pyrightエラー回避のため float に変更。
     # 内部計算や描画は float で行い、MIDI書き出し等の最終工程でのみ int() 変換します。
     value: float  
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # asdict は再帰的に deepcopy するため、数千点の保存では直接組み立てる
+        return {"time": self.time, "value": self.value}
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'PitchEvent':
@@ -64,10 +68,12 @@ class NoteEvent:
 
     def to_dict(self) -> Dict[str, Any]:
         """保存用に辞書化（GUI用フラグは除外）"""
-        d = asdict(self)
-        # 不要な内部状態を削除
-        d.pop('is_selected', None)
-        d.pop('is_playing', None)
+        # asdict は全フィールドを再帰的に deepcopy してから不要キーを消すので、
+        # ノート数千件の保存（オートセーブ含む）では保存対象だけを直接組み立てる。
+        # 可変なのは phonemes のリストだけなので、それだけコピーする
+        d = {name: getattr(self, name) for name in _NOTE_SAVE_FIELDS}
+        if isinstance(d["phonemes"], list):
+            d["phonemes"] = list(d["phonemes"])
         return d
 
     @classmethod
@@ -92,6 +98,12 @@ class NoteEvent:
         return cls(**normalized_data)
 
 
+# NoteEvent.to_dict で保存するフィールド（宣言順。GUI用フラグは含めない）
+_NOTE_SAVE_FIELDS = tuple(
+    name for name in NoteEvent.__dataclass_fields__ if name not in ("is_selected", "is_playing")
+)
+
+
 @dataclass
 class CharacterInfo:
     """音源キャラクター（ボイスバンク）の定義"""
@@ -1,3 +1,15 @@
-from .vose_types import CNoteEvent, as_c_double_array, validate_note_event_layout
+from .vose_types import (
+    CNoteEvent,
+    NOTE_CURVE_FIELDS,
+    as_c_double_array,
+    fill_note_curves,
+    validate_note_event_layout,
+)
 
-__all__ = ["CNoteEvent", "as_c_double_array", "validate_note_event_layout"]
+__all__ = [
+    "CNoteEvent",
+    "NOTE_CURVE_FIELDS",
+    "as_c_double_array",
+    "fill_note_curves",
+    "validate_note_event_layout",
+]
@@ -2,6 +2,8 @@
 import ctypes
 from typing import Iterable
 
+import numpy as np
+
 
 class CNoteEvent(ctypes.Structure):
     """`include/vose_core.h` の NoteEvent と ABI を一致させる。"""
@@ -19,11 +21,65 @@ class CNoteEvent(ctypes.Structure):
     ]
 
 
+# NoteEvent のカーブポインタ（fill_note_curves の curves[:, k] の並び順）
+NOTE_CURVE_FIELDS = (
+    "pitch_curve",
+    "gender_curve",
+    "tension_curve",
+    "breath_curve",
+    "vibrato_depth_curve",
+    "vibrato_rate_curve",
+)
+
+# CNoteEvent 配列を NumPy から直接書き換えるための構造化 dtype（wav_path 以外）
+_NOTE_EVENT_DTYPE = np.dtype({
+    "names": list(NOTE_CURVE_FIELDS) + ["pitch_length", "vibrato_curve_length"],
+    "formats": [np.uintp] * len(NOTE_CURVE_FIELDS) + [np.intc, np.intc],
+    "offsets": [getattr(CNoteEvent, name).offset for name in NOTE_CURVE_FIELDS]
+               + [CNoteEvent.pitch_length.offset, CNoteEvent.vibrato_curve_length.offset],
+    "itemsize": ctypes.sizeof(CNoteEvent),
+})
+
+
+def fill_note_curves(c_notes: ctypes.Array, curves: np.ndarray) -> None:
+    """`(ノート数, 6, 長さ)` の float64 配列から全ノートのカーブポインタと長さを一括設定する。
+
+    ノートごとに ctypes のフィールド代入と `data_as` を繰り返す代わりに、
+    構造体配列を NumPy の構造化ビューとして扱い、アドレスをまとめて書き込む。
+    ctypes の参照管理を経由しないため、C 側の処理が終わるまで curves は呼び出し側で保持すること。
+    """
+
+    if curves.dtype != np.float64 or not curves.flags.c_contiguous:
+        raise ValueError("curves must be a C-contiguous float64 array")
+    note_count, curve_count, length = curves.shape
+    if note_count != len(c_notes) or curve_count != len(NOTE_CURVE_FIELDS):
+        raise ValueError(
+            f"curves shape {curves.shape} does not match {len(c_notes)} notes "
+            f"x {len(NOTE_CURVE_FIELDS)} curves"
+        )
+    if note_count == 0:
+        return
+
+    view = np.frombuffer(c_notes, dtype=_NOTE_EVENT_DTYPE)
+    base = curves.ctypes.data
+    row_bytes = curves.strides[1]
+    note_bytes = curves.strides[0]
+    note_base = base + np.arange(note_count, dtype=np.uintp) * np.uintp(note_bytes)
+    for k, name in enumerate(NOTE_CURVE_FIELDS):
+        view[name] = note_base + np.uintp(k * row_bytes)
+    view["pitch_length"] = length
+    view["vibrato_curve_length"] = length
+
+
 def as_c_double_array(values: Iterable[float]) -> ctypes.Array[ctypes.c_double]:
     """Python iterable を C の `double[]` に変換する。"""
 
-    seq = tuple(float(v) for v in values)
-    return (ctypes.c_double * len(seq))(*seq)
+    # 要素ごとの float() / ctypes 変換をせず、float64 の連続配列から1回の memcpy で作る
+    arr = np.ascontiguousarray(
+        values if isinstance(values, (np.ndarray, list, tuple)) else list(values),
+        dtype=np.float64,
+    ).reshape(-1)
+    return (ctypes.c_double * arr.size).from_buffer_copy(arr)
 
 def validate_note_event_layout():
     """CNoteEvent のレイアウト検証。
@@ -41,4 +97,10 @@ def validate_note_event_layout():
 
 
 
-__all__ = ["CNoteEvent", "as_c_double_array", "validate_note_event_layout"]
+__all__ = [
+    "CNoteEvent",
+    "NOTE_CURVE_FIELDS",
+    "as_c_double_array",
+    "fill_note_curves",
+    "validate_note_event_layout",
+]
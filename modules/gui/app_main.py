@@ -7,6 +7,7 @@ import logging
 
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
+from PySide6.QtCore import QTimer
 
 
 
@@ -135,31 +136,33 @@ def main():
         AIManager = importlib.import_module("modules.ai.ai_manager").AIManager  # type: ignore[attr-defined]
         AudioOutput = importlib.import_module("modules.audio.audio_output").AudioOutput  # type: ignore[attr-defined]
 
-        # 低遅延オーディオ出力の初期化
-        audio_device = AudioOutput(sample_rate=44100, block_size=256)
-        
-        # C言語エンジンのロード
+        # C言語エンジンのロード（AI ピッチモデルは初回推論時に遅延ロードされる）
         engine = VO_SE_Engine() 
 
         if pyi_splash:
             pyi_splash.update_text("AI推論モデルを最適化中...")
 
-        # AIマネージャーの初期化
+        # AIマネージャーの初期化（辞書ロードはコンストラクタ内で完了する）
         ai = AIManager()
-        ai.init_model()
 
         # 4. メインウィンドウの作成と依存注入(Dependency Injection)
         if pyi_splash:
             pyi_splash.update_text("UIを構築中...")
             
         window = MainWindow(engine=engine, ai=ai)
-        window.audio_output = audio_device
 
         # --- 5. セットアップ完了、表示 ---
         if pyi_splash:
             pyi_splash.close()
 
         window.show()
+
+        # 低遅延オーディオ出力（デバイス探索を伴う）はウィンドウ表示後、
+        # 最初のイベントループで初期化して起動時の待ち時間から外す
+        def _attach_audio_output():
+            window.audio_output = AudioOutput(sample_rate=44100, block_size=256)
+
+        QTimer.singleShot(0, _attach_audio_output)
         
     except Exception as e:
         logging.critical(f"アプリケーションの起動に失敗しました: {e}")
@@ -1,29 +1,152 @@
 #aural_engine.py
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
 import numpy as np
 import os
+import hashlib
 import ctypes
 import _ctypes
 import platform
+import threading
+import importlib
+import importlib.util
+from collections import OrderedDict
+from functools import lru_cache
 
-if TYPE_CHECKING:
-    import onnxruntime as ort  # 型チェック時だけimport（実行時は無視）
+# onnxruntime は import だけで巨大な共有ライブラリを読み込み起動が数秒遅れるため、
+# ここでは有無の確認（find_spec）だけにして、実際の読み込みは最初の推論セッション作成時まで遅らせる
+ONNX_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
 
-try:
-    import onnxruntime as _ort  # 実行時はこちら
-    ONNX_AVAILABLE = True
-except ImportError:
-    _ort = None  # type: ignore
-    ONNX_AVAILABLE = False
 
-try:
-    import onnxruntime as ort
-    ONNX_AVAILABLE = True
-except ImportError:
-    ort = None
-    ONNX_AVAILABLE = False
+@lru_cache(maxsize=1)
+def _get_ort():
+    """onnxruntime を初回呼び出し時に読み込んで返す（2回目以降はキャッシュ）。無ければ None。"""
+    if not ONNX_AVAILABLE:
+        return None
+    try:
+        return importlib.import_module("onnxruntime")
+    except ImportError:
+        return None
+
+
+def resolve_model_path(model_path):
+    """
+    同じ場所に INT8 量子化版（*.int8.onnx）があればそちらを使う。
+    環境変数 VOSE_AI_FP32=1 で FP32 モデルに戻せる（聴き比べ用）。
+    """
+    if os.environ.get("VOSE_AI_FP32") == "1":
+        return model_path
+    int8_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+    return int8_path if os.path.exists(int8_path) else model_path
+
+
+# プロバイダー名だけが渡された時に付ける既定オプション。
+# CUDA は cuDNN の畳み込みアルゴリズム探索を既定（EXHAUSTIVE）のままにすると、入力長が変わるたびに
+# 全アルゴリズムを計測し直して1回の推論が数倍遅くなるため、ヒューリスティック（DEFAULT）にする。
+_PROVIDER_OPTIONS = {
+    "CPUExecutionProvider": {"arena_extend_strategy": "kSameAsRequested"},
+    "CUDAExecutionProvider": {"cudnn_conv_algo_search": "DEFAULT", "arena_extend_strategy": "kSameAsRequested"},
+    "DmlExecutionProvider": {"device_id": 0},
+    "CoreMLExecutionProvider": {"MLComputeUnits": "ALL"},
+}
+
+
+# TensorRT エンジンや最適化済みグラフなど、再生成に時間の掛かるものを置くユーザーキャッシュ
+# （インストール先は Program Files や PyInstaller の展開先のように書き込めない・毎回消えることがある）
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vose-pro")
+
+
+def _provider_with_options(provider):
+    """'CUDAExecutionProvider' のような名前を (名前, オプション) に直す。既にタプルならそのまま。"""
+    if not isinstance(provider, str):
+        return provider
+    if provider == "TensorrtExecutionProvider":
+        # TensorRT はエンジンのビルドに数十秒かかるので、ビルド結果をディスクにキャッシュして使い回す
+        cache_dir = os.path.join(_CACHE_DIR, "trt")
+        os.makedirs(cache_dir, exist_ok=True)
+        return (provider, {"trt_engine_cache_enable": "True", "trt_engine_cache_path": cache_dir})
+    options = _PROVIDER_OPTIONS.get(provider)
+    return (provider, dict(options)) if options is not None else provider
+
+
+def _optimized_model_path(model_path, ort_version):
+    """
+    CPU 用に最適化したグラフの保存先。元モデルのパス・更新時刻・サイズと ORT のバージョンで名前を分けるので、
+    モデルの差し替えや ORT の更新で古いグラフを読むことはない。
+    """
+    st = os.stat(model_path)
+    key = f"{os.path.abspath(model_path)}|{st.st_mtime_ns}|{st.st_size}|{ort_version}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(_CACHE_DIR, "onnx", f"{name}.{digest}.optimized.onnx")
+
+
+def _session_options(_ort, intra_op_threads):
+    so = _ort.SessionOptions()
+    so.graph_optimization_level = _ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.intra_op_num_threads = intra_op_threads
+    so.inter_op_num_threads = 1
+    so.execution_mode = _ort.ExecutionMode.ORT_SEQUENTIAL
+    so.enable_mem_pattern = True
+    so.enable_cpu_mem_arena = True
+    so.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return so
+
+
+def create_inference_session(model_path, providers=None, intra_op_threads=2):
+    """
+    VO-SE 共通設定で ONNX 推論セッションを作成する。
+    グラフ最適化・逐次実行・メモリアリーナ再利用を有効にし、スピン待ちを止めて
+    音声処理スレッドと CPU を取り合わないようにする。
+    providers 未指定（CPU のみ）の場合は最適化済みモデルをユーザーキャッシュに保存し、次回以降はそれを読み込む。
+    """
+    _ort = _get_ort()
+    if _ort is None:
+        raise RuntimeError("onnxruntime is not installed")
+
+    if providers is not None:
+        # GPU/NPU の各プロバイダーにも推奨オプションを付けて渡す
+        providers = [_provider_with_options(p) for p in providers]
+        return _ort.InferenceSession(model_path, sess_options=_session_options(_ort, intra_op_threads),
+                                     providers=providers)
+
+    # 最適化済みグラフはCPU専用なので、CPUのみで動かす場合に限りキャッシュする
+    providers = [_provider_with_options("CPUExecutionProvider")]
+    try:
+        optimized_path = _optimized_model_path(model_path, getattr(_ort, "__version__", ""))
+    except OSError:
+        optimized_path = None
+
+    if optimized_path is not None and os.path.exists(optimized_path):
+        so = _session_options(_ort, intra_op_threads)
+        so.graph_optimization_level = _ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return _ort.InferenceSession(optimized_path, sess_options=so, providers=providers)
+        except Exception as e:
+            # 壊れたキャッシュは捨てて元のモデルから作り直す
+            print(f"DEBUG: Discarding cached optimized model {optimized_path}: {e}")
+            try:
+                os.remove(optimized_path)
+            except OSError:
+                pass
+
+    if optimized_path is not None:
+        so = _session_options(_ort, intra_op_threads)
+        try:
+            os.makedirs(os.path.dirname(optimized_path), exist_ok=True)
+            so.optimized_model_filepath = optimized_path
+            return _ort.InferenceSession(model_path, sess_options=so, providers=providers)
+        except Exception as e:
+            # 保存できなくても推論には支障が無いので、保存なしで作り直す
+            print(f"DEBUG: Could not save optimized model to {optimized_path}: {e}")
+            if os.path.exists(optimized_path):
+                try:
+                    os.remove(optimized_path)
+                except OSError:
+                    pass
+
+    return _ort.InferenceSession(model_path, sess_options=_session_options(_ort, intra_op_threads),
+                                 providers=providers)
 
 
 class DynamicsMemoryManager:
@@ -89,61 +212,235 @@ class DynamicsMemoryManager:
 
 
 class AuralAIEngine:
+    # 同じモデルを複数インスタンスが読んでも重みとスレッドプールが1組で済むよう、
+    # セッションはモデルの絶対パスごとにクラス全体で共有する
+    _SESSION_CACHE: dict = {}
+    _SESSION_LOCK = threading.Lock()
+    # 疑似AIビブラート波形を保持する長さの種類数の上限
+    VIB_CACHE_SIZE = 64
+
     def __init__(self, model_path="models/aural_dynamics.onnx"):
         self.model_path = model_path
         self.session = None
-        self.cache = {}  # [高速化] 一度計算したAIピッチは保存して再利用
+        # [高速化] 一度計算したAIピッチは保存して再利用
+        # (note_id, strength) -> (入力カーブのハッシュ, 結果)。カーブを編集すると同じキーの中身を差し替える
+        self.cache = {}
+        # 疑似AIビブラート波形（長さ→波形）。リアルタイム側は毎回違う長さを渡すので LRU で上限を設ける
+        self._vib_cache: OrderedDict[int, np.ndarray] = OrderedDict()
+
+        # IOBinding 用の再利用バッファ（推論ごとの入出力テンソル確保を避ける）
+        self._io = None
+        self._output_name = None
+        self._output_rank = 3
+        self._in_buf = np.empty(0, dtype=np.float32)
+        self._out_buf = np.empty(0, dtype=np.float32)
+
+        # ONNX セッションの構築は重いため、起動時ではなく最初の推論時に行う
+        self._session_loaded = False
+
+    def _ensure_session(self):
+        """初回呼び出し時にだけ推論セッションを構築し、利用可能かを返す"""
+        if self._session_loaded:
+            return self.session is not None
+        self._session_loaded = True
 
         if ONNX_AVAILABLE and os.path.exists(self.model_path):
             try:
                 # [最適化] スレッド数を制限してCore i3などの低スペック環境でも安定動作
-                sess_options = _ort.SessionOptions()    # type: ignore[union-attr]
-                sess_options.intra_op_num_threads = 2
-                self.session = _ort.InferenceSession(         # type: ignore[union-attr]
-                    self.model_path,
-                    sess_options=sess_options,  
-                    providers=['CPUExecutionProvider']
-                )
-                print(f"[AI Core] Inference Engine Online: {self.model_path}")
+                # 入力は FP32 のまま（量子化モデルは先頭で量子化し、MatMul を int8 で実行する）
+                load_path = os.path.abspath(resolve_model_path(self.model_path))
+                cls = type(self)
+                with cls._SESSION_LOCK:
+                    session = cls._SESSION_CACHE.get(load_path)
+                    if session is None:
+                        session = create_inference_session(load_path, intra_op_threads=2)
+                        cls._SESSION_CACHE[load_path] = session
+                self.session = session
+                output_meta = self.session.get_outputs()[0]
+                self._output_name = output_meta.name
+                self._output_rank = len(output_meta.shape) if output_meta.shape else 3
+                self._io = self.session.io_binding()
+                print(f"[AI Core] Inference Engine Online: {load_path}")
             except Exception as e:
+                self.session = None
                 print(f"[AI Core] Init Error: {e}")
+        return self.session is not None
+
+    def _infer_delta(self, base_f0_array):
+        """
+        AIモデルでピッチの揺れ（delta）を推論する。
+        入出力は再利用バッファに IOBinding で直接バインドし、戻り値はそのビュー
+        （次の推論で上書きされるため、呼び出し側で必ず新しい配列に加工すること）。
+        """
+        n = len(base_f0_array)
+
+        # バッファは必要な長さまで伸ばすだけで、縮めない
+        if self._in_buf.size < n:
+            self._in_buf = np.empty(n, dtype=np.float32)
+            self._out_buf = np.empty(n, dtype=np.float32)
+        in_view = self._in_buf[:n]
+        # float32 入力なら memcpy、それ以外でも型変換とコピーを1回で済ませる（astype の一時配列なし）
+        np.copyto(in_view, base_f0_array, casting='unsafe')
+
+        if self._io is None:
+            delta = self.session.run(None, {"input": in_view.reshape(1, n, 1)})[0]  # type: ignore[union-attr]
+            return np.asarray(delta, dtype=np.float32).reshape(-1)
+
+        out_view = self._out_buf[:n]
+
+        out_shape = (1, n, 1) if self._output_rank == 3 else (1, n)
+        try:
+            self._io.bind_input("input", "cpu", 0, np.float32, [1, n, 1], in_view.ctypes.data)
+            self._io.bind_output(self._output_name, "cpu", 0, np.float32, list(out_shape), out_view.ctypes.data)
+            self.session.run_with_iobinding(self._io)  # type: ignore[union-attr]
+        except Exception as e:
+            # モデルの出力形状が想定と違う場合などは通常の run に戻す
+            print(f"[AI Core] IOBinding disabled: {e}")
+            self._io = None
+            return self._infer_delta(base_f0_array)
+        return out_view
 
     def get_baked_pitch(self, note_id, base_f0_array, strength=0.8):
         """
         [ベイク方式 + キャッシュ] 
         一度だけAIに計算させて結果を保存(Bake)する。
-        同じnote_idが来たらキャッシュから即レスポンス。
+        同じnote_idかつ同じ入力カーブが来たらキャッシュから即レスポンス。
         """
-        if note_id in self.cache:
-            return self.cache[note_id]
+        cache_key = (note_id, float(strength))
+        digest = self._curve_digest(base_f0_array)
+        cached = self._bake_lookup(cache_key, digest)
+        if cached is not None:
+            return cached
 
-        if not self.session:
+        if not self._ensure_session():
             return self._apply_pseudo_ai(base_f0_array)
 
-        input_data = base_f0_array.astype(np.float32).reshape(1, -1, 1)
-        delta = self.session.run(None, {"input": input_data})[0]
-        delta_arr = np.asarray(delta, dtype=np.float32).reshape(-1)
+        delta_arr = self._infer_delta(base_f0_array)
 
-        final_pitch = base_f0_array + (delta_arr * strength)
-        self.cache[note_id] = final_pitch
+        final_pitch = self._blend_delta(base_f0_array, delta_arr, strength)
+        # キャッシュは呼び出し元間で共有されるため読み取り専用にする
+        # （in-place 加工による二重適用を防ぎ、スレッド間でも安全に参照できる）
+        final_pitch.setflags(write=False)
+        self.cache[cache_key] = (digest, final_pitch)
 
         return final_pitch
 
+    @staticmethod
+    def _curve_digest(base_f0_array):
+        # note_id だけだとカーブ編集後も古い結果が返る（id() は再利用もされる）ため、
+        # 入力カーブの内容ハッシュが一致したときだけキャッシュを使う
+        return hashlib.blake2b(
+            np.ascontiguousarray(base_f0_array, dtype=np.float32).tobytes(),
+            digest_size=8,
+        ).digest()
+
+    def _bake_lookup(self, cache_key, digest):
+        """キャッシュ済みの結果を返す。カーブが変わっていれば None（古い結果は次の保存で上書きされる）"""
+        entry = self.cache.get(cache_key)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        return None
+
+    def get_baked_pitch_batch(self, note_ids, base_f0_arrays, strength=0.8):
+        """
+        get_baked_pitch の複数ノート版。
+        キャッシュに無いノートだけを1回のバッチ推論にまとめ、結果を個別にキャッシュする。
+        """
+        results = [None] * len(base_f0_arrays)
+        miss_keys, miss_idx = [], []
+        for i, (note_id, f0) in enumerate(zip(note_ids, base_f0_arrays)):
+            cache_key = (note_id, float(strength))
+            digest = self._curve_digest(f0)
+            cached = self._bake_lookup(cache_key, digest)
+            if cached is not None:
+                results[i] = cached
+            else:
+                miss_keys.append((cache_key, digest))
+                miss_idx.append(i)
+
+        if not miss_idx:
+            return results
+        if not self._ensure_session():
+            for i in miss_idx:
+                results[i] = self._apply_pseudo_ai(base_f0_arrays[i])
+            return results
+
+        baked = self.generate_emotional_pitch_batch([base_f0_arrays[i] for i in miss_idx], strength)
+        for i, (cache_key, digest), final_pitch in zip(miss_idx, miss_keys, baked):
+            final_pitch.setflags(write=False)
+            self.cache[cache_key] = (digest, final_pitch)
+            results[i] = final_pitch
+        return results
+
+    def generate_emotional_pitch_batch(self, base_f0_arrays, strength=0.8):
+        """
+        [バッチ版] 複数のピッチカーブを (B, 最大長, 1) にまとめて1回で推論する。
+        短いカーブは末尾の値で埋め、結果は元の長さに切り戻す。
+        オフライン書き出しなど、多数のノートを一度に処理する用途向け。
+        """
+        if not base_f0_arrays:
+            return []
+        if not self._ensure_session():
+            return [self._apply_pseudo_ai(f0) for f0 in base_f0_arrays]
+        if len(base_f0_arrays) == 1:
+            return [self.generate_emotional_pitch(base_f0_arrays[0], strength)]
+
+        lengths = [len(f0) for f0 in base_f0_arrays]
+        max_len = max(lengths)
+        batch = np.empty((len(base_f0_arrays), max_len, 1), dtype=np.float32)
+        for row, f0, n in zip(batch, base_f0_arrays, lengths):
+            row[:n, 0] = f0
+            row[n:, 0] = f0[-1] if n else 0.0
+
+        try:
+            delta = self.session.run(None, {"input": batch})[0]  # type: ignore[union-attr]
+            delta = np.asarray(delta, dtype=np.float32).reshape(len(base_f0_arrays), max_len)
+        except Exception as e:
+            # バッチ次元が固定のモデルなどは1本ずつの推論に戻す
+            print(f"[AI Core] Batch inference unavailable: {e}")
+            return [self.generate_emotional_pitch(f0, strength) for f0 in base_f0_arrays]
+
+        return [self._blend_delta(f0, d[:n], strength) for f0, d, n in zip(base_f0_arrays, delta, lengths)]
+
     def generate_emotional_pitch(self, base_f0_array, strength=0.8):
         """
         [キャッシュなし版] 毎回AIで推論して人間らしい『揺れ』を加える。
         note_idを使わないリアルタイム処理向け。
         """
-        if not self.session:
+        if not self._ensure_session():
             return self._apply_pseudo_ai(base_f0_array)
 
-        input_data = base_f0_array.astype(np.float32).reshape(1, -1, 1)
-        delta = self.session.run(None, {"input": input_data})[0]
-        delta_arr = np.asarray(delta, dtype=np.float32).reshape(-1)
+        delta_arr = self._infer_delta(base_f0_array)
 
-        return base_f0_array + (delta_arr * strength)  # strengthバグ修正済み
+        return self._blend_delta(base_f0_array, delta_arr, strength)  # strengthバグ修正済み
 
-    def _apply_pseudo_ai(self, f0):
+    @staticmethod
+    def _blend_delta(base_f0_array, delta_arr, strength):
+        """
+        base + delta * strength を出力配列1本だけで計算する。
+        呼び出し元の base_f0_array は書き換えない（キャッシュやUI側で再利用されるため）。
+        """
+        out = np.empty(len(delta_arr), dtype=np.result_type(base_f0_array, delta_arr))
+        np.multiply(delta_arr, strength, out=out)
+        np.add(out, base_f0_array, out=out)
+        return out
+
+    def _apply_pseudo_ai(self, f0, out=None):
         """AIモデルがない時の予備ロジック（5Hzビブラートエミュレーション）"""
-        x = np.linspace(0, 10, len(f0))
-        return f0 + (np.sin(x * 5) * 2)
+        # ビブラート波形は長さだけで決まるため、長さごとに一度だけ sin を計算して使い回す
+        n = len(f0)
+        vib = self._vib_cache.get(n)
+        if vib is None:
+            x = np.linspace(0, 10, n)
+            vib = np.sin(x * 5) * 2
+            vib.setflags(write=False)
+            self._vib_cache[n] = vib
+            if len(self._vib_cache) > self.VIB_CACHE_SIZE:
+                self._vib_cache.popitem(last=False)
+        else:
+            self._vib_cache.move_to_end(n)
+        return np.add(f0, vib, out=out)
+
+
+# 旧 DynamicsAIEngine は AuralAIEngine と同じモデル・同じ処理だったため一本化する
+DynamicsAIEngine = AuralAIEngine
@@ -4,6 +4,7 @@ import ctypes
 import numpy as np
 import platform
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 try:
@@ -24,11 +25,23 @@ except Exception:
             ("sample_rate", ctypes.c_int),
         ]
 
+# CNoteEvent 配列を NumPy の構造化ビューとして一括で書き込むための dtype
+_NOTE_FIELDS = ("note_number", "start_time", "duration", "velocity")
+_NOTE_FIELD_TYPES = dict(CNoteEvent._fields_)
+_NOTE_DTYPE = np.dtype({
+    "names": list(_NOTE_FIELDS),
+    "formats": [np.dtype(_NOTE_FIELD_TYPES[name]) for name in _NOTE_FIELDS],
+    "offsets": [getattr(CNoteEvent, name).offset for name in _NOTE_FIELDS],
+    "itemsize": ctypes.sizeof(CNoteEvent),
+})
+
 class DynamicsEngine:
     lib: Optional[ctypes.CDLL]
 
     def __init__(self, dll_path: str, _model_path: str):
         self.lib = None 
+        # C 側バッファの解放はコピー後に別スレッドで行い、合成結果の受け渡しを待たせない
+        self._free_executor = ThreadPoolExecutor(max_workers=1)
         system = platform.system()
         
         if system == "Windows":
@@ -88,19 +101,22 @@ class DynamicsEngine:
             float_array = np.ctypeslib.as_array(audio_ptr, shape=(count,))
             return float_array.copy()
         finally:
-            lib.vse_free_buffer(audio_ptr)
+            # copy() 済みなので C 側バッファへの参照は残っていない
+            self._free_executor.submit(lib.vse_free_buffer, audio_ptr)
 
     def _build_request(self, raw_notes):
         """PythonのデータをC言語の構造体にパッキングする"""
         note_count = len(raw_notes)
         c_notes = (CNoteEvent * note_count)()
 
-        for i, n in enumerate(raw_notes):
-            c_notes[i].note_number = n['note']
-            c_notes[i].start_time = n['start']
-            c_notes[i].duration = n['duration']
-            c_notes[i].velocity = 100
-            
+        # ノートごとの ctypes setattr を避け、列ごとにまとめて構造体配列へ書き込む
+        if note_count:
+            view = np.frombuffer(c_notes, dtype=_NOTE_DTYPE)
+            view['note_number'] = [n['note'] for n in raw_notes]
+            view['start_time'] = [n['start'] for n in raw_notes]
+            view['duration'] = [n['duration'] for n in raw_notes]
+            view['velocity'] = 100
+
         req = SynthesisRequest()
         req.notes = ctypes.cast(c_notes, ctypes.POINTER(CNoteEvent))
         req.note_count = note_count
@@ -113,6 +129,10 @@ class DynamicsEngine:
         if lib is None:
             return
 
+        # 保留中の vse_free_buffer を DLL 解放前にすべて終わらせる
+        self._free_executor.shutdown(wait=True)
+        self._free_executor = ThreadPoolExecutor(max_workers=1)
+
         handle = lib._handle
         system = platform.system()
 
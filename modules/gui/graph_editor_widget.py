@@ -1,39 +1,84 @@
 #graph_editor_widget.py
 
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, Signal, Slot, QRect, QPointF
-from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QPaintEvent, QMouseEvent, QPainterPath
+from PySide6.QtCore import Qt, Signal, Slot, QRect, QRectF, QPointF, QTimer
+from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QPaintEvent, QMouseEvent, QPainterPath, QPolygonF, QPixmap
 from modules.data.data_models import PitchEvent
 import bisect
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+
+try:
+    import shiboken6
+except ImportError:
+    shiboken6 = None
 
 import logging
 logger = logging.getLogger(__name__)
 
+
+def _polygon_view(poly: QPolygonF) -> Optional[np.ndarray]:
+    """QPolygonF の内部バッファ（double x,y の連続領域）を (N, 2) の ndarray として見せる。"""
+    n = poly.size()
+    if shiboken6 is None or n == 0:
+        return None
+    buf = shiboken6.VoidPtr(poly.data(), n * 16, True)
+    return np.frombuffer(buf, dtype=np.float64).reshape(n, 2)
+
+
+def _polygon_from_arrays(xs: np.ndarray, ys: np.ndarray, poly: Optional[QPolygonF] = None) -> QPolygonF:
+    """
+    xs / ys の配列から QPolygonF を組み立てる。
+    QPolygonF の内部バッファに NumPy で直接書き込むため、
+    点ごとの QPointF 生成や Python ループが発生しない。
+    poly を渡すとその QPolygonF を作り直さずにサイズ変更して上書きする。
+    """
+    n = int(xs.shape[0])
+    if shiboken6 is None:
+        return QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+    if poly is None:
+        poly = QPolygonF()
+    poly.resize(n)
+    mem = _polygon_view(poly)
+    if mem is not None:
+        mem[:, 0] = xs
+        mem[:, 1] = ys
+    return poly
+
+
 class GraphEditorWidget(QWidget):
     parameters_changed = Signal(dict) 
 
     PITCH_MAX = 8191
     PITCH_MIN = -8192
 
+    # 代表が追加した WORLD 用のパラメータ構成（編集モードの並び順）
+    _MODES = ("Pitch", "Gender", "Tension", "Breath")
+    # ヒットテストの候補がこの数を超えたら NumPy で一括判定する
+    _HIT_VECTOR_MIN = 16
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.setMinimumHeight(150)
         self.setMouseTracking(True)
+        # 背景 Pixmap で毎回全面を不透明に塗るので、Qt による事前の背景消去は省く
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
         
         self.scroll_x_offset = 0.0
-        self.pixels_per_beat = 40.0
-        self.tempo = 120.0
+        # 秒⇔ピクセルの換算係数（tempo / pixels_per_beat の setter で更新される）
+        self._sec_to_px = 1.0
+        self._px_to_sec = 1.0
+        self._pixels_per_beat = 40.0
+        self._tempo = 120.0
+        self._update_scale()
+        # Y 軸の換算定数（resizeEvent で更新される）
+        self._update_y_consts(self.height())
         
         # 代表が追加した WORLD 用のパラメータ構成を維持
-        self.all_parameters: Dict[str, List[PitchEvent]] = {
-            "Pitch": [],
-            "Gender": [],
-            "Tension": [],
-            "Breath": []
-        }
+        self.all_parameters: Dict[str, List[PitchEvent]] = {m: [] for m in self._MODES}
         
-        self.current_mode = "Pitch"
+        self.current_mode = self._MODES[0]
         self.colors = {
             "Pitch": QColor(0, 255, 127),      # ネオングリーン
             "Gender": QColor(231, 76, 60),     # ソフトレッド
@@ -44,13 +89,53 @@ class GraphEditorWidget(QWidget):
         self.editing_point_index: Optional[int] = None
         self.hover_point_index: Optional[int] = None
 
+        # ドラッグ中の parameters_changed は約30Hzに間引く（受け側の処理が重いため）。
+        # ドラッグ終了時には必ず即座に通知する。
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(33)
+        self._emit_timer.timeout.connect(self._emit_parameters_changed)
+
+        # all_parameters の全モードの点を1本の (N, 2) 配列 [time, value] に詰めたもの（CSR 形式）。
+        # モード k の点は _pts[_mode_off[k]:_mode_off[k+1]] に time 昇順で並ぶ。
+        # リストは外部（保存・読込・レンダリング）との互換のため PitchEvent のまま持ち、
+        # 描画や座標変換はこの配列に対してまとめて行う。
+        self._mode_index = {m: k for k, m in enumerate(self._MODES)}
+        self._pts = np.empty((0, 2), dtype=np.float64)
+        self._mode_off = np.zeros(len(self._MODES) + 1, dtype=np.int64)
+        # モードごとの (元リスト, 点数)。外部でのリスト差し替えを同一性で検出する
+        self._mode_src: List[Optional[tuple]] = [None] * len(self._MODES)
+        # モードごとの変更番号（曲線キャッシュの鍵）
+        self._mode_ver: List[int] = [0] * len(self._MODES)
+
+        # モードごとの曲線（QPolygonF と QPainterPath）のキャッシュ。
+        # X はスクロール前の絶対座標で持ち、描画時に painter.translate で横スクロールを当てる。
+        # 値は (変更番号, (秒→px係数, height), polygon, path)。
+        self._path_cache: Dict[str, Optional[tuple]] = {m: None for m in self.all_parameters}
+        # 画面内区間の描画用にモードごとに使い回す QPolygonF（毎フレームの確保・解放を避ける）
+        self._poly_buf: Dict[str, QPolygonF] = {m: QPolygonF() for m in self.all_parameters}
+
+        # コントロールポイントの丸を1度だけラスタライズしたスタンプ（(色, dpr) ごと）と、
+        # drawPixmapFragments に渡す PixmapFragment 配列（float64 x 10 / 点）の使い回しバッファ
+        self._dot_pix: Dict[tuple, QPixmap] = {}
+        self._frag_buf = np.empty((0, 10), dtype=np.float64)
+
+        # 背景（塗りつぶし・センターライン・非アクティブモードのガイド曲線）を焼き込んだ Pixmap。
+        # ホバー中の再描画ではこれを貼るだけにする。_bg_key / _bg_paths が一致する間は再利用する。
+        self._bg_pixmap: Optional[QPixmap] = None
+        self._bg_key: Optional[tuple] = None
+        self._bg_paths: tuple = ()
+
         logger.info("GraphEditorWidget initialized successfully.")
 
         # --- Compatibility methods (called from MainWindow) ---
     def set_horizontal_offset(self, offset: int) -> None:
         """タイムラインの水平スクロールと同期。"""
         try:
+            if float(offset) == self.scroll_x_offset:
+                return
             self.scroll_x_offset = float(offset)
+            self._bg_pixmap = None
             self.update()
         except Exception:
             pass
@@ -71,86 +156,263 @@ class GraphEditorWidget(QWidget):
         if not events:
             return 0.0
         try:
-            # eventsはtime昇順前提。直前値を返す簡易実装
-            last_val = float(getattr(events[0], "value", 0.0))
-            for ev in events:
-                ev_t = float(getattr(ev, "time", 0.0))
-                ev_v = float(getattr(ev, "value", last_val))
-                if ev_t > t:
-                    break
-                last_val = ev_v
-            return last_val
+            # eventsはtime昇順前提。直前値を二分探索で返す（先頭より前は先頭の値）
+            ev_times, ev_values = self._event_arrays(events)
+            i = int(np.searchsorted(ev_times, float(t), side='right')) - 1
+            return float(ev_values[max(i, 0)])
         except Exception:
             return 0.0
 
+    def get_values_at_times(self, events: list, times) -> List[float]:
+        """
+        MainWindow互換: get_value_at_time を時刻列に対してまとめて評価する。
+        直前値ホールドの意味は同じまま、searchsorted 1回で全時刻のインデックスを求める。
+        """
+        ts = np.asarray(times, dtype=np.float64)
+        if not events:
+            return [0.0] * ts.size
+        try:
+            ev_times, ev_values = self._event_arrays(events)
+            idx = np.searchsorted(ev_times, ts, side='right') - 1
+            np.maximum(idx, 0, out=idx)
+            return ev_values[idx].tolist()
+        except Exception:
+            return [0.0] * ts.size
+
+    def _event_arrays(self, events: list) -> Tuple[np.ndarray, np.ndarray]:
+        """自分のモードのリストならキャッシュ済み配列を、それ以外はその場で配列化して返す。"""
+        for mode, lst in self.all_parameters.items():
+            if lst is events:
+                return self._get_soa(mode)
+        n = len(events)
+        ev_times = np.fromiter((float(getattr(ev, "time", 0.0)) for ev in events), dtype=np.float64, count=n)
+        ev_values = np.fromiter((float(getattr(ev, "value", 0.0)) for ev in events), dtype=np.float64, count=n)
+        return ev_times, ev_values
+
+    def _emit_parameters_changed(self) -> None:
+        self.parameters_changed.emit(self.all_parameters)
+
     @Slot(str)
     def set_mode(self, mode: str):
-        if mode in self.all_parameters:
+        if mode in self._MODES and mode != self.current_mode:
             self.current_mode = mode
             self.editing_point_index = None
+            self._bg_pixmap = None
             self.update()
 
-    def time_to_x(self, seconds: float) -> float:
-        beats = (seconds * self.tempo) / 60.0
-        return float((beats * self.pixels_per_beat) - self.scroll_x_offset)
+    def _get_soa(self, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+        """指定モードの (times, values) を _pts のビューとして返す。元リストが差し替えられていれば詰め直す。"""
+        k = self._mode_index.get(mode)
+        if k is None:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+
+        events = self.all_parameters.get(mode, ())
+        src = self._mode_src[k]
+        if src is None or src[0] is not events or src[1] != len(events):
+            n = len(events)
+            rows = np.empty((n, 2), dtype=np.float64)
+            rows[:, 0] = np.fromiter((e.time for e in events), dtype=np.float64, count=n)
+            rows[:, 1] = np.fromiter((e.value for e in events), dtype=np.float64, count=n)
+            # 読込や Undo などで外部から差し替えられたリストは time 順とは限らない。
+            # 編集時は insort で順序を保っているので、並べ替えは詰め直しのこの1回だけで済む
+            if n > 1 and bool((rows[1:, 0] < rows[:-1, 0]).any()):
+                order = np.argsort(rows[:, 0], kind='stable')
+                rows = rows[order]
+                events[:] = [events[i] for i in order.tolist()]
+            start, end = int(self._mode_off[k]), int(self._mode_off[k + 1])
+            self._pts = np.concatenate((self._pts[:start], rows, self._pts[end:]))
+            self._mode_off[k + 1:] += n - (end - start)
+            self._touch_mode(k, events)
+
+        start, end = int(self._mode_off[k]), int(self._mode_off[k + 1])
+        return self._pts[start:end, 0], self._pts[start:end, 1]
+
+    def _touch_mode(self, k: int, events: list) -> None:
+        """モード k の配列を元リストと同期済みとして記録し、曲線キャッシュを無効化する。"""
+        self._mode_src[k] = (events, len(events))
+        self._mode_ver[k] += 1
+        self._path_cache[self._MODES[k]] = None
+
+    def _insert_point(self, mode: str, t: float, v: float) -> None:
+        """モードのスライスへ time 順を保って1点挿入し、後続モードのオフセットをずらす。"""
+        k = self._mode_index[mode]
+        times, _ = self._get_soa(mode)
+        pos = int(self._mode_off[k]) + int(np.searchsorted(times, t, side='right'))
+        self._pts = np.insert(self._pts, pos, (t, v), axis=0)
+        self._mode_off[k + 1:] += 1
+
+    def _delete_points(self, mode: str, indices) -> None:
+        """モード内インデックスの点を削除し、後続モードのオフセットを詰める。"""
+        k = self._mode_index[mode]
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size == 0:
+            return
+        self._pts = np.delete(self._pts, int(self._mode_off[k]) + indices, axis=0)
+        self._mode_off[k + 1:] -= indices.size
+
+    def _invalidate_mode(self, mode: str) -> None:
+        """元リストを直接並べ替えた時など、次回アクセスでモードの配列を詰め直させる。"""
+        k = self._mode_index.get(mode)
+        if k is not None:
+            self._mode_src[k] = None
+        self._path_cache[mode] = None
+
+    def _get_curve(self, mode: str) -> Tuple[QPolygonF, QPainterPath]:
+        """指定モードの曲線を返す。データと表示スケールが変わらない限り作り直さない。"""
+        times, values = self._get_soa(mode)
+        k = self._mode_index.get(mode)
+        ver = self._mode_ver[k] if k is not None else -1
+        geom = (self._sec_to_px, self.height())
+        cached = self._path_cache.get(mode)
+        if cached is not None and cached[0] == ver and cached[1] == geom:
+            return cached[2], cached[3]
+
+        xs = times * self._sec_to_px
+        ys = self.value_to_y_for_mode(values, mode)
+        poly = _polygon_from_arrays(xs, ys)
+        path = QPainterPath()
+        path.addPolygon(poly)
+        self._path_cache[mode] = (ver, geom, poly, path)
+        return poly, path
+
+    def _move_cached_point(self, mode: str, index: int, t: float, v: float) -> None:
+        """
+        ドラッグ中の1点移動を、キャッシュ済みの QPolygonF / QPainterPath へその場で反映する。
+        曲線全体を作り直さないので、ドラッグ中の再描画でも確保が発生しない。
+        """
+        cached = self._path_cache.get(mode)
+        if cached is None or cached[1] != (self._sec_to_px, self.height()):
+            self._path_cache[mode] = None
+            return
+        poly, path = cached[2], cached[3]
+        mem = _polygon_view(poly)
+        if mem is None or not 0 <= index < path.elementCount():
+            self._path_cache[mode] = None
+            return
+        x = t * self._sec_to_px
+        y = float(self.value_to_y_for_mode(v, mode))
+        mem[index, 0] = x
+        mem[index, 1] = y
+        path.setElementPositionAt(index, x, y)
+
+    # MainWindow は tempo / pixels_per_beat を属性として直接書き換えるため、
+    # プロパティで受けて換算係数を作り直す
+    @property
+    def tempo(self) -> float:
+        return self._tempo
+
+    @tempo.setter
+    def tempo(self, value: float) -> None:
+        self._tempo = float(value)
+        self._update_scale()
+
+    @property
+    def pixels_per_beat(self) -> float:
+        return self._pixels_per_beat
+
+    @pixels_per_beat.setter
+    def pixels_per_beat(self, value: float) -> None:
+        self._pixels_per_beat = float(value)
+        self._update_scale()
+
+    def _update_scale(self) -> None:
+        self._sec_to_px = self._tempo * self._pixels_per_beat / 60.0
+        self._px_to_sec = 1.0 / self._sec_to_px if self._sec_to_px else 0.0
+
+    def time_to_x(self, seconds):
+        """秒 → X座標。ndarray を渡すとまとめて変換した配列を返す。"""
+        if isinstance(seconds, np.ndarray):
+            return seconds * self._sec_to_px - self.scroll_x_offset
+        return float(seconds * self._sec_to_px - self.scroll_x_offset)
 
     def x_to_time(self, x: float) -> float:
-        absolute_x = x + self.scroll_x_offset
-        beats = absolute_x / self.pixels_per_beat
-        return float((beats * 60.0) / self.tempo)
+        return float((x + self.scroll_x_offset) * self._px_to_sec)
 
-    def value_to_y(self, value: float) -> float:
-        h = float(self.height())
-        if self.current_mode == "Pitch":
-            center_y = h / 2.0
-            range_y = center_y * 0.8
-            return center_y - (value / self.PITCH_MAX) * range_y
-        else:
-            return h - (value * (h * 0.8) + (h * 0.1))
+    def _update_y_consts(self, h: float) -> None:
+        """高さに依存する Y 軸の換算定数をまとめて作り直す（resizeEvent から呼ぶ）。"""
+        h = float(h)
+        self._h = h
+        # Pitch: 中央を 0 とし、上下に高さの 40% ずつ振る
+        self._center_y = h * 0.5
+        range_y = h * 0.4
+        self._pitch_scale = range_y / self.PITCH_MAX
+        self._inv_pitch_scale = self.PITCH_MAX / range_y if range_y else 0.0
+        # その他: 下端から 10% 〜 90% を 0.0 〜 1.0 に割り当てる
+        self._other_off = h * 0.9
+        self._other_scale = h * 0.8
+        self._inv_other_scale = 1.0 / self._other_scale if self._other_scale else 0.0
 
-    def y_to_value(self, y: float) -> float:
-        h = float(self.height())
+    def resizeEvent(self, event):
+        self._update_y_consts(event.size().height())
+        super().resizeEvent(event)
+
+    def value_to_y(self, value):
+        return self.value_to_y_for_mode(value, self.current_mode)
+
+    def y_to_value(self, y):
+        """Y座標 → 値（範囲内にクランプ）。ndarray を渡すと np.clip でまとめて変換する。"""
         if self.current_mode == "Pitch":
-            center_y = h / 2.0
-            range_y = center_y * 0.8
-            val = -((y - center_y) / range_y) * self.PITCH_MAX
-            return float(max(self.PITCH_MIN, min(self.PITCH_MAX, val)))
+            val = (self._center_y - y) * self._inv_pitch_scale
+            lo, hi = self.PITCH_MIN, self.PITCH_MAX
         else:
-            val = (h - y - (h * 0.1)) / (h * 0.8)
-            return float(max(0.0, min(1.0, val)))
+            val = (self._other_off - y) * self._inv_other_scale
+            lo, hi = 0.0, 1.0
 
-    def value_to_y_for_mode(self, value: float, mode: str) -> float:
-        h = float(self.height())
+        if isinstance(val, np.ndarray):
+            return np.clip(val, lo, hi, out=val)
+        # スカラーは min()/max() の関数呼び出しを避けて比較だけでクランプする
+        if val < lo:
+            val = lo
+        elif val > hi:
+            val = hi
+        return float(val)
+
+    def value_to_y_for_mode(self, value, mode: str):
+        """値 → Y座標（モード指定）。float / ndarray のどちらでも受け付ける。"""
         if mode == "Pitch":
-            center_y = h / 2.0
-            return center_y - (value / self.PITCH_MAX) * (center_y * 0.8)
-        else:
-            return h - (value * (h * 0.8) + (h * 0.1))
+            return self._center_y - value * self._pitch_scale
+        return self._other_off - value * self._other_scale
 
     def _get_point_at_pos(self, pos: QPointF, events: list) -> int | None:
         """
-        [O(log N) 高速探索アルゴリズム]
-        総当たり(O(N))を廃止し、クリックされた時間(X座標)周辺の点のみをピンポイントで検証する。
+        [O(log N + k) 高速探索アルゴリズム]
+        CSR 配列の times（time 昇順）を searchsorted で二分探索し、
+        判定円（半径8px）の横幅に入る点だけを候補として検証する。
         """
         if not events:
             return None
-            
-        click_time = self.x_to_time(pos.x())
-        
-        # bisectを使って、クリックされた時間が挿入されるべきインデックスを高速に特定
-        idx = bisect.bisect_left(events, click_time, key=lambda e: e.time)
-        
-        # ピクセルの当たり判定（16x16）を考慮し、前後数個の点だけを調べる
-        start_idx = max(0, idx - 2)
-        end_idx = min(len(events), idx + 2)
-        
-        for i in range(start_idx, end_idx):
-            p = events[i]
-            px = self.time_to_x(p.time)
-            py = self.value_to_y(p.value)
-            if QRect(int(px)-8, int(py)-8, 16, 16).contains(pos.toPoint()):
-                return i
-        return None
+
+        times, values = self._get_soa(self.current_mode)
+        px, py = pos.x(), pos.y()
+
+        # ヒットボックス ±8px に相当する時間範囲だけを切り出す
+        t_lo = self.x_to_time(px - 8)
+        t_hi = self.x_to_time(px + 8)
+        lo = int(np.searchsorted(times, t_lo, side='left'))
+        hi = int(np.searchsorted(times, t_hi, side='right'))
+        if lo >= hi:
+            return None
+
+        # 判定は半径8pxの円。点が密集して複数当たる場合はカーソルに最も近い点を選ぶ。
+        xs = self.time_to_x(times[lo:hi])
+        ys = self.value_to_y_for_mode(values[lo:hi], self.current_mode)
+        if hi - lo > self._HIT_VECTOR_MIN:
+            # ズームアウト時など候補が多い時は NumPy の比較で一括判定する
+            d2 = (xs - px) ** 2 + (ys - py) ** 2
+            i = int(np.argmin(d2))
+            return lo + i if d2[i] < 64.0 else None
+
+        # 候補が数点なら、配列演算の一時確保より float の比較ループの方が速い
+        best: Optional[int] = None
+        best_d2 = 64.0
+        for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+            dx = px - x
+            dy = py - y
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best, best_d2 = i, d2
+        return None if best is None else lo + best
 
     def mouseDoubleClickEvent(self, event):
         """
@@ -170,12 +432,19 @@ class GraphEditorWidget(QWidget):
             current_list = self.all_parameters.get(self.current_mode)
             
             if current_list is not None:
-                # 1ms以内の既存点を削除（上書き動作）
-                current_list[:] = [p for p in current_list if abs(p.time - time_val) > 0.001]
+                # 配列側をリストと同期させてから、リストと同じ編集を np.delete / np.insert で当てる
+                times, _ = self._get_soa(self.current_mode)
+
+                # 1ms以内の既存点を削除（上書き動作）。該当は高々数点なので、その位置だけ消す
+                near = np.flatnonzero(np.abs(times - time_val) <= 0.001)
+                self._delete_points(self.current_mode, near)
+                for i in near[::-1].tolist():
+                    del current_list[i]
                 
-                # リストに追加してソート
-                current_list.append(new_point)
-                current_list.sort(key=lambda x: x.time)
+                # リストは time 昇順を保っているので、全体ソートではなく二分探索で挿入する
+                self._insert_point(self.current_mode, time_val, param_val)
+                bisect.insort(current_list, new_point, key=lambda x: x.time)
+                self._touch_mode(self._mode_index[self.current_mode], current_list)
                 
                 # 変更通知
                 self.parameters_changed.emit(self.all_parameters)
@@ -190,41 +459,223 @@ class GraphEditorWidget(QWidget):
         events = self.all_parameters[self.current_mode]
         
         if event.button() == Qt.MouseButton.LeftButton:
+            # 掴んだだけでは見た目は変わらないので再描画しない
             self.editing_point_index = self._get_point_at_pos(pos, events)
             
         elif event.button() == Qt.MouseButton.RightButton:
             target_idx = self._get_point_at_pos(pos, events)
             if target_idx is not None:
+                # 削除後に前後の点を結ぶ線分も、削除前の前後点の範囲に収まる
+                dirty = self._segment_rect(target_idx)
                 events.pop(target_idx)
+                self._delete_points(self.current_mode, [target_idx])
+                self._touch_mode(self._mode_index[self.current_mode], events)
+                if self.hover_point_index is not None and self.hover_point_index >= len(events):
+                    self.hover_point_index = None
                 self.parameters_changed.emit(self.all_parameters)
-        self.update()
+                if dirty is not None:
+                    self.update(dirty)
 
     def mouseMoveEvent(self, event: QMouseEvent):
         pos = event.position()
         events = self.all_parameters[self.current_mode]
         
         # ドラッグ中（点の移動）
-        if event.buttons() & Qt.MouseButton.LeftButton and self.editing_point_index is not None:
+        dragging = bool(event.buttons() & Qt.MouseButton.LeftButton) and self.editing_point_index is not None
+        dirty: Optional[QRect] = None
+        if dragging:
+            # 移動前の点と前後の線分の範囲
+            dirty = self._segment_rect(self.editing_point_index)
             p = events[self.editing_point_index]
             p.time = max(0.0, self.x_to_time(pos.x()))
             p.value = self.y_to_value(pos.y())
-            self.parameters_changed.emit(self.all_parameters)
+            # 点数は変わらないので SoA 配列は該当要素だけ書き換える
+            times, values = self._get_soa(self.current_mode)
+            times[self.editing_point_index] = p.time
+            values[self.editing_point_index] = p.value
+            self._move_cached_point(self.current_mode, self.editing_point_index, p.time, p.value)
+            if not self._emit_timer.isActive():
+                self._emit_timer.start()
         
         # ホバー判定（高速探索）
+        prev_hover = self.hover_point_index
         self.hover_point_index = self._get_point_at_pos(pos, events)
-        self.update()
+
+        # 見た目が変わらないマウス移動では再描画しない。
+        # ドラッグ中は移動前後の点と前後の線分、ホバーの切り替えだけなら該当点の周囲だけを描き直す。
+        if dragging:
+            moved = self._segment_rect(self.editing_point_index)
+            if dirty is None or moved is None:
+                self.update()
+            else:
+                self.update(dirty.united(moved))
+        elif prev_hover != self.hover_point_index:
+            for idx in (prev_hover, self.hover_point_index):
+                rect = self._point_rect(idx)
+                if rect is not None:
+                    self.update(rect)
+
+    def _point_rect(self, index: Optional[int]) -> Optional[QRect]:
+        """現在モードの index 番目の点を囲む再描画領域（ホバー表示の半径6px + ペン幅込み）。"""
+        if index is None:
+            return None
+        times, values = self._get_soa(self.current_mode)
+        if not 0 <= index < times.size:
+            return None
+        x = int(self.time_to_x(float(times[index])))
+        y = int(self.value_to_y_for_mode(float(values[index]), self.current_mode))
+        return QRect(x - 10, y - 10, 20, 20)
+
+    def _segment_rect(self, index: Optional[int]) -> Optional[QRect]:
+        """index 番目の点と、その前後の点を結ぶ線分を囲む再描画領域。"""
+        if index is None:
+            return None
+        times, values = self._get_soa(self.current_mode)
+        n = times.size
+        if not 0 <= index < n:
+            return None
+        lo, hi = max(0, index - 1), min(n, index + 2)
+        xs = self.time_to_x(times[lo:hi])
+        ys = self.value_to_y_for_mode(values[lo:hi], self.current_mode)
+        x0, x1 = int(xs.min()) - 10, int(xs.max()) + 10
+        y0, y1 = int(ys.min()) - 10, int(ys.max()) + 10
+        return QRect(x0, y0, x1 - x0, y1 - y0)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         if self.editing_point_index is not None:
-            # ドラッグ終了時に時間軸の順序が狂う可能性があるため再ソート
-            self.all_parameters[self.current_mode].sort(key=lambda x: x.time)
+            # ドラッグで隣の点を追い越した時だけ、その1点を正しい位置へ移し直す
+            events = self.all_parameters[self.current_mode]
+            i = self.editing_point_index
+            if 0 <= i < len(events):
+                t = events[i].time
+                in_order = ((i == 0 or events[i - 1].time <= t)
+                            and (i == len(events) - 1 or t <= events[i + 1].time))
+                if not in_order:
+                    p = events.pop(i)
+                    self._delete_points(self.current_mode, [i])
+                    self._insert_point(self.current_mode, p.time, p.value)
+                    bisect.insort(events, p, key=lambda x: x.time)
+                    self._touch_mode(self._mode_index[self.current_mode], events)
+                    # 線のつながり順が変わるので全体を描き直す
+                    self.update()
             self.editing_point_index = None
-            self.update()
+            # 間引いていた通知が残っていれば、最終位置で確定させる
+            if self._emit_timer.isActive():
+                self._emit_timer.stop()
+                self._emit_parameters_changed()
+
+    def _visible_range(self, mode: str) -> Tuple[int, int]:
+        """
+        画面内 [0, width] に入る点の範囲 [i0, i1) を searchsorted で求める。
+        画面外へ伸びる線分も描けるよう、両端に1点ずつ余裕を持たせる。
+        """
+        times, _ = self._get_soa(mode)
+        n = int(times.size)
+        t0 = self.x_to_time(0.0)
+        t1 = self.x_to_time(float(self.width()))
+        i0 = max(0, int(np.searchsorted(times, t0, side='left')) - 1)
+        i1 = min(n, int(np.searchsorted(times, t1, side='right')) + 1)
+        return i0, max(i0, i1)
+
+    def _draw_curve(self, painter: QPainter, mode: str, dirty: Optional[QRectF] = None) -> QPolygonF:
+        """
+        指定モードの曲線のうち画面内の区間だけを描き、その区間の点列を返す。
+        全体が画面に収まっている時はキャッシュ済みの QPainterPath をそのまま使い、
+        再描画領域 dirty（スクロール前の座標）にかからなければ描画自体を省く。
+        """
+        points, path = self._get_curve(mode)
+        n = points.size()
+        i0, i1 = self._visible_range(mode)
+        if i0 == 0 and i1 == n:
+            if n >= 2 and (dirty is None or path.controlPointRect().adjusted(-2, -2, 2, 2).intersects(dirty)):
+                painter.drawPath(path)
+            return points
+
+        # 画面内の区間だけを SoA 配列から切り出して変換する（O(表示点数)）
+        times, values = self._get_soa(mode)
+        buf = self._poly_buf.get(mode)
+        if buf is None:
+            buf = self._poly_buf[mode] = QPolygonF()
+        visible = _polygon_from_arrays(times[i0:i1] * self._sec_to_px,
+                                       self.value_to_y_for_mode(values[i0:i1], mode), buf)
+        if visible.size() >= 2:
+            painter.drawPolyline(visible)
+        return visible
+
+    def _get_dot_pixmap(self, color: QColor) -> QPixmap:
+        """直径8px（余白込み10px）のアンチエイリアス済みの丸を色ごとに1度だけ描いて返す。"""
+        dpr = self.devicePixelRatioF()
+        key = (color.rgba(), dpr)
+        pix = self._dot_pix.get(key)
+        if pix is None:
+            size = int(np.ceil(10 * dpr))
+            pix = QPixmap(size, size)
+            pix.fill(Qt.GlobalColor.transparent)
+            p = QPainter(pix)
+            p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.setPen(Qt.PenStyle.NoPen)
+            p.setBrush(QBrush(color))
+            p.drawEllipse(QRectF(dpr, dpr, 8 * dpr, 8 * dpr))
+            p.end()
+            self._dot_pix[key] = pix
+        return pix
+
+    def _draw_dots(self, painter: QPainter, points: QPolygonF, color: QColor,
+                   dirty: Optional[QRectF] = None) -> None:
+        """
+        points の各点に丸のスタンプを貼る。
+        PixmapFragment の配列を NumPy で組み、1回の drawPixmapFragments で描くので
+        点ごとのラスタライズも Python 呼び出しも発生しない。
+        """
+        xy = _polygon_view(points)
+        if xy is None:
+            painter.setPen(QPen(color, 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+            painter.drawPoints(points)
+            return
+
+        if dirty is not None:
+            # 再描画領域（+丸の半径）にかかる点だけに絞る
+            x, y = xy[:, 0], xy[:, 1]
+            mask = ((x >= dirty.left() - 6) & (x <= dirty.right() + 6)
+                    & (y >= dirty.top() - 6) & (y <= dirty.bottom() + 6))
+            xy = xy[mask]
+
+        n = xy.shape[0]
+        if n == 0:
+            return
+        if self._frag_buf.shape[0] < n:
+            self._frag_buf = np.empty((max(n, 2 * self._frag_buf.shape[0]), 10), dtype=np.float64)
+        pix = self._get_dot_pixmap(color)
+        size = float(pix.width())
+        # x, y, sourceLeft, sourceTop, width, height, scaleX, scaleY, rotation, opacity
+        frags = self._frag_buf[:n]
+        frags[:, 0:2] = xy
+        frags[:, 2:6] = (0.0, 0.0, size, size)
+        frags[:, 6:8] = 10.0 / size
+        frags[:, 8] = 0.0
+        frags[:, 9] = 1.0
+        first = shiboken6.wrapInstance(frags.ctypes.data, QPainter.PixmapFragment)
+        painter.drawPixmapFragments(first, n, pix)
+
+    def _get_background(self) -> QPixmap:
+        """
+        静的な背景を Pixmap に描いて返す。
+        スクロール・サイズ・モード、または非アクティブモードの曲線が変わった時だけ描き直す。
+        """
+        others = [m for m in self.all_parameters
+                  if m != self.current_mode and len(self.all_parameters[m]) >= 2]
+        paths = tuple(self._get_curve(m)[1] for m in others)
+        dpr = self.devicePixelRatioF()
+        key = (self.current_mode, self.scroll_x_offset, self.width(), self.height(), dpr)
+        if (self._bg_pixmap is not None and self._bg_key == key
+                and len(paths) == len(self._bg_paths)
+                and all(a is b for a, b in zip(paths, self._bg_paths))):
+            return self._bg_pixmap
+
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        painter = QPainter(pixmap)
 
-    def paintEvent(self, event: QPaintEvent):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
         # Apple風の深みのあるグレー背景
         painter.fillRect(self.rect(), QColor(30, 30, 30))
 
@@ -236,50 +687,50 @@ class GraphEditorWidget(QWidget):
             painter.setPen(QPen(QColor(60, 60, 60), 1, Qt.PenStyle.DashLine))
             painter.drawLine(0, int(h/2), int(w), int(h/2))
 
-        # --- [1. 背景パラメータの一括描画 (QPainterPath)] ---
-        for mode, events in self.all_parameters.items():
-            if mode == self.current_mode or not events:
-                continue
-                
+        # --- [背景パラメータの一括描画 (キャッシュ済み QPainterPath)] ---
+        # 塗りつぶしと水平のセンターラインにはアンチエイリアスは不要。斜めの曲線だけに掛ける
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(-self.scroll_x_offset, 0.0)
+        for mode in others:
             color = QColor(self.colors[mode])
             color.setAlpha(30)
             painter.setPen(QPen(color, 1))
-            
-            path = QPainterPath()
-            first_p = events[0]
-            path.moveTo(self.time_to_x(first_p.time), self.value_to_y_for_mode(first_p.value, mode))
-            for p in events[1:]:
-                path.lineTo(self.time_to_x(p.time), self.value_to_y_for_mode(p.value, mode))
-            painter.drawPath(path)
-
-        # --- [2. アクティブパラメータの一括描画 (QPainterPath)] ---
-        events = self.all_parameters[self.current_mode]
-        color = self.colors[self.current_mode]
+            self._draw_curve(painter, mode)
+        painter.end()
+
+        self._bg_pixmap = pixmap
+        self._bg_key = key
+        self._bg_paths = paths
+        return pixmap
+
+    def paintEvent(self, event: QPaintEvent):
+        painter = QPainter(self)
         
-        if len(events) >= 2:
+        # 背景とガイド曲線はキャッシュ済み Pixmap を1回貼るだけ
+        painter.drawPixmap(0, 0, self._get_background())
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 曲線はスクロール前の座標でキャッシュしているので、横スクロールは座標系の平行移動で当てる
+        painter.translate(-self.scroll_x_offset, 0.0)
+        # ホバーやドラッグでは部分更新が来るので、その範囲にかからない描画は省く
+        dirty = QRectF(event.rect()).translated(self.scroll_x_offset, 0.0)
+
+        # --- [アクティブパラメータの一括描画 (キャッシュ済み QPainterPath)] ---
+        # マウス移動のたびに再描画されても、点の編集が無ければパスは作り直さない。
+        # 長い曲では画面内の区間だけを描く。
+        points, _ = self._get_curve(self.current_mode)
+        color = self.colors[self.current_mode]
+        painter.setPen(QPen(color, 2))
+        visible = self._draw_curve(painter, self.current_mode, dirty)
+
+        # --- [コントロールポイントの描画] ---
+        # 事前に描いた丸のスタンプを、画面内の全点へ drawPixmapFragments 1回で貼る
+        if visible.size():
+            self._draw_dots(painter, visible, color, dirty)
+
+        # ホバー中の点だけは白抜きで上から重ねる（パスとは別に描くのでキャッシュは崩れない）
+        hover = self.hover_point_index
+        if hover is not None and 0 <= hover < points.size():
+            painter.setBrush(QBrush(QColor(255, 255, 255)))
             painter.setPen(QPen(color, 2))
-            path = QPainterPath()
-            first_p = events[0]
-            path.moveTo(self.time_to_x(first_p.time), self.value_to_y(first_p.value))
-            for p in events[1:]:
-                path.lineTo(self.time_to_x(p.time), self.value_to_y(p.value))
-            # GPUに「このパスをまとめて描け」と一度だけ命令する（超高速）
-            painter.drawPath(path)
-
-        # --- [3. コントロールポイントの描画] ---
-        # 画面に映っている点だけを描画するようにクリッピングするとなお良いですが、
-        # 今回はQPointFの描画コストが低いためそのまま描画します。
-        for i, p in enumerate(events):
-            px = self.time_to_x(p.time)
-            py = self.value_to_y(p.value)
-            
-            if i == self.hover_point_index:
-                painter.setBrush(QBrush(QColor(255, 255, 255)))
-                painter.setPen(QPen(color, 2))
-                radius = 6
-            else:
-                painter.setBrush(QBrush(color))
-                painter.setPen(Qt.PenStyle.NoPen)
-                radius = 4
-                
-            painter.drawEllipse(QPointF(px, py), radius, radius)
+            painter.drawEllipse(points.at(hover), 6, 6)
@@ -2,21 +2,49 @@
 
 import logging
 from typing import Optional
+
+import numpy as np
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import (
     QPainter, 
     QColor, 
+    QBrush, 
     QPen, 
     QFont, 
     QPaintEvent, 
     QLinearGradient, 
     QPixmap, 
+    QImage, 
     QMouseEvent
 )
-from PySide6.QtCore import Qt, QRect, QSize, Slot, Signal
+from PySide6.QtCore import Qt, QLine, QRect, QRectF, QSize, Slot, Signal, QObject, QRunnable, QThreadPool
 
 logger = logging.getLogger(__name__)
 
+# 黒鍵の音名（C#, D#, F#, G#, A# = 1, 3, 6, 8, 10）のビットを立てたマスク
+BLACK_KEY_MASK = 0b010101001010
+
+
+class _StripSignals(QObject):
+    """ワーカースレッドで描いた鍵盤ストリップを GUI スレッドへ渡すための信号"""
+    finished = Signal(object, object)  # (キャッシュ鍵, QImage)
+
+
+class _StripRenderTask(QRunnable):
+    """
+    鍵盤ストリップを QImage にラスタライズするワーカー。
+    QImage への描画は GUI スレッド外でも行えるので、ズーム中の再生成で UI を止めない。
+    """
+    def __init__(self, widget: "KeyboardSidebarWidget", state: tuple, signals: _StripSignals):
+        super().__init__()
+        self._widget = widget
+        self._state = state
+        self._signals = signals
+
+    def run(self):
+        image = self._widget._render_strip(self._state)
+        self._signals.finished.emit(self._state, image)
+
 class KeyboardSidebarWidget(QWidget):
     """
     [VO-SE Pro: Keyboard Sidebar Widget]
@@ -32,6 +60,12 @@ class KeyboardSidebarWidget(QWidget):
     note_pressed = Signal(int)
     note_released = Signal(int)
 
+    # C音のラベル（ノート番号 -> "C-1" ～ "C9"）。描画のたびに文字列を組み立てない
+    _OCTAVE_LABELS = {n: f"C{n // 12 - 1}" for n in range(0, 128, 12)}
+    # 白鍵・黒鍵のノート番号（ストリップ描画のループで鍵ごとに判定しない）
+    _WHITE_NOTES = tuple(n for n in range(128) if not (BLACK_KEY_MASK >> (n % 12)) & 1)
+    _BLACK_NOTES = tuple(n for n in range(128) if (BLACK_KEY_MASK >> (n % 12)) & 1)
+
     def __init__(self, key_height_pixels: float = 20.0, parent: Optional[QWidget] = None):
         super().__init__(parent)
         
@@ -41,7 +75,14 @@ class KeyboardSidebarWidget(QWidget):
         self._last_rendered_height: float = -1.0
         
         # キャッシュ（VRAM/RAM上への事前描画）
+        # 鍵盤の見た目は幅・鍵の高さ・DPR だけで決まるので、それを鍵にして使い回す
         self._cache_pixmap: Optional[QPixmap] = None
+        self._cache_key: Optional[tuple] = None
+        # ワーカーで再生成中のストリップの鍵（完成するまでは古いストリップを伸縮して表示する）
+        self._pending_key: Optional[tuple] = None
+        # 親は付けない（ウィジェット破棄後にワーカーが emit しても落ちないように。接続は破棄時に自動で切れる）
+        self._strip_signals = _StripSignals()
+        self._strip_signals.finished.connect(self._on_strip_ready)
         
         # 操作性向上のための固定幅（代表の指定された72pxを採用）
         self.setMinimumWidth(72)
@@ -50,6 +91,21 @@ class KeyboardSidebarWidget(QWidget):
         # フォント設定
         self.label_font = QFont("Segoe UI", 8)
         self.label_font.setBold(True)
+
+        # 描画に使うペン・色は一度だけ作って使い回す（QPen/QBrush は QApplication が必要なのでここで生成）。
+        # グラデーションは鍵の大きさで決まるため、キャッシュ再生成時に白鍵・黒鍵で1本ずつ作る
+        self._white_stops = [(0, QColor(255, 255, 255)), (0.9, QColor(245, 245, 245)), (1, QColor(225, 225, 225))]
+        self._black_stops = [(0, QColor(60, 60, 60)), (1, QColor(10, 10, 10))]
+        self._white_pen = QPen(QColor(180, 180, 180), 1)
+        self._black_pen = QPen(Qt.GlobalColor.black, 1)
+        self._black_edge_pen = QPen(QColor(90, 90, 90, 150), 1)
+        self._label_pen = QPen(QColor(120, 120, 120))
+        self._hilite_color = QColor(0, 255, 127, 70)
+        self._accent_color = QColor(0, 255, 127, 200)
+        self._border_pen = QPen(QColor(0, 0, 0, 50), 1)
+        
+        # 鍵盤の見た目はウィジェットの上端基準で決まるので、高さが増えても既存部分は描き直さない
+        self.setAttribute(Qt.WidgetAttribute.WA_StaticContents)
         
         # マウスイベントの継続監視（グリッサンドに必須）
         self.setMouseTracking(True)
@@ -61,14 +117,20 @@ class KeyboardSidebarWidget(QWidget):
     @staticmethod
     def is_black_key(note_number: int) -> bool:
         """MIDIノート番号が黒鍵（C#, D#, F#, G#, A#）かどうかを判定"""
-        m = note_number % 12
-        return m in (1, 3, 6, 8, 10)
+        return bool((BLACK_KEY_MASK >> (note_number % 12)) & 1)
 
     def resizeEvent(self, event):
-        """リサイズ時にキャッシュを破棄し、次回の描画で再生成させる"""
-        self._cache_pixmap = None
+        """
+        幅が変わった時だけキャッシュを破棄し、次回の描画で再生成させる。
+        （高さの変化は表示範囲が変わるだけで、128鍵分のストリップはそのまま使える）
+        """
+        if event.size().width() != event.oldSize().width():
+            self._cache_pixmap = None
         super().resizeEvent(event)
 
+    def _cache_state(self) -> tuple:
+        return (self.width(), self.key_height_pixels, self.devicePixelRatioF())
+
     # ============================================================
     # 最速描画ロジック（オフスクリーン・キャッシュ）
     # ============================================================
@@ -78,74 +140,106 @@ class KeyboardSidebarWidget(QWidget):
         128音すべての鍵盤を、デバイスの解像度（DPI）に合わせて
         巨大な一枚の画像としてメモリに書き込みます。
         """
-        dpr = self.devicePixelRatioF()
-        total_height = int(self.key_height_pixels * 128)
-        
-        # 解像度に合わせてピクセル数を最適化したPixmapを生成
-        self._cache_pixmap = QPixmap(int(self.width() * dpr), int(total_height * dpr))
-        cache_pixmap = self._cache_pixmap
-        if cache_pixmap is None:
+        state = self._cache_state()
+        self._cache_pixmap = QPixmap.fromImage(self._render_strip(state))
+        self._last_rendered_height = self.key_height_pixels
+        self._cache_key = state
+        logger.debug("KeyboardSidebar: Cache updated.")
+
+    def _request_cache(self, state: tuple) -> None:
+        """鍵の高さや DPR が変わったストリップをワーカースレッドで作り直させる。"""
+        if self._pending_key == state:
             return
-        cache_pixmap.setDevicePixelRatio(dpr)
-        cache_pixmap.fill(Qt.GlobalColor.transparent)
+        self._pending_key = state
+        QThreadPool.globalInstance().start(_StripRenderTask(self, state, self._strip_signals))
+
+    @Slot(object, object)
+    def _on_strip_ready(self, state: tuple, image: QImage) -> None:
+        """ワーカーの描いたストリップを GUI スレッドで Pixmap にして差し替える（途中の状態は見せない）。"""
+        if state == self._pending_key:
+            self._pending_key = None
+        if state != self._cache_state():
+            # 描いている間にさらにズームされた。次の paintEvent で最新の状態を依頼し直す
+            self.update()
+            return
+        self._cache_pixmap = QPixmap.fromImage(image)
+        self._last_rendered_height = state[1]
+        self._cache_key = state
+        self.update()
+
+    def _render_strip(self, state: tuple) -> QImage:
+        """
+        state = (幅, 鍵の高さ, DPR) の鍵盤ストリップを QImage に描く。
+        ウィジェットには触れないので、ワーカースレッドから呼んでもよい。
+        """
+        width, key_height_pixels, dpr = state
+        total_height = int(key_height_pixels * 128)
+        
+        # 解像度に合わせてピクセル数を最適化した画像を生成
+        image = QImage(int(width * dpr), int(total_height * dpr), QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(dpr)
+        image.fill(Qt.GlobalColor.transparent)
         
-        painter = QPainter(cache_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # 鍵盤は軸に平行な矩形と水平線だけなのでアンチエイリアスは掛けない
+        # （整数座標の1px線が2pxににじむのも防げる）
+        painter = QPainter(image)
+        
+        painter.setFont(self.label_font)
+        key_h = int(key_height_pixels)
+        # 全128鍵の上端 y をまとめて計算しておき、ループ内では引くだけにする
+        tops = ((127 - np.arange(128)) * key_height_pixels).astype(np.int64).tolist()
         
         # --- レイヤー1: 全白鍵の描画 ---
-        for n in range(128):
-            if self.is_black_key(n):
-                continue
-            
-            y = (127 - n) * self.key_height_pixels
-            rect = QRect(0, int(y), self.width(), int(self.key_height_pixels))
+        # 矩形とグラデーションは y=0 の鍵で1つだけ作り、
+        # 各鍵では矩形の y とブラシ原点だけを動かす
+        rect = QRect(0, 0, width, key_h)
+        grad = QLinearGradient(rect.topLeft(), rect.bottomLeft())
+        grad.setStops(self._white_stops)
+        white_brush = QBrush(grad)
+        for n in self._WHITE_NOTES:
+            rect.moveTop(tops[n])
             
             # 質感を出すためのグラデーション
-            grad = QLinearGradient(rect.topLeft(), rect.bottomLeft())
-            grad.setColorAt(0, QColor(255, 255, 255))
-            grad.setColorAt(0.9, QColor(245, 245, 245))
-            grad.setColorAt(1, QColor(225, 225, 225))
-            
-            painter.setBrush(grad)
-            painter.setPen(QPen(QColor(180, 180, 180), 1))
+            painter.setBrushOrigin(0, rect.top())
+            painter.setBrush(white_brush)
+            painter.setPen(self._white_pen)
             painter.drawRect(rect)
             
             # C音のラベル描画（オクターブ位置の把握用）
-            if n % 12 == 0:
-                octave = (n // 12) - 1
-                painter.setFont(self.label_font)
-                painter.setPen(QColor(120, 120, 120))
+            label = self._OCTAVE_LABELS.get(n)
+            if label is not None:
+                painter.setPen(self._label_pen)
                 painter.drawText(
                     rect.adjusted(0, 0, -8, 0), 
                     Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, 
-                    f"C{octave}"
+                    label
                 )
 
         # --- レイヤー2: 全黒鍵の描画 ---
-        black_w = int(self.width() * 0.62)
-        for n in range(128):
-            if not self.is_black_key(n):
-                continue
-            
-            y = (127 - n) * self.key_height_pixels
-            rect = QRect(0, int(y), black_w, int(self.key_height_pixels))
+        black_w = int(width * 0.62)
+        rect = QRect(0, 0, black_w, key_h)
+        grad = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        grad.setStops(self._black_stops)
+        black_brush = QBrush(grad)
+        # 上端のハイライト線は黒鍵どうしが重ならないので、最後に drawLines 1回でまとめて引く
+        edge_lines = []
+        for n in self._BLACK_NOTES:
+            rect.moveTop(tops[n])
             
             # 黒鍵の高級感を出す深みのあるグラデーション
-            grad = QLinearGradient(rect.topLeft(), rect.bottomRight())
-            grad.setColorAt(0, QColor(60, 60, 60))
-            grad.setColorAt(1, QColor(10, 10, 10))
-            
-            painter.setBrush(grad)
-            painter.setPen(QPen(Qt.GlobalColor.black, 1))
+            painter.setBrushOrigin(0, rect.top())
+            painter.setBrush(black_brush)
+            painter.setPen(self._black_pen)
             painter.drawRect(rect)
             
             # 立体感を出すための上端のハイライト線
-            painter.setPen(QPen(QColor(90, 90, 90, 150), 1))
-            painter.drawLine(rect.left() + 1, rect.top() + 1, rect.right() - 1, rect.top() + 1)
+            edge_lines.append(QLine(rect.left() + 1, rect.top() + 1, rect.right() - 1, rect.top() + 1))
+
+        painter.setPen(self._black_edge_pen)
+        painter.drawLines(edge_lines)
 
         painter.end()
-        self._last_rendered_height = self.key_height_pixels
-        logger.debug("KeyboardSidebar: Cache updated.")
+        return image
 
     # ============================================================
     # インタラクション・スロット
@@ -153,9 +247,19 @@ class KeyboardSidebarWidget(QWidget):
 
     @Slot(int)
     def set_vertical_offset(self, offset_pixels: int):
-        """タイムラインのスクロールに同期"""
-        if self.scroll_y_offset != float(offset_pixels):
-            self.scroll_y_offset = float(offset_pixels)
+        """
+        タイムラインのスクロールに同期。
+        整数ピクセルのずれなら QWidget.scroll で表示済みの画素をずらし、
+        新しく見えた帯だけを paintEvent に描かせる。
+        """
+        new_offset = float(offset_pixels)
+        dy = self.scroll_y_offset - new_offset
+        if dy == 0.0:
+            return
+        self.scroll_y_offset = new_offset
+        if dy.is_integer() and abs(dy) < self.height():
+            self.scroll(0, int(dy))
+        else:
             self.update()
 
     @Slot(float)
@@ -163,9 +267,23 @@ class KeyboardSidebarWidget(QWidget):
         """拡大・縮小（ズーム）に対応"""
         if self.key_height_pixels != height:
             self.key_height_pixels = height
-            self._cache_pixmap = None  # キャッシュを無効化
+            # キャッシュは捨てない。作り直しが済むまでは paintEvent が古いストリップを伸縮して使う
             self.update()
 
+    def _note_rect(self, note: Optional[int]) -> Optional[QRect]:
+        """ノートの鍵が表示されている行（ウィジェット座標）。部分再描画の範囲に使う。"""
+        if note is None:
+            return None
+        y = (127 - note) * self.key_height_pixels - self.scroll_y_offset
+        return QRect(0, int(y), self.width(), int(self.key_height_pixels) + 1)
+
+    def _update_notes(self, *notes: Optional[int]) -> None:
+        """押下表示が変わった鍵の行だけを再描画させる。"""
+        for note in notes:
+            rect = self._note_rect(note)
+            if rect is not None:
+                self.update(rect)
+
     def _y_to_note(self, y: float) -> int:
         """座標からMIDIノート番号を算出"""
         absolute_y = y + self.scroll_y_offset
@@ -179,9 +297,10 @@ class KeyboardSidebarWidget(QWidget):
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:  
             note = self._y_to_note(event.position().y())
+            prev = self._current_pressed_note
             self._current_pressed_note = note
             self.note_pressed.emit(note)
-            self.update()
+            self._update_notes(prev, note)
 
     def mouseMoveEvent(self, event: QMouseEvent):
         # グリッサンド（スライド演奏）の処理
@@ -192,15 +311,17 @@ class KeyboardSidebarWidget(QWidget):
                 if self._current_pressed_note is not None:
                     self.note_released.emit(self._current_pressed_note)
                 
+                prev = self._current_pressed_note
                 self._current_pressed_note = new_note
                 self.note_pressed.emit(new_note)
-                self.update()
+                self._update_notes(prev, new_note)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         if self._current_pressed_note is not None:
-            self.note_released.emit(self._current_pressed_note)
+            prev = self._current_pressed_note
+            self.note_released.emit(prev)
             self._current_pressed_note = None
-            self.update()
+            self._update_notes(prev)
 
     # ============================================================
     # レンダリング（メイン）
@@ -211,9 +332,14 @@ class KeyboardSidebarWidget(QWidget):
         高解像度キャッシュを使用したレンダリング。
         Pyrightの型チェック（None安全性）を考慮した実装。
         """
-        # 1. キャッシュの整合性チェックと生成
-        if self._cache_pixmap is None or self.key_height_pixels != self._last_rendered_height:
+        # 1. キャッシュの整合性チェックと生成（スクロールだけなら作り直さず転送元をずらすだけ）
+        #    初回と幅の変更はその場で作る。鍵の高さ・DPR だけが変わった場合（ズーム中など）は
+        #    ワーカーに作り直させ、それまでは古いストリップを縦に伸縮して転送する
+        state = self._cache_state()
+        if self._cache_pixmap is None or self._cache_key is None or self._cache_key[0] != state[0]:
             self._update_cache()
+        elif self._cache_key != state:
+            self._request_cache(state)
 
         # [Pyright修正] 明示的なNoneチェックを追加し、これ以降のself._cache_pixmapがNon-Nullableであることを保証
         if self._cache_pixmap is None:
@@ -221,36 +347,41 @@ class KeyboardSidebarWidget(QWidget):
 
         painter = QPainter(self)
         
-        # 2. キャッシュされた全鍵盤を「一撃」で転送
-        dpr = self.devicePixelRatioF()
+        # Qt が要求した再描画領域（押下ハイライトの切り替えなら1～2鍵分だけ）
+        dirty = event.rect()
+        
+        # 2. キャッシュされた鍵盤のうち、再描画領域の分だけを「一撃」で転送
+        #    （転送元の座標はストリップを描いた時の鍵の高さ・DPR で換算する）
+        _, cache_key_h, dpr = self._cache_key
+        sy = cache_key_h / self.key_height_pixels * dpr
         
         # 型安全な描画（self._cache_pixmapはここでは確実にQPixmap型）
         painter.drawPixmap(
-            0, 0, 
-            self._cache_pixmap, 
-            0, int(self.scroll_y_offset * dpr), 
-            int(self.width() * dpr), int(self.height() * dpr)
+            QRectF(dirty),
+            self._cache_pixmap,
+            QRectF(dirty.x() * dpr, (dirty.y() + self.scroll_y_offset) * sy,
+                   dirty.width() * dpr, dirty.height() * sy)
         )
 
         # 3. 押下状態のハイライト
         if self._current_pressed_note is not None:
             # y座標の計算（floatからintへのキャストを徹底）
             y = (127 - self._current_pressed_note) * self.key_height_pixels - self.scroll_y_offset
+            key_rect = QRect(0, int(y), self.width(), int(self.key_height_pixels))
             
-            # Apple風ネオングリーン
-            painter.fillRect(
-                QRect(0, int(y), self.width(), int(self.key_height_pixels)), 
-                QColor(0, 255, 127, 70)
-            )
-            
-            # 左端の4pxアクセントバー
-            painter.fillRect(
-                QRect(0, int(y), 4, int(self.key_height_pixels)), 
-                QColor(0, 255, 127, 200)
-            )
+            if key_rect.intersects(dirty):
+                # Apple風ネオングリーン
+                painter.fillRect(key_rect, self._hilite_color)
+                
+                # 左端の4pxアクセントバー
+                painter.fillRect(
+                    QRect(0, int(y), 4, int(self.key_height_pixels)), 
+                    self._accent_color
+                )
 
         # 4. タイムラインとの境界線
-        painter.setPen(QPen(QColor(0, 0, 0, 50), 1))
-        painter.drawLine(self.width() - 1, 0, self.width() - 1, self.height())
+        if dirty.right() >= self.width() - 1:
+            painter.setPen(self._border_pen)
+            painter.drawLine(self.width() - 1, dirty.top(), self.width() - 1, dirty.bottom())
         
         painter.end()
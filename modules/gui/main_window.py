@@ -14,6 +14,7 @@ import zipfile
 import shutil
 import threading
 import math
+from collections import deque
 from copy import deepcopy
 from typing import Any, List, Dict, Optional, TYPE_CHECKING, cast              
 
@@ -22,9 +23,23 @@ from typing import Any, List, Dict, Optional, TYPE_CHECKING, cast
 # ==========================================================================
 import importlib
 import importlib.util
+from functools import lru_cache
 import numpy as np
-mido = importlib.import_module("mido") if importlib.util.find_spec("mido") else None
-ort = importlib.import_module("onnxruntime") if importlib.util.find_spec("onnxruntime") else None
+
+
+@lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """
+    mido / onnxruntime など使う場面が限られる重い依存を、初回使用時に読み込む。
+    （onnxruntime は読み込みだけで起動が数秒遅れるため、モジュール先頭では import しない）
+    インストールされていなければ None を返す。
+    """
+    if importlib.util.find_spec(name) is None:
+        return None
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
 # ==========================================================================
 # 3. GUIライブラリ (PySide6 )
@@ -71,7 +86,7 @@ try:
     from modules.gui.keyboard_sidebar_widget import KeyboardSidebarWidget # type: ignore[assignment]
     from modules.gui.core_manager import vose_manager, CNoteEvent # type: ignore[assignment]
     from modules.audio.voice_manager import VoiceManager # type: ignore[assignment]
-    from modules.gui.aural_engine import AuralAIEngine # type: ignore[assignment]
+    from modules.gui.aural_engine import AuralAIEngine, create_inference_session, resolve_model_path # type: ignore[assignment]
     from modules.data.licensing import LicenseManager # type: ignore[assignment]
 except ImportError as e:
     print(f"⚠️ Absolute import failed, falling back to relative: {e}")
@@ -79,7 +94,7 @@ except ImportError as e:
     from .timeline_widget import TimelineWidget
     from .graph_editor_widget import GraphEditorWidget
     from .keyboard_sidebar_widget import KeyboardSidebarWidget
-    from .aural_engine import AuralAIEngine
+    from .aural_engine import AuralAIEngine, create_inference_session, resolve_model_path
     from .core_manager import vose_manager
     from ..audio.voice_manager import VoiceManager
 
@@ -218,23 +233,42 @@ except ImportError:
 # ==========================================================================
 # 2. C++連携データ変換関数
 # ==========================================================================
+def _curve_array(data: Any, fill: float, length: int) -> np.ndarray:
+    """カーブ(list / ndarray)を連続した float64 配列にする。空・未指定なら fill で length 個埋める。"""
+    if data is None or len(data) == 0:
+        return np.full(length, fill, dtype=np.float64)
+    arr = np.ascontiguousarray(data, dtype=np.float64).reshape(-1)
+    # from_buffer は書き込み可能なバッファしか受け付けない
+    return arr if arr.flags.writeable else arr.copy()
+
+
+def _as_c_doubles(arr: np.ndarray) -> ctypes.Array:
+    """
+    float64 配列のメモリをそのまま C の double 配列として見せる（要素ごとの変換をしない）。
+    返る ctypes 配列が元の ndarray を参照し続けるので、構造体のフィールドに代入すれば
+    構造体を配列へコピーした後もバッファは解放されない。
+    """
+    return (ctypes.c_double * arr.size).from_buffer(arr)
+
+
 def prepare_c_note_event(python_note: Dict[str, Any]) -> NoteEvent:
     """
     UI上のノート情報(Dict)を、C++が解読可能な NoteEvent 構造体に変換する。
     ポインタ化の際に cast を使用し、Pylanceの型不整合エラーを回避。
     """
     # 1. データの確保 (Noneチェックを行い、空リストを回避)
-    pitch_data = python_note.get('pitch_curve') or [0.0]
-    gender_data = python_note.get('gender_curve') or [0.5] * len(pitch_data)
-    tension_data = python_note.get('tension_curve') or [0.5] * len(pitch_data)
-    breath_data = python_note.get('breath_curve') or [0.0] * len(pitch_data)
-
-    # 2. ctypesによるポインタ化（メモリ確保）
-    # 型ヒント上のエラーを防ぐため、一旦配列として定義してからcastする
-    pitch_arr = (ctypes.c_double * len(pitch_data))(*pitch_data)
-    gender_arr = (ctypes.c_double * len(gender_data))(*gender_data)
-    tension_arr = (ctypes.c_double * len(tension_data))(*tension_data)
-    breath_arr = (ctypes.c_double * len(breath_data))(*breath_data)
+    # NumPy で一括して float64 の連続配列にする（list / ndarray どちらでも可）
+    pitch_data = _curve_array(python_note.get('pitch_curve'), 0.0, 1)
+    gender_data = _curve_array(python_note.get('gender_curve'), 0.5, len(pitch_data))
+    tension_data = _curve_array(python_note.get('tension_curve'), 0.5, len(pitch_data))
+    breath_data = _curve_array(python_note.get('breath_curve'), 0.0, len(pitch_data))
+
+    # 2. ctypesによるポインタ化
+    # (c_double * N)(*list) のような1要素ずつの変換はせず、NumPy のバッファをそのまま渡す
+    pitch_arr = _as_c_doubles(pitch_data)
+    gender_arr = _as_c_doubles(gender_data)
+    tension_arr = _as_c_doubles(tension_data)
+    breath_arr = _as_c_doubles(breath_data)
 
     # 3. 構造体の生成と返却
     # 各 curve 属性にポインタ型を明示的に cast して代入
@@ -253,6 +287,52 @@ def prepare_c_note_event(python_note: Dict[str, Any]) -> NoteEvent:
 # ハイブリッド・エンジン自動判別システム
 # ==========================================================================
 
+@lru_cache(maxsize=1)
+def _available_providers() -> tuple:
+    """
+    onnxruntime の実行プロバイダー一覧（プロセス内で1回だけ調べる）。
+    onnxruntime の import とプロバイダー列挙は重いので、起動時診断・再初期化のたびに繰り返さない。
+    onnxruntime が無ければ空のタプル。
+    """
+    ort = _optional_module("onnxruntime")
+    if ort is None:
+        return ()
+    try:
+        return tuple(ort.get_available_providers())
+    except Exception:
+        return ()
+
+
+# プロバイダーの実動作確認用の最小 ONNX モデル（float[1] を返すだけの Identity 1ノード、opset 13）。
+# onnx.helper で作ってシリアライズしたもので、実行時に onnx パッケージは要らない。
+_PROBE_ONNX_MODEL = (
+    b'\x08\x07\x12\x00:;\n\x10\n\x01x\x12\x01y"\x08Identity\x12\x05probeZ\x0f\n\x01x\x12\n\n\x08\x08\x01\x12\x04\n\x02\x08\x01b\x0f\n\x01y\x12\n\n\x08\x08\x01\x12\x04\n\x02\x08\x01B\x04\n\x00\x10\r'
+)
+
+
+@lru_cache(maxsize=None)
+def _provider_usable(provider: str) -> bool:
+    """
+    provider で実際に推論セッションを作れるかを、最小モデルで試して確かめる（結果はキャッシュ）。
+    get_available_providers() はビルド時に組み込まれた EP を返すだけで、cuDNN や DirectML.dll が
+    無い環境でも一覧に載る。その場合セッションは黙って CPU に落ちるので、実際に割り当てられた
+    プロバイダーを見て判定する。
+    """
+    if provider == "CPUExecutionProvider":
+        return True
+    if provider not in _available_providers():
+        return False
+    ort = _optional_module("onnxruntime")
+    try:
+        so = ort.SessionOptions()
+        so.log_severity_level = 3  # 失敗時の警告ログは出さない
+        session = ort.InferenceSession(_PROBE_ONNX_MODEL, sess_options=so, providers=[provider])
+        active = session.get_providers()
+        return bool(active) and active[0] == provider
+    except Exception:
+        return False
+
+
 class EngineInitializer:
     def __init__(self):
         self.device = "CPU"
@@ -261,16 +341,18 @@ class EngineInitializer:
     def detect_best_engine(self):
         """PCの性能をスキャンし、NPU/GPU/CPUから最適なものを選択する"""
         try:
-            import onnxruntime as ort
-            available = ort.get_available_providers()
+            available = _available_providers()
+            if not available:
+                raise ImportError("onnxruntime is not installed")
 
+            # 一覧に載っていても動かないことがあるので、実際にセッションを作れるものだけを選ぶ
             # 1. Mac (Apple Silicon) の NPU/GPU を優先
-            if 'CoreMLExecutionProvider' in available:
+            if _provider_usable('CoreMLExecutionProvider'):
                 self.device = "NPU (Apple Silicon)"
                 self.provider = "CoreMLExecutionProvider"
             
             # 2. Windows (DirectML) の NPU/GPU を優先
-            elif 'DmlExecutionProvider' in available:
+            elif _provider_usable('DmlExecutionProvider'):
                 self.device = "NPU/GPU (DirectML)"
                 self.provider = "DmlExecutionProvider"
 
@@ -307,7 +389,7 @@ class VoseTrack:
         # --- 基本データ ---
         self.notes = []               # 歌声トラック用のノートリスト
         self.audio_path = ""          # オーディオトラック用のファイルパス
-        self.vose_peaks = []          # タイムライン描画用の高速キャッシュ
+        self.vose_peaks = {}          # タイムライン描画用の高速キャッシュ（ブロック長 -> (min, max) 配列）
         
         # --- 最高品質のための「ミキシング・パラメータ」 ---
         self.volume = 1.0             # 0.0 ~ 1.0 (音量)
@@ -468,16 +550,15 @@ class EditCommand:
 class HistoryManager:
     """Undo/Redoのスタックを管理する"""
     def __init__(self, max_depth=50):
-        self.undo_stack = []
-        self.redo_stack = []
+        # 上限を超えた古い履歴は deque が O(1) で左端から捨てる（list.pop(0) の全要素シフトを避ける）
+        self.undo_stack = deque(maxlen=max_depth)
+        self.redo_stack = deque(maxlen=max_depth)
         self.max_depth = max_depth
 
     def execute(self, command):
         command.redo()
         self.undo_stack.append(command)
         self.redo_stack.clear() # 新しい操作をしたらRedoは消去
-        if len(self.undo_stack) > self.max_depth:
-            self.undo_stack.pop(0)
 
     def undo(self):
         if not self.undo_stack:
@@ -504,9 +585,11 @@ class ProMonitoringUI(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.current_time = 0.0
         self.rms = 0.0
+        # 最後に再描画を依頼した (再生ヘッドの x, メーターの高さ)。None は未描画
+        self._drawn = None
         self._timer = QTimer(self)
         self._timer.setInterval(16)
-        self._timer.timeout.connect(self.update)
+        self._timer.timeout.connect(self._on_tick)
 
     def start(self):
         self._timer.start()
@@ -514,17 +597,37 @@ class ProMonitoringUI(QWidget):
     def stop(self):
         self._timer.stop()
 
+    def _frame_state(self):
+        return int(self.current_time * 100), int(self.rms * 100)
+
+    def _on_tick(self):
+        """前フレームから動いた部分（再生ヘッドの新旧位置とメーター）だけを再描画に回す"""
+        state = self._frame_state()
+        if state == self._drawn:
+            return
+        if self._drawn is None:
+            self.update()
+        else:
+            (old_x, old_h), (x, h) = self._drawn, state
+            if x != old_x:
+                # 幅 2 のアンチエイリアス線が掛かる列だけ
+                self.update(old_x - 2, 0, 5, self.height())
+                self.update(x - 2, 0, 5, self.height())
+            if h != old_h:
+                top = max(h, old_h)
+                self.update(10, 110 - top, 25, top)
+        self._drawn = state
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        x, h = self._frame_state()
 
         # 再生ヘッド（赤い縦線）
-        x = int(self.current_time * 100)
         painter.setPen(QPen(QColor("#FF2D55"), 2))
         painter.drawLine(x, 0, x, self.height())
 
         # レベルメーター
-        h = int(self.rms * 100)
         painter.fillRect(10, 110 - h, 10, h, QColor("#34C759"))
         painter.fillRect(25, 110 - h, 10, h, QColor("#34C759"))
 
@@ -570,6 +673,69 @@ class SynthesisWorker(QRunnable):
             self.signals.error.emit(str(e))
 
 
+class PitchWorkerSignals(QObject):
+    finished = Signal(object) # 補正後のピッチ配列を返す
+    error = Signal(str)
+
+class PitchInferenceWorker(QRunnable):
+    def __init__(self, dynamics_ai, f0):
+        """
+        AIピッチ補正をスレッドプール上で実行するワーカー。
+        推論（ORT は内部で GIL を解放する）と前後の NumPy 処理を GUI スレッドから外し、
+        タイムライン描画やオーディオコールバックを止めないようにする。
+        """
+        super().__init__()
+        self.dynamics_ai = dynamics_ai
+        self.f0 = f0
+        self.signals = PitchWorkerSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(self.dynamics_ai.generate_emotional_pitch(self.f0))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+def _detect_best_provider():
+    """
+    使える実行プロバイダーを調べて (表示名, プロバイダー名) を返す。
+    onnxruntime の読み込みと試しのセッション作成で数秒掛かることがあるので、GUI スレッドでは呼ばない。
+    """
+    # 外部ライブラリがあるか、どのハードが使えるかチェック（結果はプロセス内でキャッシュ）
+    if not _available_providers():
+        # ライブラリが見つからない場合は安全なCPUモードへ
+        return "CPU (Safe Mode)", "CPUExecutionProvider"
+
+    # 一覧に載っていても動かないことがあるので、実際にセッションを作れるものだけを選ぶ
+    if _provider_usable('DmlExecutionProvider'):
+        return "GPU (DirectML)", "DmlExecutionProvider"
+    if _provider_usable('CoreMLExecutionProvider'):
+        return "Neural Engine (Apple)", "CoreMLExecutionProvider"
+    if _provider_usable('CUDAExecutionProvider'):
+        return "NVIDIA GPU (CUDA)", "CUDAExecutionProvider"
+    return "CPU (Standard)", "CPUExecutionProvider"
+
+
+class HardwareProbeSignals(QObject):
+    finished = Signal(str, str) # (表示名, プロバイダー名)
+
+class HardwareProbeWorker(QRunnable):
+    def __init__(self):
+        """
+        起動時のハードウェア診断をスレッドプール上で実行するワーカー。
+        ウィンドウ表示後に onnxruntime の読み込みで GUI が固まらないようにする。
+        """
+        super().__init__()
+        self.signals = HardwareProbeSignals()
+
+    def run(self):
+        try:
+            device, provider = _detect_best_provider()
+        except Exception:
+            device, provider = "CPU (Safe Mode)", "CPUExecutionProvider"
+        self.signals.finished.emit(device, provider)
+
+
 class AutoOtoEngine:
     def __init__(self, sample_rate=44100):
         self.sample_rate = sample_rate
@@ -590,15 +756,22 @@ class AutoOtoEngine:
             if f.getnchannels() == 2:
                 samples = samples.reshape(-1, 2).mean(axis=1)
 
-        # 1. 振幅のエンベロープ計算（既存ロジック）
-        win_size = int(sr * 0.01) # 10ms
-        envelope = np.convolve(np.abs(samples), np.ones(win_size)/win_size, mode='same')
-        max_amp = np.max(envelope) if np.max(envelope) > 0 else 1.0
+        # 1. 振幅のエンベロープ計算（10ms の移動平均）
+        # np.convolve(|x|, ones(W)/W, mode='same') と同じ値を、累積和の差で O(N) で求める
+        # （畳み込みだと O(N*W) になり、長い WAV で一括解析が遅くなる）
+        win_size = max(1, int(sr * 0.01)) # 10ms
+        n = len(samples)
+        csum = np.zeros(n + 1, dtype=np.float64)
+        np.cumsum(np.abs(samples), dtype=np.float64, out=csum[1:])
+        j = np.arange(n) + (win_size - 1) // 2   # 'same' は full 畳み込みの中央部分
+        envelope = (csum[np.minimum(j, n - 1) + 1] - csum[np.maximum(j - win_size + 1, 0)]) / win_size
+        peak = float(envelope.max()) if n else 0.0
+        max_amp = peak if peak > 0 else 1.0
 
         # 2. オフセット (Offset): 無音を除去し、音が立ち上がる地点
         # 閾値を少し下げて(2%)、小さな子音も拾えるようにします
-        start_indices = np.where(envelope > max_amp * 0.02)[0]
-        start_idx = start_indices[0] if len(start_indices) > 0 else 0
+        above = envelope > max_amp * 0.02
+        start_idx = int(np.argmax(above)) if above.any() else 0
         offset_ms = (start_idx / sr) * 1000
 
         # 3. 先行発声 (Pre-utterance) の精密解析 【ここを大幅修正】
@@ -607,14 +780,13 @@ class AutoOtoEngine:
         
         # 5msごとの窓でZCRを計算
         zcr_win = int(sr * 0.005) 
-        zcr = []
         # start_idxから500msの範囲を調査
         search_range = samples[start_idx : start_idx + int(sr * 0.5)]
-        for i in range(0, len(search_range) - zcr_win, zcr_win):
-            window = search_range[i : i + zcr_win]
-            # 符号反転回数をカウント
-            crossings = np.sum(np.abs(np.diff(np.sign(window)))) / 2
-            zcr.append(crossings / zcr_win)
+        # 窓を (窓数, zcr_win) の2次元配列に並べ、全窓の符号反転回数をまとめて数える
+        n_win = len(range(0, len(search_range) - zcr_win, zcr_win)) if zcr_win > 0 else 0
+        windows = search_range[:n_win * zcr_win].reshape(n_win, zcr_win)
+        crossings = np.abs(np.diff(np.sign(windows), axis=1)).sum(axis=1) / 2
+        zcr = crossings / zcr_win if zcr_win > 0 else crossings
 
         # ZCRが急激に減少した（高周波成分が減り、母音が始まった）地点を探す
         zcr_diff = np.diff(zcr)
@@ -683,6 +855,7 @@ try:
 except ImportError:
     class _TimelineWidgetFallback(QWidget):
         notes_changed_signal = Signal()
+        peaks_ready_signal = Signal(str, object)
         def __init__(self): 
             super().__init__()
             self.notes_list = []
@@ -713,19 +886,15 @@ except ImportError:
         def note_to_y(self, note_num): return (127 - note_num) * self.key_height_pixels
         def get_pitch_data(self): return []
         def get_audio_peaks(self, file_path, num_peaks=2000): return []
+        def get_peak_mipmap(self, file_path): return {}, 0
+        def request_peak_mipmap(self, file_path): return {}
         def set_pitch_data(self, data): pass
         def add_note_from_midi(self, note_num, velocity): pass
         def update(self, *args, **kwargs): super().update()
     TimelineWidget = cast(Any, _TimelineWidgetFallback)
 
-try:
-    from .keyboard_sidebar_widget import KeyboardSidebarWidget
-except ImportError:
-    class _KeyboardSidebarWidgetFallback(QWidget):
-        def __init__(self, height, lowest): super().__init__()
-        def set_key_height_pixels(self, h): pass
-        def set_vertical_offset(self, offset_pixels: int): pass
-    KeyboardSidebarWidget = cast(Any, _KeyboardSidebarWidgetFallback)
+# KeyboardSidebarWidget は冒頭（5. 自作モジュール）で読み込んだ modules.gui.keyboard_sidebar_widget の1つだけを使う。
+# （ここで再 import + スタブ定義をすると、相対 import に失敗した環境で本物がスタブに置き換わっていた）
 
 try:
     from .midi_manager import load_midi_file, MidiInputManager # type: ignore
@@ -737,8 +906,10 @@ except ImportError:
         def stop(self): pass
 
 
+# 正規の VoiceManager は modules.audio.voice_manager の1つだけ。
+# （旧 modules.gui.voice_manager は存在しないため、ここで上書きすると常にフォールバックになっていた）
 try:
-    from .voice_manager import VoiceManager # type: ignore
+    from modules.audio.voice_manager import VoiceManager # type: ignore
 except ImportError:
     class _VoiceManagerFallback:
         def __init__(self, ai):
@@ -2160,6 +2331,8 @@ class MainWindow(QMainWindow):
         if self.timeline_widget:
             # ノートが動いたときにメインウィンドウ側で受け取る
             self.timeline_widget.notes_changed_signal.connect(self.on_timeline_updated)
+            # 波形解析（ワーカースレッド）の完了をトラックのキャッシュへ
+            self.timeline_widget.peaks_ready_signal.connect(self._on_track_peaks_ready)
             # タイムラインからグラフエディタへ通知（ピッチ描画の基準更新）
             if self.graph_editor_widget is not None:
                 self.timeline_widget.notes_changed_signal.connect(
@@ -2405,34 +2578,13 @@ class MainWindow(QMainWindow):
 
         self.statusBar().showMessage("Initializing VO-SE Engine...")
         
-        # 2. ハードウェア診断ロジック
-        try:
-            # 外部ライブラリがあるか、どのハードが使えるかチェック
-            import onnxruntime as ort
-            providers = ort.get_available_providers()
-            
-            if 'DmlExecutionProvider' in providers:
-                self.active_device = "GPU (DirectML)"
-                self.active_provider = "DmlExecutionProvider"
-            elif 'CoreMLExecutionProvider' in providers:
-                self.active_device = "Neural Engine (Apple)"
-                self.active_provider = "CoreMLExecutionProvider"
-            elif 'CUDAExecutionProvider' in providers:
-                self.active_device = "NVIDIA GPU (CUDA)"
-                self.active_provider = "CUDAExecutionProvider"
-            else:
-                self.active_device = "CPU (Standard)"
-                self.active_provider = "CPUExecutionProvider"
-                
-        except ImportError:
-            # ライブラリが見つからない場合は安全なCPUモードへ
-            self.active_device = "CPU (Safe Mode)"
-            self.active_provider = "CPUExecutionProvider"
-
-        # 3. 診断結果をUIに反映
-        if self.device_status_label is not None:
-            self.device_status_label.setText(f" [ {self.active_device} ] ")
-        self.statusBar().showMessage(f"Engine Ready: {self.active_device}", 5000)
+        # 2. ハードウェア診断は onnxruntime の読み込み（数秒）を伴うため、
+        #    ワーカースレッドで行い、結果が届くまでは CPU 既定値のまま動かす
+        probe = HardwareProbeWorker()
+        # 結果の通知が届くまで信号オブジェクトを保持しておく
+        self._hardware_probe_signals = probe.signals
+        probe.signals.finished.connect(self._on_hardware_detected)
+        QThreadPool.globalInstance().start(probe)
         
         # アップデート確認（CI/スモークテストでは環境変数で無効化可能）
         skip_update_check = os.environ.get("VOSE_SKIP_UPDATE_CHECK", "").lower() in {
@@ -2441,6 +2593,17 @@ class MainWindow(QMainWindow):
         if not skip_update_check:
             QTimer.singleShot(3000, self._check_for_updates)
 
+    @Slot(str, str)
+    def _on_hardware_detected(self, device, provider):
+        """ワーカーの診断結果を active_device / active_provider とステータス表示に反映する"""
+        self.active_device = device
+        self.active_provider = provider
+
+        # 診断結果をUIに反映
+        if self.device_status_label is not None:
+            self.device_status_label.setText(f" [ {self.active_device} ] ")
+        self.statusBar().showMessage(f"Engine Ready: {self.active_device}", 5000)
+
     def log_startup(self, message):
         """標準出力へのログ記録）""" 
         timestamp = time.strftime('%H:%M:%S')
@@ -2740,14 +2903,21 @@ class MainWindow(QMainWindow):
             track.name = os.path.basename(file_path)
             
             # 重要：読み込み時に一度解析させてキャッシュを作る
-            # TimelineWidgetのメソッドを呼び出してピークを取得
-            track.vose_peaks = self.timeline_widget.get_audio_peaks(file_path)
+            # 解析はワーカースレッドで行い、終わったら _on_track_peaks_ready でトラックへ入る
+            track.vose_peaks = self.timeline_widget.request_peak_mipmap(file_path)
             
             self.refresh_track_list_ui()
             if self.timeline_widget: 
                 self.timeline_widget.update()
             self.statusBar().showMessage(f"Loaded: {track.name}")
 
+    @Slot(str, object)
+    def _on_track_peaks_ready(self, file_path, levels):
+        """波形ミップマップの生成完了を、同じ音源を持つトラックのキャッシュへ反映する"""
+        for track in self.tracks:
+            if getattr(track, 'audio_path', "") == file_path:
+                track.vose_peaks = levels
+
     def refresh_ui(self):
         """Undo/Redo後に現在のトラック状態を画面に同期"""
         current_notes = self.tracks[self.current_track_idx].notes
@@ -3073,7 +3243,7 @@ class MainWindow(QMainWindow):
         import os
         model_path = "models/aural_dynamics.onnx"
 
-        if ort is None:
+        if _optional_module("onnxruntime") is None:
             self.log_startup("Aural AI disabled: onnxruntime is not installed.")
             return
     
@@ -3083,14 +3253,11 @@ class MainWindow(QMainWindow):
 
         try:
             # 1. 診断済みのプロバイダー（NPU等）をセッションに渡す
-            # セッションオプションの設定（スレッド数などをCore i3向けに最適化）
-            options = ort.SessionOptions()
-            options.intra_op_num_threads = 1  # 信号処理との競合を避けるため1に固定
-        
-            self.ai_session = ort.InferenceSession(
-                model_path, 
-                sess_options=options,
-                providers=[self.active_provider, 'CPUExecutionProvider'] # NPUがダメならCPU
+            # セッションオプションは AuralAIEngine と共通（グラフ最適化・アリーナ再利用）
+            self.ai_session = create_inference_session(
+                resolve_model_path(model_path),  # INT8 量子化版があれば優先
+                providers=[self.active_provider, 'CPUExecutionProvider'], # NPUがダメならCPU
+                intra_op_threads=1,  # 信号処理との競合を避けるため1に固定
             )
         
             self.log_startup(f"Aural AI binding successful on {self.active_provider}")
@@ -3098,7 +3265,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.log_startup(f"AI Binding Failed: {e}")
             # 最終防衛線としてCPUで再試行
-            self.ai_session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+            self.ai_session = create_inference_session(resolve_model_path(model_path), intra_op_threads=1)
 
     # =============================================================
     # DSP CONTROL: PRECISION EQUALIZER (No-Noise Logic)
@@ -3153,9 +3320,8 @@ class MainWindow(QMainWindow):
         [完全版] AI予測ピッチ + 黄金比ポルタメント + ビブラート
         """
         import numpy as np      
-        import math
         # 1. 基礎となる音程（Hz）の計算
-        target_hz = 440.0 * (2.0 ** ((note.note_number - 69) / 12.0))
+        target_hz = float(440.0 * np.exp2((note.note_number - 69) * (1.0 / 12.0)))
         
         # フレーム数計算（5ms = 1フレーム。1.0秒なら200フレーム）
         num_frames = max(1, int((note.duration * 1000.0) / 5.0))
@@ -3164,11 +3330,11 @@ class MainWindow(QMainWindow):
         if hasattr(note, 'dynamics') and 'pitch' in note.dynamics:
             curve = np.array(note.dynamics['pitch'], dtype=np.float64)
         else:
-            curve = np.ones(num_frames, dtype=np.float64) * target_hz
+            curve = np.full(num_frames, target_hz, dtype=np.float64)
 
         # 2. ポルタメント（前の音からの滑らかな接続）
         if prev_note:
-            prev_hz = 440.0 * (2.0 ** ((prev_note.note_number - 69) / 12.0))
+            prev_hz = float(440.0 * np.exp2((prev_note.note_number - 69) * (1.0 / 12.0)))
             # ノートの最初の15%を使って滑らかに繋ぐ（黄金比的な減衰）
             port_len = min(int(num_frames * 0.15), 40)
             if port_len > 0:
@@ -3180,12 +3346,11 @@ class MainWindow(QMainWindow):
         vibrato_depth = 6.0  # Hz単位の揺れ幅
         vibrato_rate = 5.5   # 1秒間に5.5回
         
-        # ノートの後半50%からビブラートを開始
+        # ノートの後半50%からビブラートを開始（フレームごとのループではなく配列で一括加算）
         vib_start = int(num_frames * 0.5)
-        for i in range(vib_start, num_frames):
-            time_sec = i * 0.005 # 5ms単位
-            osc = math.sin(2 * math.pi * vibrato_rate * time_sec)
-            curve[i] += osc * vibrato_depth
+        vib_seg = curve[vib_start:num_frames]
+        time_sec = np.arange(vib_start, vib_start + vib_seg.size) * 0.005 # 5ms単位
+        vib_seg += np.sin((2 * np.pi * vibrato_rate) * time_sec) * vibrato_depth
 
         return curve
 
@@ -3639,14 +3804,18 @@ class MainWindow(QMainWindow):
         pitch_events = all_params.get("Pitch", [])
         tension_events = all_params.get("Tension", [])
 
-        for note in notes:
+        # 全ノート分をパラメータごとに一括サンプリングする
+        pitch_bends = self._sample_notes(pitch_events, notes, 64)
+        dynamics = self._sample_notes(tension_events, notes, 64)
+
+        for i, note in enumerate(notes):
             note_info = {
                 "lyric": note.lyrics,
                 "note_num": note.note_number,
                 "start_sec": note.start_time,
                 "duration_sec": note.duration,
-                "pitch_bend": self._sample_range(pitch_events, note, 64),
-                "dynamics": self._sample_range(tension_events, note, 64)
+                "pitch_bend": pitch_bends[i],
+                "dynamics": dynamics[i]
             }
             render_data["notes"].append(note_info)
 
@@ -4730,10 +4899,28 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("ピッチデータがありません")
             return
         
-        new_f0 = self.dynamics_ai.generate_emotional_pitch(f0)
+        # 推論中の二重実行を防ぐ（エンジンの入出力バッファはインスタンスごとに1組）
+        if getattr(self, "_ai_pitch_running", False):
+            return
+        self._ai_pitch_running = True
+        self.statusBar().showMessage("AIピッチ補正中...")
+
+        worker = PitchInferenceWorker(self.dynamics_ai, f0)
+        worker.signals.finished.connect(self.on_ai_pitch_finished)
+        worker.signals.error.connect(self.on_ai_pitch_failed)
+        QThreadPool.globalInstance().start(worker)
+
+    def on_ai_pitch_finished(self, new_f0):
+        """AIピッチ補正の完了時（GUIスレッド）にタイムラインへ反映する"""
+        self._ai_pitch_running = False
         self.timeline_widget.set_pitch_data(new_f0)
         self.statusBar().showMessage("AIピッチ補正を適用しました")
 
+    def on_ai_pitch_failed(self, error_msg):
+        """AIピッチ補正の失敗時の処理"""
+        self._ai_pitch_running = False
+        self.statusBar().showMessage(f"AIピッチ補正に失敗しました: {error_msg}")
+
 
     def start_vocal_analysis(self, audio_data):
         """AIによるボーカル解析を開始する"""
@@ -5085,9 +5272,15 @@ class MainWindow(QMainWindow):
             vocal_data_list = []
             res = 128  # 1ノートあたりのサンプリング解像度
 
-            for note in notes:
+            # 全ノート分をパラメータごとに一括サンプリングする
+            sampled = {
+                name: self._sample_notes(all_params.get(name, []), notes, res)
+                for name in ("Pitch", "Gender", "Tension", "Breath")
+            }
+
+            for i, note in enumerate(notes):
                 # --- [STEP 1: ベースピッチのサンプリング] ---
-                base_f0_list = self._sample_range(all_params.get("Pitch", []), note, res)
+                base_f0_list = sampled["Pitch"][i]
 
                 # --- [STEP 2: Aural AI による感情補正] ---
                 if ai_engine is not None:
@@ -5105,9 +5298,9 @@ class MainWindow(QMainWindow):
                     "start_time": note.start_time,
                     "duration": note.duration,
                     "pitch_list": final_pitch_list,
-                    "gender_list": self._sample_range(all_params.get("Gender", []), note, res),
-                    "tension_list": self._sample_range(all_params.get("Tension", []), note, res),
-                    "breath_list": self._sample_range(all_params.get("Breath", []), note, res),
+                    "gender_list": sampled["Gender"][i],
+                    "tension_list": sampled["Tension"][i],
+                    "breath_list": sampled["Breath"][i],
                 }
                 vocal_data_list.append(note_data)
 
@@ -5177,6 +5370,23 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "エラー", f"保存失敗: {e}")
 
+    def _sample_notes(self, events, notes, res):
+        """
+        全ノートの時刻グリッド (ノート数, res) をまとめて作り、1回の評価でサンプリングする。
+        戻り値はノートごとの list（_sample_range と同じ値）。
+        """
+        gw = getattr(self, 'graph_editor_widget', None)
+        if (not events or not notes or gw is None or not hasattr(gw, 'get_values_at_times')
+                or any(note is None for note in notes)):
+            return [self._sample_range(events, note, res) for note in notes]
+
+        count = len(notes)
+        starts = np.fromiter((note.start_time for note in notes), dtype=np.float64, count=count)
+        durations = np.fromiter((note.duration for note in notes), dtype=np.float64, count=count)
+        grid = starts[:, None] + durations[:, None] * np.linspace(0.0, 1.0, res)
+        values = gw.get_values_at_times(events, grid.ravel())
+        return [values[i * res:(i + 1) * res] for i in range(count)]
+
     def _sample_range(self, events, note, res):
         """サンプリング補助関数 (Actionsエラー修正版)"""
         # 1. note が None でないことを確認 (reportOptionalOperand対策)
@@ -5192,6 +5402,9 @@ class MainWindow(QMainWindow):
             
         # 4. graph_editor_widget の存在確認と呼び出し
         if hasattr(self, 'graph_editor_widget') and self.graph_editor_widget is not None:
+            # 1ノート分の時刻列をまとめて評価する（時刻ごとの Python 呼び出しをしない）
+            if hasattr(self.graph_editor_widget, 'get_values_at_times'):
+                return self.graph_editor_widget.get_values_at_times(events, times)
             return [self.graph_editor_widget.get_value_at_time(events, t) for t in times]
         else:
             # widgetがない場合のフォールバック
@@ -5261,6 +5474,7 @@ class MainWindow(QMainWindow):
     def load_midi_file_from_path(self, filepath: str):
         """MIDI読み込み（自動歌詞変換機能付き）"""
         try:
+            mido = _optional_module("mido")
             if mido is None:
                 raise RuntimeError("MIDI import requires 'mido'. Please install dependencies first.")
             from ..data.data_models import NoteEvent
@@ -1,21 +1,148 @@
 import json
 import logging
+import math
 import os
 import ctypes
 import wave
 import numpy as np
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Protocol, runtime_checkable, cast
+from functools import lru_cache
+try:
+    import soundfile as sf
+except Exception:
+    sf = None
+try:
+    import shiboken6
+except ImportError:
+    shiboken6 = None
+from typing import List, Dict, Any, Optional, Protocol, Tuple, runtime_checkable, cast
 
 from PySide6.QtWidgets import (QWidget, QApplication, QInputDialog, QLineEdit,
                                QMainWindow, QMenu)
-from PySide6.QtCore import Qt, QRect, QRectF, Signal, Slot, QPoint, QPointF, QSize
+from PySide6.QtCore import (Qt, QRect, QRectF, Signal, Slot, QPoint, QPointF, QSize,
+                            QObject, QRunnable, QThreadPool)
 from PySide6.QtGui import (QPainter, QPen, QBrush, QColor, QFont, QAction, QContextMenuEvent,
                             QLinearGradient, QPaintEvent, QMouseEvent, QKeyEvent, QWheelEvent,
-                            QPixmap)  # [OPT] QPixmap追加
+                            QPixmap, QPolygonF)  # [OPT] QPixmap追加
+
+# 黒鍵の判定は鍵盤サイドバーと同じマスクを使う（行の塗り分けが鍵盤とずれないように）
+from modules.gui.keyboard_sidebar_widget import BLACK_KEY_MASK
 
 logger = logging.getLogger(__name__)
 
+# 波形ミップマップの最も細かい段のブロック長（サンプル数）。段ごとに2倍ずつ粗くなる
+_PEAK_BASE_BLOCK = 512
+
+
+def build_peak_mipmap(samples: np.ndarray, base_block: int = _PEAK_BASE_BLOCK) -> Dict[int, np.ndarray]:
+    """
+    int16 のモノラル波形から、ブロック長 512, 1024, 2048, ... ごとの (min, max) 列を作る。
+    2段目以降は前の段の隣り合う2ブロックをまとめるだけなので、全段合わせても O(N)。
+    戻り値は {ブロック長: shape (n, 2) の int16 配列}。
+    """
+    levels: Dict[int, np.ndarray] = {}
+    if samples.size == 0:
+        return levels
+    # 割り切れる部分は reshape（コピーなし）で、端数のブロックは別に min/max を取る
+    full = samples.size // base_block * base_block
+    blocks = samples[:full].reshape(-1, base_block)
+    mm = np.stack((blocks.min(axis=1), blocks.max(axis=1)), axis=1)
+    if full < samples.size:
+        tail = samples[full:]
+        mm = np.concatenate((mm, np.array([[tail.min(), tail.max()]], dtype=mm.dtype)))
+    block = base_block
+    levels[block] = mm
+    while len(mm) > 1:
+        if len(mm) % 2:
+            mm = np.concatenate((mm, mm[-1:]))
+        pairs = mm.reshape(-1, 2, 2)
+        mm = np.stack((pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)), axis=1)
+        block *= 2
+        levels[block] = mm
+    return levels
+
+
+def _read_wav_mono(file_path: str) -> Tuple[np.ndarray, int]:
+    """
+    16bit Wav を np.memmap で開き、先頭チャンネルのサンプル列とサンプルレートを返す。
+    ファイル全体をメモリへ読み込まないので、長い音源でも触ったページ分しか確保しない。
+    16bit 以外（8/24/32bit・float）は soundfile で int16 に変換して読む。
+    """
+    try:
+        with open(file_path, 'rb') as f, wave.open(f, 'rb') as w:
+            params = w.getparams()
+            # wave はヘッダを読み終えた時点で data チャンクの先頭にいる
+            offset = f.tell()
+    except wave.Error:
+        # float Wav など wave が読めない形式
+        params = None
+    if params is None or params.sampwidth != 2:
+        if sf is None:
+            raise ValueError(f"Unsupported Wav format (soundfile is not installed): {file_path}")
+        # float Wav は int16 で直接読むとスケールされないので、float32 で読んでから変換する
+        data, rate = sf.read(file_path, dtype='float32', always_2d=True)
+        return np.clip(np.rint(data[:, 0] * 32767.0), -32768, 32767).astype(np.int16), rate
+
+    count = params.nframes * params.nchannels
+    if count == 0:
+        return np.empty(0, dtype=np.int16), params.framerate
+    samples = np.memmap(file_path, dtype='<i2', mode='r', offset=offset, shape=(count,))
+    return samples[::params.nchannels], params.framerate
+
+
+@lru_cache(maxsize=16)
+def _audio_peaks(file_path: str, mtime: float, num_peaks: int) -> Tuple[float, ...]:
+    """
+    np.array_split と同じ区切りで絶対値の最大を取り、全体の最大で正規化する。
+    区間ごとの Python ループは使わず、reduceat 1回ずつで全区間を求める。
+    mtime はキャッシュキー用（ファイルが書き換わったら計算し直す）。
+    """
+    samples, _ = _read_wav_mono(file_path)
+    n = len(samples)
+    if n == 0:
+        return ()
+    num_peaks = min(num_peaks, n)
+    size, extra = divmod(n, num_peaks)
+    idx = np.arange(num_peaks)
+    starts = idx * size + np.minimum(idx, extra)
+    # int16 のまま abs を取ると -32768 が溢れるので、min / max から振幅を出す
+    lo = np.minimum.reduceat(samples, starts).astype(np.int32)
+    hi = np.maximum.reduceat(samples, starts).astype(np.int32)
+    peaks = np.maximum(-lo, hi).astype(np.float64)
+    max_val = float(peaks.max())
+    if max_val > 0:
+        peaks /= max_val
+    return tuple(peaks.tolist())
+
+
+def peaks_at_zoom(levels: Dict[int, np.ndarray], samples_per_pixel: float) -> Tuple[int, np.ndarray]:
+    """1ピクセルあたりのサンプル数以下で最も粗い段を選ぶ（無ければ最も細かい段）。"""
+    level = _PEAK_BASE_BLOCK
+    if samples_per_pixel >= _PEAK_BASE_BLOCK:
+        level = min(2 ** int(math.log2(samples_per_pixel)), max(levels))
+    return level, levels[level]
+
+class _PeakSignals(QObject):
+    """ワーカースレッドで作った波形ミップマップを GUI スレッドへ渡すための信号"""
+    finished = Signal(str, object, int)  # (ファイルパス, ミップマップ, サンプルレート)
+
+
+class _PeakTask(QRunnable):
+    """
+    Wav の読み込みとミップマップ生成を行うワーカー。
+    長い音源ではこれだけで数十 ms 掛かるので、paintEvent や読み込み操作の中で UI を止めない。
+    """
+    def __init__(self, widget: "TimelineWidget", file_path: str, signals: _PeakSignals):
+        super().__init__()
+        self._widget = widget
+        self._file_path = file_path
+        self._signals = signals
+
+    def run(self):
+        levels, rate = self._widget.get_peak_mipmap(self._file_path)
+        self._signals.finished.emit(self._file_path, levels, rate)
+
+
 # ============================================================
 # 1. データモデル
 # ============================================================
@@ -113,6 +240,8 @@ class TimelineWidget(QWidget):
 
     notes_changed_signal = Signal()
     scroll_synced_signal = Signal(int)
+    # 波形ミップマップの生成が終わった（ファイルパス, {ブロック長: (min, max) 配列}）
+    peaks_ready_signal = Signal(str, object)
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
@@ -138,8 +267,17 @@ class TimelineWidget(QWidget):
         self.selection_rect: QRect = QRect()
         self._resizing_note: Optional[Any] = None
 
-        self._wave_cache: List[float] = []
+        # 波形は {ブロック長: (min, max) 配列} のミップマップで持ち、ズームに合った段だけ描く
+        self._wave_cache: Dict[int, np.ndarray] = {}
         self._wave_cache_path: str = ""
+        self._wave_rate: int = 44100
+        self._wave_poly: QPolygonF = QPolygonF()
+        # 生成中のファイルパスと、描画側が待っているファイルパス
+        self._peak_pending: set = set()
+        self._wave_wanted_path: str = ""
+        # 親は付けない（ウィジェット破棄後にワーカーが emit しても落ちないように。接続は破棄時に自動で切れる）
+        self._peak_signals = _PeakSignals()
+        self._peak_signals.finished.connect(self._on_peaks_ready)
 
         self.show_ai_phonemes: bool = True
         self.ai_ghost_alpha: int = 100
@@ -282,13 +420,16 @@ class TimelineWidget(QWidget):
 
         # --- 横線（ノート行・黒鍵強調） ---
         pen_dark = QPen(QColor(35, 35, 35), 1)
-        for n in range(128):
-            y = (127 - n) * self.key_height_pixels - self.scroll_y_offset
-            if y + self.key_height_pixels < 0:
+        # 画面に掛かるノート番号の範囲だけを回す
+        # （n が増えるほど y は上へ行くので、下端側が n_lo・上端側が n_hi）
+        kh = self.key_height_pixels
+        n_lo = max(0, int((127 * kh - self.scroll_y_offset - self.height()) // kh))
+        n_hi = min(127, int((128 * kh - self.scroll_y_offset) // kh) + 1)
+        for n in range(n_lo, n_hi + 1):
+            y = (127 - n) * kh - self.scroll_y_offset
+            if y + kh < 0 or y > self.height():
                 continue
-            if y > self.height():
-                break
-            if (n % 12) in (1, 3, 6, 8, 10):
+            if (BLACK_KEY_MASK >> (n % 12)) & 1:
                 p.fillRect(QRectF(0, y, self.width(), self.key_height_pixels),
                            QColor(22, 22, 22))
             p.setPen(pen_dark)
@@ -397,18 +538,34 @@ class TimelineWidget(QWidget):
             if file.endswith(".wav"):
                 phoneme = file.replace(".wav", "")
                 try:
-                    with wave.open(os.path.join(voice_db_path, file), 'rb') as wr:
-                        frames = wr.readframes(wr.getnframes())
-                        data = np.frombuffer(frames, dtype=np.int16)
-                        if self.vose_core:
-                            self.vose_core.load_embedded_resource(
-                                phoneme.encode('utf-8'),
-                                data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16)),
-                                len(data)
-                            )
+                    data, fs = self._read_voice_pcm16(os.path.join(voice_db_path, file))
+                    if fs != 44100:
+                        # C++ 側は 44.1kHz 前提。レートが異なる場合のみポリフェーズで変換（scipy は遅延ロード）
+                        from modules.tools.pack_all_voices import resample_to_embed_fs
+                        data = resample_to_embed_fs(data, fs)
+                    if self.vose_core:
+                        self.vose_core.load_embedded_resource(
+                            phoneme.encode('utf-8'),
+                            data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16)),
+                            len(data)
+                        )
                 except Exception as e:
                     logger.error(f"Voice load error: {e}")
 
+    @staticmethod
+    def _read_voice_pcm16(path: str):
+        """WAV を int16 モノラル（先頭チャンネル）で読み込み、(データ, サンプリングレート) を返す。"""
+        if sf is not None:
+            data, fs = sf.read(path, dtype='int16', always_2d=True)
+            return np.ascontiguousarray(data[:, 0]), int(fs)
+        with wave.open(path, 'rb') as wr:
+            fs = wr.getframerate()
+            nch = wr.getnchannels()
+            data = np.frombuffer(wr.readframes(wr.getnframes()), dtype=np.int16)
+        if nch > 1:
+            data = np.ascontiguousarray(data[::nch])
+        return data, fs
+
     # ============================================================
     # データ入出力
     # ============================================================
@@ -521,43 +678,101 @@ class TimelineWidget(QWidget):
         if not file_path or not os.path.exists(file_path):
             return []
         try:
-            with wave.open(file_path, 'rb') as w:
-                params = w.getparams()
-                if params.nframes == 0:
-                    return []
-                samples = np.frombuffer(w.readframes(params.nframes), dtype=np.int16)
-                if params.nchannels == 2:
-                    samples = samples[::2]
-                num_peaks = min(num_peaks, max(1, len(samples)))
-                chunks = np.array_split(samples, num_peaks)
-                peaks = [float(np.max(np.abs(c))) if len(c) > 0 else 0.0 for c in chunks]
-                max_val = float(np.max(peaks)) if peaks else 1.0
-                return [p / max_val for p in peaks] if max_val > 0 else peaks
+            return list(_audio_peaks(file_path, os.path.getmtime(file_path), num_peaks))
         except Exception as e:
             logger.error(f"Waveform Analysis Error: {e}")
             return []
 
+    def get_peak_mipmap(self, file_path: str) -> Tuple[Dict[int, np.ndarray], int]:
+        """Wav を読み込んでピークのミップマップとサンプルレートを返す（ステレオは左チャンネル）"""
+        if not file_path or not os.path.exists(file_path):
+            return {}, 0
+        try:
+            samples, rate = _read_wav_mono(file_path)
+            return build_peak_mipmap(samples), rate
+        except Exception as e:
+            logger.error(f"Waveform Analysis Error: {e}")
+            return {}, 0
+
+    def request_peak_mipmap(self, file_path: str) -> Dict[int, np.ndarray]:
+        """
+        表示中のミップマップがあればそれを返し、無ければワーカースレッドで生成を始めて空の辞書を返す。
+        生成が終わると peaks_ready_signal が出る。
+        """
+        if file_path == self._wave_cache_path:
+            return self._wave_cache
+        if file_path and file_path not in self._peak_pending:
+            self._peak_pending.add(file_path)
+            QThreadPool.globalInstance().start(_PeakTask(self, file_path, self._peak_signals))
+        return {}
+
+    @Slot(str, object, int)
+    def _on_peaks_ready(self, file_path: str, levels: Dict[int, np.ndarray], rate: int) -> None:
+        self._peak_pending.discard(file_path)
+        if file_path == self._wave_wanted_path:
+            self._wave_cache, self._wave_rate = levels, rate
+            self._wave_cache_path = file_path
+            self.update()
+        self.peaks_ready_signal.emit(file_path, levels)
+
     def _draw_audio_waveform(self, p: QPainter) -> None:
         audio_path = str(getattr(self.window(), 'current_audio_path', ''))
         if not audio_path or not os.path.exists(audio_path):
             return
         if self._wave_cache_path != audio_path:
-            self._wave_cache = self.get_audio_peaks(audio_path)
-            self._wave_cache_path = audio_path
-        if not self._wave_cache:
+            # 生成が終わるまでは中央に灰色の帯だけを出しておく
+            self._wave_wanted_path = audio_path
+            self.request_peak_mipmap(audio_path)
+            p.fillRect(QRectF(0, self.height() / 2.0 - 1, self.width(), 2), QColor(128, 128, 128, 60))
             return
-        p.setPen(QPen(QColor(0, 255, 255, 50), 1))
+        px_per_sec = (self.tempo / 60.0) * self.pixels_per_beat
+        if not self._wave_cache or px_per_sec <= 0:
+            return
+
+        # 最も粗い段（1ブロック）が全体の最小・最大なので、そこから正規化係数を取る
+        whole = self._wave_cache[max(self._wave_cache)][0]
+        peak = max(-int(whole[0]), int(whole[1]))
+        if peak <= 0:
+            return
+
+        # ズームに合った段を選び、画面内のブロックだけを縦線にする（クリップ長に依存しない）
+        block, mm = peaks_at_zoom(self._wave_cache, self._wave_rate / px_per_sec)
+        px_per_block = block * px_per_sec / self._wave_rate
+        i0 = max(0, int(self.scroll_x_offset / px_per_block))
+        i1 = min(len(mm), int((self.scroll_x_offset + self.width()) / px_per_block) + 2)
+        if i0 >= i1:
+            return
+
+        # 同じピクセル列に落ちるブロックは min/max をまとめ、1列1本にする（半透明の重ね塗りを防ぐ）
+        cols = np.floor(np.arange(i0, i1) * px_per_block - self.scroll_x_offset)
+        starts = np.flatnonzero(np.diff(cols, prepend=cols[0] - 1))
+        seg = mm[i0:i1]
+        lo = np.minimum.reduceat(seg[:, 0], starts)
+        hi = np.maximum.reduceat(seg[:, 1], starts)
+
+        n = len(starts)
+        scale = self.height() * 0.7 / 2.0 / peak
         mid_y = self.height() / 2.0
-        max_h = self.height() * 0.7
-        interval_px = (self.tempo / 60.0) * self.pixels_per_beat * 0.05
-        for i, peak in enumerate(self._wave_cache):
-            x = i * interval_px - self.scroll_x_offset
-            if x < -interval_px:
-                continue
-            if x > self.width():
-                break
-            h = peak * max_h
-            p.drawLine(int(x), int(mid_y - h / 2), int(x), int(mid_y + h / 2))
+        pts = np.empty((n, 2, 2), dtype=np.float64)
+        pts[:, :, 0] = cols[starts, None] + 0.5
+        pts[:, 0, 1] = mid_y - hi * scale
+        pts[:, 1, 1] = mid_y - lo * scale
+
+        # 点の組を QPolygonF の内部バッファへ直接書き込み、drawLines 1回で描く
+        poly = self._wave_poly
+        poly.resize(2 * n)
+        if shiboken6 is not None:
+            buf = shiboken6.VoidPtr(poly.data(), 2 * n * 16, True)
+            np.frombuffer(buf, dtype=np.float64)[:] = pts.ravel()
+        else:
+            for k, (x, y) in enumerate(pts.reshape(-1, 2).tolist()):
+                poly[k] = QPointF(x, y)
+
+        p.save()
+        p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        p.setPen(QPen(QColor(0, 255, 255, 50), 1))
+        p.drawLines(poly)
+        p.restore()
 
     # ============================================================
     # 描画
@@ -1237,6 +1452,9 @@ class TimelineWidget(QWidget):
 
     @Slot(float)
     def update_audio_level(self, level: float) -> None:
+        # 値が変わらない通知（無音が続く間など）では再描画しない
+        if level == self.audio_level:
+            return
         self.audio_level = level
         self.update()
 
@@ -1268,12 +1486,17 @@ class TimelineWidget(QWidget):
 
     @Slot(int)
     def set_vertical_offset(self, val: int) -> None:
+        if float(val) == self.scroll_y_offset:
+            return
         self.scroll_y_offset = float(val)
         self._invalidate_grid()        # [OPT-1]
         self.update()
 
     @Slot(int)
     def set_horizontal_offset(self, val: int) -> None:
+        # 同じ位置の通知ではグリッド・ノート矩形のキャッシュを捨てない
+        if float(val) == self.scroll_x_offset:
+            return
         self.scroll_x_offset = float(val)
         self._invalidate_grid()        # [OPT-1]
         self._invalidate_note_rects()  # [OPT-3]
@@ -33,8 +33,10 @@ import pyopenjtalk
 import sounddevice as sd
 import soundfile as sf
 from PySide6.QtCore import QObject, Signal
-from modules.ffi import CNoteEvent, as_c_double_array
+from modules.ffi import CNoteEvent
 
+# ノートごとに ctypes.POINTER(...) を引き直さないよう、ポインタ型は一度だけ生成する
+_C_DOUBLE_P = ctypes.POINTER(ctypes.c_double)
 
 # ══════════════════════════════════════════════════════════════
 # 0. 型プロトコル
@@ -293,10 +295,12 @@ class VoseRendererBridge:
                 print("❌ Curve length mismatch detected — aborting")
                 return False
 
-            p_arr = as_c_double_array(pitch)
-            g_arr = as_c_double_array(gender)
-            t_arr = as_c_double_array(tension)
-            b_arr = as_c_double_array(breath)
+            # 要素ごとの ctypes 変換を避け、float64 の連続配列にまとめてからポインタを渡す
+            # （既に float64 の ndarray ならコピーなし）
+            p_arr = np.ascontiguousarray(pitch, dtype=np.float64)
+            g_arr = np.ascontiguousarray(gender, dtype=np.float64)
+            t_arr = np.ascontiguousarray(tension, dtype=np.float64)
+            b_arr = np.ascontiguousarray(breath, dtype=np.float64)
             keep_alive.extend([p_arr, g_arr, t_arr, b_arr])
 
             wav_path: str = data.get("wav_path", "")
@@ -305,11 +309,11 @@ class VoseRendererBridge:
                 return False
 
             c_notes[i].wav_path = wav_path.encode("utf-8")
-            c_notes[i].pitch_length = len(pitch)
-            c_notes[i].pitch_curve = p_arr
-            c_notes[i].gender_curve = g_arr
-            c_notes[i].tension_curve = t_arr
-            c_notes[i].breath_curve = b_arr
+            c_notes[i].pitch_length = p_arr.size
+            c_notes[i].pitch_curve = p_arr.ctypes.data_as(_C_DOUBLE_P)
+            c_notes[i].gender_curve = g_arr.ctypes.data_as(_C_DOUBLE_P)
+            c_notes[i].tension_curve = t_arr.ctypes.data_as(_C_DOUBLE_P)
+            c_notes[i].breath_curve = b_arr.ctypes.data_as(_C_DOUBLE_P)
 
         try:
             self.lib.execute_render(c_notes, note_count, output_path.encode("utf-8"), 0)
@@ -403,12 +407,15 @@ class TalkManager(QObject):
             x_arr = np.asarray(x)
 
             # [FIX-7] 全サンプルが 0 / 空配列の場合でも安全に処理する
+            # 絶対値配列を作らずに max/min からピークを求め、スケール後のバッファ1本に
+            # in-place でクリップしてから int16 化する（一時配列は1つだけ）
             if x_arr.dtype in (np.float32, np.float64):
-                abs_max = np.abs(x_arr).max() if x_arr.size > 0 else 0.0
-                if abs_max <= 1.0:
-                    x_arr = x_arr * 32767.0
-
-            x_int16 = np.clip(x_arr, -32768, 32767).astype(np.int16)
+                abs_max = max(float(x_arr.max()), -float(x_arr.min())) if x_arr.size > 0 else 0.0
+                x_arr = x_arr * 32767.0 if abs_max <= 1.0 else x_arr.copy()
+                np.clip(x_arr, -32768, 32767, out=x_arr)
+                x_int16 = x_arr.astype(np.int16)
+            else:
+                x_int16 = np.clip(x_arr, -32768, 32767).astype(np.int16)
             sf.write(output_path, x_int16, sr)
 
             if os.path.exists(output_path):
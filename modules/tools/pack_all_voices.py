@@ -2,6 +2,35 @@ import wave
 import numpy as np
 import glob
 import os
+from math import gcd
+
+try:
+    from scipy.signal import resample_poly
+except Exception:
+    resample_poly = None
+
+EMBED_FS = 44100
+
+
+def resample_to_embed_fs(data, fs):
+    """int16 波形を EMBED_FS へポリフェーズでリサンプリングし、長さを厳密に合わせる。"""
+    target_len = int(round(len(data) * EMBED_FS / fs))
+    if resample_poly is not None:
+        g = gcd(fs, EMBED_FS)
+        resampled = resample_poly(data.astype(np.float64), EMBED_FS // g, fs // g)
+    else:
+        # scipy が無い環境では線形補間で代用
+        src_t = np.arange(len(data), dtype=np.float64)
+        dst_t = np.linspace(0.0, len(data) - 1, target_len)
+        resampled = np.interp(dst_t, src_t, data.astype(np.float64))
+
+    # 端数サンプルを切り詰め／ゼロ詰めしてヘッダの LEN と一致させる
+    if len(resampled) > target_len:
+        resampled = resampled[:target_len]
+    elif len(resampled) < target_len:
+        resampled = np.pad(resampled, (0, target_len - len(resampled)))
+    return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+
 
 def pack_all_voices():
     #output_path = "src/voice_data.h"
@@ -68,13 +97,8 @@ def pack_all_voices():
                         data = data[::2]
     
                     # サンプリングレートが違う場合はリサンプリング
-                    if fs != 44100:
-                        from scipy.signal import resample_poly
-                        from math import gcd
-                        g = gcd(fs, 44100)
-                        resampled = resample_poly(data, 44100 // g, fs // g)  # ← resampled に受ける
-                        resampled = np.clip(resampled, -32768, 32767)          # ← clip
-                        data = resampled.astype(np.int16)                      # ← data に代入
+                    if fs != EMBED_FS:
+                        data = resample_to_embed_fs(data, fs)
                     
                     h.write(f"// Source: {wav_path} (ID: {entry_name})\n")
                     h.write(f"const int16_t {var_name}[] = {{\n    ")
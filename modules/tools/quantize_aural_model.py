@@ -0,0 +1,31 @@
+import os
+import sys
+
+
+def quantize_aural_model(model_path=None):
+    """
+    Aural AI のピッチモデルを INT8 に動的量子化し、同じフォルダに *.int8.onnx を書き出す。
+    AuralAIEngine / MainWindow は *.int8.onnx があれば自動でそちらを読み込む。
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        print("Error: onnxruntime is not installed.")
+        return None
+
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+    if model_path is None:
+        model_path = os.path.join(base_dir, "models/aural_dynamics.onnx")
+
+    if not os.path.exists(model_path):
+        print(f"Error: Model not found: {model_path}")
+        return None
+
+    output_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+    quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    print(f"Quantized: {model_path} -> {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    quantize_aural_model(sys.argv[1] if len(sys.argv) > 1 else None)
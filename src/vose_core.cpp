@@ -23,8 +23,12 @@ constexpr const T& clamp(const T& v, const T& lo, const T& hi) {
 #include <cstdint>
 #include <future>
 #include <thread>
+#include <atomic>
 #include <mutex>
 #include <condition_variable>
+#include <deque>
+#include <unordered_set>
+#include <filesystem>
 #include <memory>
 
 // 先に型定義を完了させ、ONNXセッション側での未定義エラーを防ぐ
@@ -136,11 +140,26 @@ struct AnalysisCache {
     std::vector<double> f0;
     std::vector<double> time;
     int                 length    = 0;
-    std::vector<double> flat_spec;
-    std::vector<double> flat_ap;
+    // スペクトル包絡・非周期性指標は単精度で保持する。
+    // 合成時は scratch (double) へ行単位で展開するので精度上の問題はなく、
+    // キャッシュのメモリ量・ディスク量・コピー時の転送量が半分になる。
+    std::vector<float>  flat_spec;
+    std::vector<float>  flat_ap;
     int                 spec_bins = 0;
+    // 有声フレームの平均F0（フォルマント追従の基準）。解析時に一度だけ求める
+    double              base_f0   = 220.0;
 };
 
+static double compute_base_f0(const AnalysisCache& c)
+{
+    double sum    = 0.0;
+    int    voiced = 0;
+    for (int j = 0; j < c.length; ++j) {
+        if (c.f0[j] > 50.0) { sum += c.f0[j]; ++voiced; }
+    }
+    return (voiced > 0) ? sum / voiced : 220.0;
+}
+
 // ============================================================
 // AnalysisCacheStore — LRU エビクション付きメモリキャッシュ
 //
@@ -369,7 +388,17 @@ static constexpr double kFramePeriod      = 5.0;   // ms
 static constexpr double kInv32768         = 1.0 / 32768.0;
 static constexpr int    kCrossfadeSamples = static_cast<int>(kFs * 0.030);
 static constexpr int    kMaxPitchLength   = 120000;
-static constexpr int    kTransitionFrames = static_cast<int>(60.0 / kFramePeriod);
+static constexpr double kTransitionMs     = 60.0;  // ms
+
+// 短いノート用の合成フレーム周期。
+// WORLD のコストはフレーム数に比例するため、F0 が安定している短音符では
+// 10ms に落としてスペクトル処理・合成のフレーム数を半減させる。
+static constexpr double kShortNoteFramePeriod = 10.0;   // ms
+static constexpr double kShortNoteMaxMs       = 300.0;  // ms
+
+static double synthesis_frame_period(double note_ms) {
+    return (note_ms < kShortNoteMaxMs) ? kShortNoteFramePeriod : kFramePeriod;
+}
 
 static int64_t note_samples_safe(int p) {
     return (static_cast<int64_t>(p) - 1) * kFramePeriod / 1000.0 * kFs + 1;
@@ -390,23 +419,68 @@ std::shared_ptr<const EmbeddedVoice> find_voice_ref(const char* key)
 // ディスクキャッシュ
 // ============================================================
 
-static std::string get_cache_dir() {
-    std::string p = "cache";
-    struct stat st;
-    if (stat(p.c_str(), &st) != 0) {
-        mkdir(p.c_str(), 0755);
-    }
+static const std::string& get_cache_dir() {
+    // ディレクトリ作成はプロセス初回のみ（ミスごとの stat を省く）
+    static const std::string p = [] {
+        std::string dir = "cache";
+        struct stat st;
+        if (stat(dir.c_str(), &st) != 0) {
+            mkdir(dir.c_str(), 0755);
+        }
+        return dir;
+    }();
     return p;
 }
 
-static void save_cache(const std::string& cache_path, const AnalysisCache& cache)
+// ============================================================
+// ディスクキャッシュの存在インデックス
+//
+// キャッシュミスのたびに .vsc を stat/open して存在確認する代わりに、
+// 初回アクセス時に cache ディレクトリを1回だけ列挙してハッシュ名の集合を持つ。
+// 以降は書き出し成功時に追加するだけなので、存在しないキャッシュへの
+// ファイルシステムアクセスが発生しない。
+// ============================================================
+
+struct DiskCacheIndex {
+    std::unordered_set<std::string> names;
+    std::mutex                      mtx;
+
+    DiskCacheIndex() {
+        std::error_code ec;
+        for (std::filesystem::directory_iterator it(get_cache_dir(), ec), end;
+             !ec && it != end; it.increment(ec)) {
+            const auto& path = it->path();
+            if (path.extension() == ".vsc") {
+                names.insert(path.stem().string());
+            }
+        }
+    }
+
+    bool contains(const std::string& hash) {
+        std::lock_guard<std::mutex> lock(mtx);
+        return names.count(hash) != 0;
+    }
+
+    void insert(const std::string& hash) {
+        std::lock_guard<std::mutex> lock(mtx);
+        names.insert(hash);
+    }
+};
+
+// disk_cache_writer と同様、終了時の破棄順問題を避けるため解放しない
+static DiskCacheIndex& disk_cache_index() {
+    static DiskCacheIndex* index = new DiskCacheIndex();
+    return *index;
+}
+
+static bool save_cache(const std::string& cache_path, const AnalysisCache& cache)
 {
     // 書き途中でクラッシュしても破損キャッシュが残らないよう
     // 一時ファイルに書いてからアトミックにリネームする
     std::string tmp_path = cache_path + ".tmp";
 
     FILE* fp = fopen(tmp_path.c_str(), "wb");
-    if (!fp) return;
+    if (!fp) return false;
 
     bool ok = true;
     VoseCacheHeader header;
@@ -418,18 +492,70 @@ static void save_cache(const std::string& cache_path, const AnalysisCache& cache
     ok &= (fwrite(cache.f0.data(),     sizeof(double),  cache.length, fp) == static_cast<size_t>(cache.length));
     ok &= (fwrite(cache.time.data(),   sizeof(double),  cache.length, fp) == static_cast<size_t>(cache.length));
     const size_t sc = static_cast<size_t>(cache.length) * cache.spec_bins;
-    ok &= (fwrite(cache.flat_spec.data(), sizeof(double), sc, fp) == sc);
-    ok &= (fwrite(cache.flat_ap.data(),   sizeof(double), sc, fp) == sc);
+    ok &= (fwrite(cache.flat_spec.data(), sizeof(cache.flat_spec[0]), sc, fp) == sc);
+    ok &= (fwrite(cache.flat_ap.data(),   sizeof(cache.flat_ap[0]),   sc, fp) == sc);
     fclose(fp);
 
     if (ok) {
-        std::error_code ec;
-        rename(tmp_path.c_str(), cache_path.c_str());  // アトミック置換
-        // 失敗時はtmpファイルを削除
-        // (rename失敗時のエラー処理は省略)
-    } else {
-        unlink(tmp_path.c_str());  // 書き込み失敗なら一時ファイルを削除
+        ok = (rename(tmp_path.c_str(), cache_path.c_str()) == 0);  // アトミック置換
+    }
+    if (!ok) {
+        unlink(tmp_path.c_str());  // 書き込み・リネーム失敗なら一時ファイルを削除
+    }
+    return ok;
+}
+
+// ============================================================
+// 非同期ディスク書き出し
+//
+// save_cache は数MB〜数十MBの fwrite を伴うため、合成スレッド上で
+// 直接呼ぶとそのノートの合成が I/O 待ちで止まる。
+// 書き出し要求をキューに積み、専用のワーカースレッド1本で順次処理する。
+// tmp → rename のアトミック置換なので、途中終了しても破損キャッシュは残らない。
+// ============================================================
+
+struct DiskCacheWriter {
+    std::deque<std::pair<std::string, std::shared_ptr<const AnalysisCache>>> queue;
+    std::mutex              mtx;
+    std::condition_variable cv;
+    bool                    started = false;
+
+    // hash はキャッシュファイル名（拡張子なし）。書き出し成功後にインデックスへ登録する
+    void enqueue(std::string hash, std::shared_ptr<const AnalysisCache> cache) {
+        if (!cache) return;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            queue.emplace_back(std::move(hash), std::move(cache));
+            if (!started) {
+                started = true;
+                // DLL アンロード時の join デッドロックを避けるため detach する
+                std::thread([this] { run(); }).detach();
+            }
+        }
+        cv.notify_one();
     }
+
+private:
+    void run() {
+        for (;;) {
+            std::pair<std::string, std::shared_ptr<const AnalysisCache>> job;
+            {
+                std::unique_lock<std::mutex> lock(mtx);
+                cv.wait(lock, [this] { return !queue.empty(); });
+                job = std::move(queue.front());
+                queue.pop_front();
+            }
+            if (save_cache(get_cache_dir() + "/" + job.first + ".vsc", *job.second)) {
+                disk_cache_index().insert(job.first);
+            }
+        }
+    }
+};
+
+// 終了時に待機中のワーカーより先に mutex が破棄されないよう、意図的に解放しない
+static DiskCacheWriter& disk_cache_writer() {
+    static DiskCacheWriter* writer = new DiskCacheWriter();
+    return *writer;
 }
 
 static std::shared_ptr<AnalysisCache> load_cache(const std::string& path,
@@ -458,6 +584,21 @@ static std::shared_ptr<AnalysisCache> load_cache(const std::string& path,
         return nullptr;
     }
 
+    // ファイルサイズ検証:
+    // 旧フォーマット（double 保存）や書きかけのファイルは、数MBのバッファを
+    // 確保して全量を読み込んだ後に EOF チェックで捨てることになるため、
+    // stat 済みのサイズと突き合わせて確保・読み込みの前に弾く。
+    {
+        const uint64_t frames   = static_cast<uint64_t>(header.length);
+        const uint64_t bins     = static_cast<uint64_t>(header.spec_bins);
+        using F0Elem   = decltype(AnalysisCache::f0)::value_type;
+        using SpecElem = decltype(AnalysisCache::flat_spec)::value_type;
+        const uint64_t expected = sizeof(header)
+            + frames * 2 * sizeof(F0Elem)            // f0 + time
+            + frames * bins * 2 * sizeof(SpecElem);  // spec + ap
+        if (static_cast<uint64_t>(st.st_size) != expected) return nullptr;
+    }
+
     auto cache = std::make_shared<AnalysisCache>();
     cache->length    = header.length;
     cache->spec_bins = header.spec_bins;
@@ -485,6 +626,7 @@ static std::shared_ptr<AnalysisCache> load_cache(const std::string& path,
     // ストリームが正確に末尾に達しているか確認（余剰バイトがある = ファイル破損とみなす）
     if (ifs.peek() != std::ifstream::traits_type::eof()) return nullptr;
 
+    cache->base_f0 = compute_base_f0(*cache);
     return cache;
 }
 // ============================================================
@@ -536,20 +678,23 @@ build_analysis_cache(const EmbeddedVoice& ev, int fft_size, int spec_bins)
         }
     }
 
+    // WORLD は double 配列を要求するため、解析は一時バッファで行い最後に単精度へ落とす
     const size_t sc = static_cast<size_t>(harvest_len) * spec_bins;
-    cache->flat_spec.resize(sc);
-    cache->flat_ap  .resize(sc);
+    std::vector<double> work_spec(sc), work_ap(sc);
 
     std::vector<double*> sp(harvest_len), ap(harvest_len);
     for (int i = 0; i < harvest_len; ++i) {
-        sp[i] = &cache->flat_spec[static_cast<size_t>(i)*spec_bins];
-        ap[i] = &cache->flat_ap  [static_cast<size_t>(i)*spec_bins];
+        sp[i] = &work_spec[static_cast<size_t>(i)*spec_bins];
+        ap[i] = &work_ap  [static_cast<size_t>(i)*spec_bins];
     }
     CheapTrick(ev.waveform.data(), wav_len, ev.fs,
                cache->time.data(), cache->f0.data(), harvest_len, nullptr, sp.data());
     D4C(ev.waveform.data(), wav_len, ev.fs,
         cache->time.data(), cache->f0.data(), harvest_len, fft_size, nullptr, ap.data());
 
+    cache->flat_spec.assign(work_spec.begin(), work_spec.end());
+    cache->flat_ap  .assign(work_ap  .begin(), work_ap  .end());
+    cache->base_f0 = compute_base_f0(*cache);
     return cache;
 }
 
@@ -571,9 +716,12 @@ get_or_analyze(std::shared_ptr<const EmbeddedVoice> ev_sp, int fft_size, int spe
     }
 
     // 2. ロックを外した状態でディスクキャッシュのパス生成と読み込み（I/Oボトルネックの分離）
-    const std::string h_str      = generate_cache_hash(key);
-    const std::string cache_file = get_cache_dir() + "/" + h_str + ".vsc";
-    auto disk_cache = load_cache(cache_file, spec_bins);
+    // インデックスに無いハッシュは .vsc を開きに行かない
+    const std::string h_str = generate_cache_hash(key);
+    std::shared_ptr<AnalysisCache> disk_cache;
+    if (disk_cache_index().contains(h_str)) {
+        disk_cache = load_cache(get_cache_dir() + "/" + h_str + ".vsc", spec_bins);
+    }
 
     // 3. 書き込みロックを取得して状態を確定させる
     VoseUniqueLock wlock(g_analysis_cache_mutex);
@@ -607,9 +755,9 @@ get_or_analyze(std::shared_ptr<const EmbeddedVoice> ev_sp, int fft_size, int spe
     // メモリキャッシュに格納
     g_analysis_cache.put(key, cache);
     
-    // ディスクへの書き込みは重いため、ロックを完全に解除してから非同期（または安全なスコープ）で行う
+    // ディスクへの書き込みは重いため、ロックを解除してから書き出しスレッドへ委譲する
     wlock.unlock();
-    save_cache(cache_file, *cache);
+    disk_cache_writer().enqueue(h_str, cache);
 
     return cache;
 }
@@ -651,15 +799,17 @@ static void copy_cache_to_scratch_cur(const AnalysisCache& c)
     std::copy(c.time.begin(), c.time.begin()+c.length, tl_scratch.time_axis.begin());
 }
 
-static void copy_cache_to_scratch_prev(const AnalysisCache& c)
+// 前ノートのスペクトルはクロスフェード区間（末尾 tail_frames）しか参照されないため、
+// 全フレームではなく末尾だけを行単位でコピーしてメモリ転送量を抑える。
+static void copy_cache_tail_to_scratch_prev(const AnalysisCache& c, int tail_frames)
 {
     tl_scratch.ensure_spec(c.length, c.spec_bins);
-    const size_t total = static_cast<size_t>(c.length) * c.spec_bins;
-    std::copy(c.flat_spec.begin(), c.flat_spec.begin()+total, tl_scratch.flat_spec_prev.begin());
-    std::copy(c.flat_ap  .begin(), c.flat_ap  .begin()+total, tl_scratch.flat_ap_prev  .begin());
-    tl_scratch.ensure_f0_prev(c.length);
-    std::copy(c.f0  .begin(), c.f0  .begin()+c.length, tl_scratch.f0_prev       .begin());
-    std::copy(c.time.begin(), c.time.begin()+c.length, tl_scratch.time_axis_prev.begin());
+    const int tail = clamp(tail_frames, 0, c.length);
+    for (int i = c.length - tail; i < c.length; ++i) {
+        const size_t off = static_cast<size_t>(i) * c.spec_bins;
+        std::copy_n(&c.flat_spec[off], c.spec_bins, tl_scratch.spec_ptrs_prev[i]);
+        std::copy_n(&c.flat_ap  [off], c.spec_bins, tl_scratch.ap_ptrs_prev  [i]);
+    }
 }
 
 // ============================================================
@@ -679,6 +829,15 @@ inline double resample_curve(const double* curve, int src_len,
     return (1.0-(src_f-j0))*curve[j0] + (src_f-j0)*curve[j1];
 }
 
+// raised-cosine のフェードイン窓 (0 → 1)
+static std::vector<double> build_fade_in(int len)
+{
+    std::vector<double> w(static_cast<size_t>(std::max(len, 0)));
+    for (int s = 0; s < len; ++s)
+        w[s] = 0.5 * (1.0 - std::cos(M_PI * static_cast<double>(s) / len));
+    return w;
+}
+
 // ============================================================
 // apply_crossfade
 //
@@ -704,17 +863,23 @@ static void apply_crossfade(std::vector<double>& dst, int64_t dst_size,
     const int safe_xfade = static_cast<int>(
         std::min<int64_t>(xfade_len, std::min(src_usable, dst_size - offset)));
 
-    for (int s = 0; s < safe_xfade; ++s) {
-        const double  t       = static_cast<double>(s) / safe_xfade;
-        const double  fade_in = 0.5 * (1.0 - std::cos(M_PI * t));
-        const int64_t di      = offset + s;
-        if (di >= dst_size) break;
-        dst[di] = dst[di] * (1.0 - fade_in) + src[src_start + s] * fade_in;
+    // クロスフェード長はほぼ常に kCrossfadeSamples なので、その窓は一度だけ計算して使い回す
+    static const std::vector<double> kDefaultFadeIn = build_fade_in(kCrossfadeSamples);
+    std::vector<double> custom_fade_in;
+    const double* fade_in = kDefaultFadeIn.data();
+    if (safe_xfade != kCrossfadeSamples) {
+        custom_fade_in = build_fade_in(safe_xfade);
+        fade_in = custom_fade_in.data();
     }
 
+    double*       d = dst.data() + offset;
+    const double* x = src.data() + src_start;
+    for (int s = 0; s < safe_xfade; ++s)
+        d[s] += (x[s] - d[s]) * fade_in[s];
+
     const int64_t body_end = std::min(offset + src_usable, dst_size);
-    for (int64_t s = offset + safe_xfade; s < body_end; ++s)
-        dst[s] = src[src_start + (s - offset)];
+    if (offset + safe_xfade < body_end)
+        std::copy(x + safe_xfade, x + (body_end - offset), d + safe_xfade);
 }
 
 // ============================================================
@@ -888,9 +1053,11 @@ void smooth_f0_gaussian(double* f0, int f0_length)
         double sum = 0.0;
         for (int k = -kRadius; k <= kRadius; ++k) {
             // 折り返しパディング: 端点を反射させる
+            // （1〜2フレームの短いノートでは反射してもはみ出すので、最後に範囲内へ丸める）
             int idx = i + k;
             if (idx < 0)           idx = -idx;
             if (idx >= f0_length)  idx = 2*(f0_length-1) - idx;
+            idx = std::clamp(idx, 0, f0_length - 1);
             sum += f0[idx] * kKernel[k + kRadius];
         }
         tmp[i] = sum;
@@ -1031,21 +1198,16 @@ void synthesize_note_impl(const SynthNoteParams& p, std::vector<double>& note_bu
     const int64_t note_samples  = pp.note_samples;
     const double  note_ms       = static_cast<double>(note_samples) / kFs * 1000.0;
     const double  src_ms        = get_source_ms(*pp.ev);
-    const int     output_frames = static_cast<int>(note_ms / kFramePeriod);
+    // 出力側のフレーム周期のみ可変。解析キャッシュ（src_frame）は常に kFramePeriod
+    const double  frame_period  = synthesis_frame_period(note_ms);
+    const int     output_frames = static_cast<int>(note_ms / frame_period);
     const OtoEntry& current_oto = pp.has_oto ? pp.oto : kDefaultOto;
 
     auto cache_cur = get_or_analyze(pp.ev, fft_size, spec_bins);
 
-    // フォルマント追従用: 音源の基準F0（解析時の有声フレーム平均）を計算
+    // フォルマント追従用: 音源の基準F0（解析時の有声フレーム平均）
     // これを各フレームのF0と比較してスペクトルの引き伸ばし量を決める
-    double base_f0 = 0.0;
-    {
-        int voiced = 0;
-        for (int j = 0; j < cache_cur->length; ++j) {
-            if (cache_cur->f0[j] > 50.0) { base_f0 += cache_cur->f0[j]; ++voiced; }
-        }
-        base_f0 = (voiced > 0) ? base_f0 / voiced : 220.0;
-    }
+    const double base_f0 = cache_cur->base_f0;
 
     tl_scratch.ensure_f0(output_frames);
     tl_scratch.ensure_spec(output_frames, spec_bins);
@@ -1055,7 +1217,7 @@ void synthesize_note_impl(const SynthNoteParams& p, std::vector<double>& note_bu
     // (blend_transition_spectra より先に実行する必要がある)
     // ----------------------------------------------------------------
     for (int j = 0; j < output_frames; ++j) {
-        const double t_out_ms = j * kFramePeriod;
+        const double t_out_ms = j * frame_period;
         const double t_src_ms = map_time(t_out_ms, current_oto, src_ms, note_ms);
         const int src_frame   = clamp(
             static_cast<int>(t_src_ms / kFramePeriod), 0, cache_cur->length-1);
@@ -1090,11 +1252,13 @@ void synthesize_note_impl(const SynthNoteParams& p, std::vector<double>& note_bu
     // ----------------------------------------------------------------
     if (pp.prev_ev) {
         auto cache_prev = get_or_analyze(pp.prev_ev, fft_size, spec_bins);
-        copy_cache_to_scratch_prev(*cache_prev);
+        const int transition_frames = static_cast<int>(kTransitionMs / frame_period);
+        copy_cache_tail_to_scratch_prev(
+            *cache_prev, std::min(transition_frames, output_frames));
         blend_transition_spectra(
             tl_scratch.spec_ptrs.data(), tl_scratch.ap_ptrs.data(), output_frames,
             tl_scratch.spec_ptrs_prev.data(), tl_scratch.ap_ptrs_prev.data(),
-            cache_prev->length, spec_bins, kTransitionFrames);
+            cache_prev->length, spec_bins, transition_frames);
     }
 
     smooth_f0_gaussian(tl_scratch.f0.data(), output_frames);
@@ -1108,19 +1272,44 @@ void synthesize_note_impl(const SynthNoteParams& p, std::vector<double>& note_bu
                               ? n.vibrato_rate_curve  : nullptr;
     const int     vib_clen  = n.vibrato_curve_length > 0 ? n.vibrato_curve_length : 0;
 
-    apply_vibrato(tl_scratch.f0.data(), output_frames, kFramePeriod,
+    apply_vibrato(tl_scratch.f0.data(), output_frames, frame_period,
                   p.global_time_sec, vib_depth, vib_rate, vib_clen);
 
     note_buf.assign(static_cast<size_t>(note_samples), 0.0);
     VOSE_Synthesis(tl_scratch.f0.data(), output_frames,
                    tl_scratch.spec_ptrs.data(), tl_scratch.ap_ptrs.data(),
-                   fft_size, kFramePeriod, pp.ev->fs,
+                   fft_size, frame_period, pp.ev->fs,
                    static_cast<int>(note_samples), note_buf.data());
 
     // ポストEQ: WORLD出力の金属的倍音・箱鳴り補正、高域補強
     apply_post_eq(note_buf.data(), static_cast<int>(note_samples));
 }
 
+// ============================================================
+// parallel_for_each_index
+//
+// [0, count) を最大 max_threads 本のワーカーで処理する。
+// 各ワーカーはアトミックカウンタから次のインデックスを取り出すため、
+// 処理時間の長いノートがあっても他のワーカーは待たずに次へ進める。
+// ============================================================
+
+template <typename Fn>
+static void parallel_for_each_index(int count, int max_threads, Fn&& fn)
+{
+    if (count <= 0) return;
+    const int workers = std::max(1, std::min(max_threads, count));
+    std::atomic<int> next{0};
+    std::vector<std::thread> threads;
+    threads.reserve(workers);
+    for (int w = 0; w < workers; ++w) {
+        threads.emplace_back([&] {
+            for (int i = next.fetch_add(1); i < count; i = next.fetch_add(1))
+                fn(i);
+        });
+    }
+    for (auto& t : threads) t.join();
+}
+
 // ============================================================
 // extern "C" API
 // ============================================================
@@ -1268,8 +1457,13 @@ DLLEXPORT void execute_render(NoteEvent* notes, int note_count, const char* outp
     //   同じスレッドが2ノード分の synthesize_note_impl を
     //   ネストして呼び出すことはないが、プールの枯渇で
     //   launch::deferred（= メインスレッドで実行）に fallback する実装もある。
-    //   安全のため、1ノート = 1スレッドを明示的に生成する方式にする。
-    //   スレッド数は hardware_concurrency でキャップし、バッチ処理する。
+    //   安全のため、ワーカースレッドを明示的に生成する方式にする。
+    //   スレッド数は hardware_concurrency でキャップし、各ワーカーが
+    //   アトミックカウンタから次のノートを取り出す（バッチ末尾の待ち合わせなし）。
+    //
+    //   合成の前に、使用する音源の WORLD 解析を音源単位で並列に済ませておく。
+    //   同じ音源を使う複数ノートが同時にキャッシュミスして
+    //   同一ファイルを重複解析するのを防ぎ、合成フェーズは全てキャッシュヒットになる。
     // ----------------------------------------------------------------
     const int max_threads = static_cast<int>(
         std::max(1u, std::thread::hardware_concurrency()));
@@ -1294,29 +1488,28 @@ DLLEXPORT void execute_render(NoteEvent* notes, int note_count, const char* outp
         }
     }
 
-    // max_threads ずつバッチ処理
-    // 各スレッドは独立した tl_scratch（thread_local）を持つため競合しない
-    for (int batch_start = 0;
-         batch_start < static_cast<int>(renderable_indices.size());
-         batch_start += max_threads)
+    // 音源（前ノート含む）の重複を除いて解析を先行実行
+    std::vector<std::shared_ptr<const EmbeddedVoice>> voices_to_analyze;
     {
-        const int batch_end = std::min(
-            batch_start + max_threads,
-            static_cast<int>(renderable_indices.size()));
-
-        std::vector<std::thread> threads;
-        threads.reserve(batch_end - batch_start);
-
-        for (int bi = batch_start; bi < batch_end; ++bi) {
-            const int idx = renderable_indices[bi];
-            threads.emplace_back([&, idx] {
-                SynthNoteParams p{ prepass[idx], notes[idx], fft_size, spec_bins,
-                                   note_global_time[idx] };
-                synthesize_note_impl(p, note_bufs[idx]);
-            });
+        std::unordered_map<std::string, bool> seen;
+        for (int idx : renderable_indices) {
+            for (const auto& ev : { prepass[idx].ev, prepass[idx].prev_ev }) {
+                if (ev && seen.emplace(ev->path, true).second)
+                    voices_to_analyze.push_back(ev);
+            }
         }
-        for (auto& t : threads) t.join();
     }
+    parallel_for_each_index(static_cast<int>(voices_to_analyze.size()), max_threads,
+        [&](int i) { get_or_analyze(voices_to_analyze[i], fft_size, spec_bins); });
+
+    // 各スレッドは独立した tl_scratch（thread_local）を持つため競合しない
+    parallel_for_each_index(static_cast<int>(renderable_indices.size()), max_threads,
+        [&](int bi) {
+            const int idx = renderable_indices[bi];
+            SynthNoteParams p{ prepass[idx], notes[idx], fft_size, spec_bins,
+                               note_global_time[idx] };
+            synthesize_note_impl(p, note_bufs[idx]);
+        });
 
     // ----------------------------------------------------------------
     // パス2-B: 書き込みフェーズ
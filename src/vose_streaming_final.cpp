@@ -257,15 +257,20 @@ private:
             const int xfade = (prev_ev != nullptr) ? kCrossfadeSamples_internal : 0;
             const int64_t out_len = static_cast<int64_t>(note_buf.size());
 
+            // フェードイン窓は長さ固定なので初回だけ計算して全ノートで共有する
+            static const std::vector<double> kFadeIn = [] {
+                std::vector<double> w(kCrossfadeSamples_internal);
+                for (int s = 0; s < kCrossfadeSamples_internal; ++s)
+                    w[s] = 0.5 * (1.0 - std::cos(M_PI * s / kCrossfadeSamples_internal));
+                return w;
+            }();
+
             chunk.resize(out_len);
-            for (int64_t s = 0; s < out_len; ++s) {
-                double v = note_buf[s];
-                if (s < xfade) {
-                    const double fi = 0.5 * (1.0 - std::cos(M_PI * s / xfade));
-                    v *= fi;
-                }
-                chunk[s] = static_cast<float>(clamp(v, -1.0, 1.0));
-            }
+            const int64_t fade_len = std::min<int64_t>(xfade, out_len);
+            for (int64_t s = 0; s < fade_len; ++s)
+                chunk[s] = static_cast<float>(clamp(note_buf[s] * kFadeIn[s], -1.0, 1.0));
+            for (int64_t s = fade_len; s < out_len; ++s)
+                chunk[s] = static_cast<float>(clamp(note_buf[s], -1.0, 1.0));
 
             // RingBuffer に書き込み（満杯なら待機してリトライ）
             size_t written = 0;
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+# QtMultimedia はバックエンド（libpulse 等）が無いと ImportError になる
+pytest.importorskip("PySide6.QtMultimedia", exc_type=ImportError)
+sf = pytest.importorskip("soundfile")
+
+from modules.backend import audio_player
+from modules.backend.audio_player import AudioPlayer
+
+
+def _write_wav(path, value, frames=64, sample_rate=44100):
+    sf.write(str(path), np.full(frames, value, dtype=np.int16), sample_rate, subtype="PCM_16")
+
+
+def test_load_pcm_reuses_decoded_pcm_until_file_changes(tmp_path):
+    wav = tmp_path / "preview.wav"
+    _write_wav(wav, 1000)
+    player = AudioPlayer()
+
+    first = player._load_pcm(str(wav))
+    assert first[1] == 44100
+    assert player._load_pcm(str(wav)) is first
+
+    # 再合成で上書きされたプレビューは mtime が変わるので読み直す
+    _write_wav(wav, -2000)
+    stat = os.stat(wav)
+    os.utime(wav, (stat.st_atime, stat.st_mtime + 10))
+    second = player._load_pcm(str(wav))
+    assert second is not first
+    assert int(second[0][0]) == -2000
+
+
+def test_load_pcm_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(AudioPlayer, "PCM_CACHE_SIZE", 2)
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"n{i}.wav"))
+        _write_wav(paths[-1], i)
+    player = AudioPlayer()
+
+    a = player._load_pcm(paths[0])
+    player._load_pcm(paths[1])
+    assert player._load_pcm(paths[0]) is a  # 0 を最近使ったことにする
+    player._load_pcm(paths[2])              # 1 が追い出される
+
+    cached = {key[0] for key in player._pcm_cache}
+    assert cached == {paths[0], paths[2]}
+
+
+def test_convert_pcm_matches_device_rate_and_channels():
+    mono = np.arange(441, dtype=np.int16)
+
+    stereo = audio_player.convert_pcm(mono, 44100, 48000, 2)
+
+    assert stereo.shape == (480, 2)
+    assert stereo.dtype == np.int16
+    assert np.array_equal(stereo[:, 0], stereo[:, 1])
+    assert stereo[0, 0] == 0 and stereo[-1, 0] == 440
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from modules.backend.intonation import IntonationAnalyzer, _scan_trace_labels
+
+SAMPLE_TRACE = "\r\n".join([
+    "[Text analysis result]",
+    "こんにちは",
+    "[Label indicating state transitions]",
+    "0-2000000 xx^xx-sil+k=o/A:xx+xx+xx",
+    "2000000-2500000 xx^sil-k+o=N/A:-4+1+5",
+    "2500000-3300000 sil^k-o+N=n/A:-4+1+5",
+    "  3300000-4000000 k^o-N+n=i/A:-3+2+4",
+    "4000000-4600000 o^N-n+i=ch/A:-2+3+3",
+    "4600000-5200000 N^n-i+ch=i/A:-2+3+3",
+    "10-20x broken",
+    "1-2-3 broken",
+    "5200000-5600000",
+    "5200000-5800000 n^i-ch+i=w/A:-1+4+2",
+    "5800000-6300000 i^ch-i+w=a/A:-1+4+2",
+    "6300000-6700000 ch^i-w+a=sil/A:0+5+1",
+    "6700000-7500000 i^w-a+sil=xx/A:0+5+1",
+    "7500000-9000000 w^a-sil+xx=xx/A:xx+xx+xx",
+    "29000000000-29000500000 xx^xx-pau+xx=xx/A:xx+xx+xx",
+])
+
+
+def test_scan_trace_labels_extracts_label_rows_only():
+    starts, ends, labels = _scan_trace_labels(SAMPLE_TRACE)
+
+    assert starts.dtype == np.int64 and ends.dtype == np.int64
+    assert len(starts) == len(ends) == len(labels) == 12
+    assert starts[0] == 0 and ends[0] == 2000000
+    assert starts[3] == 3300000  # 先頭の空白は読み飛ばす
+    assert labels[1] == "xx^sil-k+o=N/A:-4+1+5"
+    # 100ns 単位の長い曲でも int32 で溢れない
+    assert starts[-1] == 29000000000
+
+
+def test_scan_trace_labels_empty():
+    starts, ends, labels = _scan_trace_labels("")
+    assert len(starts) == len(ends) == 0 and labels == []
+
+
+@pytest.mark.parametrize("trace", ["", "[Text analysis result]\nno labels here\n"])
+def test_parse_trace_to_notes_without_labels(trace):
+    assert IntonationAnalyzer().parse_trace_to_notes(trace) == []
+
+
+def test_parse_trace_to_notes_groups_phonemes_into_morae():
+    notes = IntonationAnalyzer().parse_trace_to_notes(SAMPLE_TRACE)
+
+    assert [n["lyric"] for n in notes] == ["ko", "n", "ni", "chi", "wa"]
+    # 子音の頭から母音の終わりまでが1ノート（秒）
+    assert notes[0]["start"] == pytest.approx(0.2)
+    assert notes[0]["duration"] == pytest.approx(0.13)
+    assert notes[-1]["start"] == pytest.approx(0.63)
+    assert notes[-1]["duration"] == pytest.approx(0.12)
+    assert all(n["pitch"] == 60 for n in notes)
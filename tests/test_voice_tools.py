@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from modules.audio.voice_manager import _find_oto_ini
+from modules.tools import pack_all_voices
+from modules.tools.pack_all_voices import EMBED_FS, resample_to_embed_fs
+
+
+def test_find_oto_ini_skips_hidden_dirs_and_stops_at_voice_folders(tmp_path):
+    for rel in [
+        "voiceA/oto.ini",
+        "voiceA/sub/oto.ini",         # 音源フォルダの中までは降りない
+        "group/voiceB/oto.ini",
+        "group/.git/oto.ini",
+        ".hidden/voiceC/oto.ini",
+        "empty/readme.txt",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (tmp_path / "notadir").mkdir()
+    (tmp_path / "notadir" / "oto.ini").mkdir()  # 同名のディレクトリは対象外
+
+    found = _find_oto_ini(str(tmp_path))
+
+    assert found == [
+        str(tmp_path / "group" / "voiceB" / "oto.ini"),
+        str(tmp_path / "voiceA" / "oto.ini"),
+    ]
+
+
+def test_find_oto_ini_missing_root(tmp_path):
+    assert _find_oto_ini(str(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize("use_scipy", [True, False])
+@pytest.mark.parametrize("fs, length", [(22050, 1001), (48000, 4799), (96000, 12345), (8000, 7), (EMBED_FS, 500)])
+def test_resample_to_embed_fs_length_is_exact(monkeypatch, use_scipy, fs, length):
+    if use_scipy and pack_all_voices.resample_poly is None:
+        pytest.skip("scipy is not installed")
+    if not use_scipy:
+        monkeypatch.setattr(pack_all_voices, "resample_poly", None)
+    t = np.arange(length) / fs
+    data = (np.sin(2 * np.pi * 220 * t) * 20000).astype(np.int16)
+
+    out = resample_to_embed_fs(data, fs)
+
+    assert out.dtype == np.int16
+    assert len(out) == int(round(length * EMBED_FS / fs))
+    assert np.abs(out.astype(np.int32)).max() <= 32767
@@ -0,0 +1,68 @@
+import ctypes
+
+import numpy as np
+import pytest
+
+from modules.ffi.vose_types import (
+    NOTE_CURVE_FIELDS,
+    CNoteEvent,
+    _NOTE_EVENT_DTYPE,
+    as_c_double_array,
+    fill_note_curves,
+    validate_note_event_layout,
+)
+
+
+def test_note_event_dtype_matches_ctypes_layout():
+    validate_note_event_layout()
+    assert _NOTE_EVENT_DTYPE.itemsize == ctypes.sizeof(CNoteEvent)
+    for name in NOTE_CURVE_FIELDS + ("pitch_length", "vibrato_curve_length"):
+        assert _NOTE_EVENT_DTYPE.fields[name][1] == getattr(CNoteEvent, name).offset
+    for name in NOTE_CURVE_FIELDS:
+        assert _NOTE_EVENT_DTYPE.fields[name][0].itemsize == ctypes.sizeof(ctypes.c_void_p)
+    assert _NOTE_EVENT_DTYPE.fields["pitch_length"][0].itemsize == ctypes.sizeof(ctypes.c_int)
+
+
+def test_fill_note_curves_round_trips_through_ctypes():
+    note_count, length = 3, 5
+    curves = np.arange(note_count * len(NOTE_CURVE_FIELDS) * length, dtype=np.float64)
+    curves = curves.reshape(note_count, len(NOTE_CURVE_FIELDS), length)
+    c_notes = (CNoteEvent * note_count)()
+    c_notes[1].wav_path = b"a.wav"
+
+    fill_note_curves(c_notes, curves)
+
+    for i in range(note_count):
+        note = c_notes[i]
+        assert note.pitch_length == length
+        assert note.vibrato_curve_length == length
+        for k, name in enumerate(NOTE_CURVE_FIELDS):
+            ptr = getattr(note, name)
+            assert [ptr[j] for j in range(length)] == curves[i, k].tolist()
+    # カーブ以外のフィールドは書き換えない
+    assert c_notes[1].wav_path == b"a.wav"
+
+
+@pytest.mark.parametrize("curves", [
+    np.zeros((2, len(NOTE_CURVE_FIELDS), 4), dtype=np.float32),
+    np.zeros((2, len(NOTE_CURVE_FIELDS), 8))[:, :, ::2],
+    np.zeros((3, len(NOTE_CURVE_FIELDS), 4)),
+    np.zeros((2, 5, 4)),
+])
+def test_fill_note_curves_rejects_mismatched_arrays(curves):
+    with pytest.raises(ValueError):
+        fill_note_curves((CNoteEvent * 2)(), curves)
+
+
+@pytest.mark.parametrize("make_values, expected", [
+    (lambda: [1.0, 2.5, -3.0], [1.0, 2.5, -3.0]),
+    (lambda: (1, 2, 3), [1.0, 2.0, 3.0]),
+    (lambda: np.array([[1.0, 2.0], [3.0, 4.0]])[:, ::-1], [2.0, 1.0, 4.0, 3.0]),
+    (lambda: (v / 2 for v in range(4)), [0.0, 0.5, 1.0, 1.5]),
+    (lambda: [], []),
+])
+def test_as_c_double_array_round_trip(make_values, expected):
+    arr = as_c_double_array(make_values())
+
+    assert arr._type_ is ctypes.c_double
+    assert list(arr) == expected
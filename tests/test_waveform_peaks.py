@@ -0,0 +1,74 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets", exc_type=ImportError)
+
+from modules.gui.timeline_widget import _audio_peaks, build_peak_mipmap, peaks_at_zoom
+
+
+def _reference_level(samples, block):
+    """ブロックごとの (min, max) を素直に求めた参照値（端数ブロックも1ブロックとして数える）"""
+    rows = [(samples[i:i + block].min(), samples[i:i + block].max())
+            for i in range(0, len(samples), block)]
+    return np.array(rows, dtype=np.int16)
+
+
+def _write_wav(path, samples, channels=1):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(44100)
+        w.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+
+
+def test_build_peak_mipmap_empty_input():
+    assert build_peak_mipmap(np.empty(0, dtype=np.int16)) == {}
+
+
+@pytest.mark.parametrize("length", [1, 511, 513, 512 * 3, 512 * 5 + 7, 100003])
+def test_build_peak_mipmap_matches_blockwise_min_max(length):
+    samples = np.random.default_rng(length).integers(-32768, 32768, length).astype(np.int16)
+
+    levels = build_peak_mipmap(samples)
+
+    # 512 から倍々で、最後の段は全体を1ブロックにまとめたもの
+    blocks = sorted(levels)
+    assert blocks[0] == 512
+    assert all(b2 == b1 * 2 for b1, b2 in zip(blocks, blocks[1:]))
+    assert len(levels[blocks[-1]]) == 1
+    for block, mm in levels.items():
+        assert mm.dtype == np.int16
+        np.testing.assert_array_equal(mm, _reference_level(samples, block))
+
+
+def test_peaks_at_zoom_picks_coarsest_level_not_above_request():
+    levels = build_peak_mipmap(np.arange(512 * 9, dtype=np.int16))  # 512 .. 8192
+
+    assert peaks_at_zoom(levels, 10)[0] == 512
+    assert peaks_at_zoom(levels, 512)[0] == 512
+    assert peaks_at_zoom(levels, 2047.9)[0] == 1024
+    assert peaks_at_zoom(levels, 2048)[0] == 2048
+    assert peaks_at_zoom(levels, 1e9)[0] == max(levels)
+    block, mm = peaks_at_zoom(levels, 3000)
+    assert mm is levels[block]
+
+
+@pytest.mark.parametrize("length, channels", [(10, 1), (12345, 1), (9999, 2)])
+def test_audio_peaks_match_array_split(tmp_path, length, channels):
+    rng = np.random.default_rng(length)
+    interleaved = rng.integers(-20000, 20000, length * channels).astype(np.int16)
+    interleaved[3 * channels] = -32768  # int16 の abs で溢れる値
+    path = tmp_path / "peaks.wav"
+    _write_wav(path, interleaved, channels)
+
+    peaks = _audio_peaks(str(path), os.path.getmtime(path), 2000)
+
+    left = interleaved[::channels].astype(np.int32)
+    chunks = np.array_split(left, min(2000, len(left)))
+    expected = np.array([np.abs(c).max() for c in chunks], dtype=np.float64)
+    expected /= expected.max()
+    np.testing.assert_allclose(peaks, expected, rtol=0, atol=1e-12)
+    assert max(peaks) == 1.0